@@ -0,0 +1,187 @@
+"""On-disk generations of the job index, shared by every worker process.
+
+With ``RECOMMENDER_ARTIFACT_DIR`` set, a fitted job index is saved as one
+directory per generation:
+
+* ``meta.json`` - format version, matrix shapes, the vectorizer's engine
+  and settings (``ai.engines``) and the last ``JobChange`` the index
+  reflects, with the time it was synced.
+* ``vocabulary.json`` - the location, branch and skill names the
+  ``JobColumns`` codes refer to; ``terms.json`` - TF-IDF terms in column
+  order (the hashing engine has none).
+* ``*.npy`` - the job matrix (CSR, or one contiguous float32 array for the
+  LSA engine, with its projection), IDF weights, job ids, the alive mask
+  and the ``JobColumns`` arrays.
+
+Workers open the arrays with ``np.load(mmap_mode="r")``, so every process
+maps the same page-cache pages instead of holding its own copy of the
+matrix; a worker's RSS then only grows with the vocabulary and the id to
+row lookup, not with the matrix.
+
+``CURRENT`` holds the name of the live generation. ``publish`` writes the
+new directory under a temporary name, renames it into place and then
+replaces ``CURRENT`` with ``os.replace``, which is atomic: readers see the
+old generation or the new one, never a half-written one. Only the newest
+``KEEP_GENERATIONS`` are kept; on POSIX, processes still mapping a deleted
+generation keep their pages until they move to a newer one.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+from scipy import sparse
+
+from .columns import JobColumns
+from .engines import load_vectorizer, save_vectorizer
+
+FORMAT_VERSION = 2
+CURRENT = "CURRENT"
+KEEP_GENERATIONS = 3
+
+
+def artifact_root() -> Optional[Path]:
+    root = getattr(settings, "RECOMMENDER_ARTIFACT_DIR", None)
+    return Path(root) if root else None
+
+
+def current_generation(root: Path) -> Optional[str]:
+    try:
+        return (root / CURRENT).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _csr(data, indices, indptr, shape):
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    # Saved matrices are canonical; say so, so scipy never sorts the
+    # read-only arrays in place.
+    matrix.has_sorted_indices = True
+    matrix.has_canonical_format = True
+    return matrix
+
+
+def _save_csr(directory: Path, name: str, matrix) -> list:
+    if not matrix.has_canonical_format:
+        matrix = matrix.copy()
+        matrix.sum_duplicates()
+    np.save(directory / f"{name}_data.npy", matrix.data)
+    np.save(directory / f"{name}_indices.npy", matrix.indices)
+    np.save(directory / f"{name}_indptr.npy", matrix.indptr)
+    return list(matrix.shape)
+
+
+def _load_csr(directory: Path, name: str, shape):
+    parts = [
+        np.load(directory / f"{name}_{part}.npy", mmap_mode="r")
+        for part in ("data", "indices", "indptr")
+    ]
+    return _csr(*parts, tuple(shape))
+
+
+def write_generation(root: Path, index) -> str:
+    """Save ``index`` (a ``JobIndex``) as a new, not yet current, generation."""
+    root.mkdir(parents=True, exist_ok=True)
+    generation = f"gen-{time.time_ns()}-{os.getpid()}"
+    staging = root / f".{generation}.tmp"
+    staging.mkdir()
+    try:
+        meta = {
+            "format": FORMAT_VERSION,
+            "vectorizer": None,
+            "change_id": index.change_id,
+            "synced_at": index.synced_at,
+        }
+        vocabulary = {
+            "locations": index.columns.locations,
+            "branches": index.columns.branches,
+            "skills": index.columns.skills,
+        }
+        if index.vectorizer is not None:
+            meta["vectorizer"] = save_vectorizer(index.vectorizer, staging)
+            if isinstance(index.matrix, np.ndarray):
+                np.save(staging / "matrix.npy", np.ascontiguousarray(index.matrix, np.float32))
+            else:
+                meta["matrix_shape"] = _save_csr(staging, "matrix", index.matrix)
+
+        np.save(staging / "job_ids.npy", index.job_ids)
+        np.save(staging / "alive.npy", index.alive)
+        np.save(staging / "min_cgpa.npy", index.columns.min_cgpa)
+        np.save(staging / "location_codes.npy", index.columns.location_codes)
+        np.save(staging / "branch_bits.npy", index.columns.branch_bits)
+        meta["skill_shape"] = _save_csr(staging, "skills", index.columns.skill_matrix)
+
+        (staging / "vocabulary.json").write_text(json.dumps(vocabulary))
+        (staging / "meta.json").write_text(json.dumps(meta))
+        os.rename(staging, root / generation)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return generation
+
+
+def read_generation(root: Path, generation: str) -> dict:
+    """``JobIndex`` constructor arguments for ``generation``, arrays memory-mapped."""
+    directory = root / generation
+    meta = json.loads((directory / "meta.json").read_text())
+    if meta["format"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported job index format {meta['format']} in {directory}")
+    vocabulary = json.loads((directory / "vocabulary.json").read_text())
+
+    vectorizer, matrix = None, None
+    if meta["vectorizer"] is not None:
+        vectorizer = load_vectorizer(meta["vectorizer"], directory)
+        if "matrix_shape" in meta:
+            matrix = _load_csr(directory, "matrix", meta["matrix_shape"])
+        else:
+            matrix = np.load(directory / "matrix.npy", mmap_mode="r")
+
+    def load(name):
+        return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+    columns = JobColumns(
+        load("min_cgpa"),
+        load("location_codes"),
+        load("branch_bits"),
+        _load_csr(directory, "skills", meta["skill_shape"]),
+        vocabulary["locations"],
+        vocabulary["branches"],
+        vocabulary["skills"],
+    )
+    return {
+        "vectorizer": vectorizer,
+        "matrix": matrix,
+        "job_ids": load("job_ids"),
+        "columns": columns,
+        "alive": load("alive"),
+        "change_id": meta.get("change_id", 0),
+        "synced_at": meta.get("synced_at", 0),
+    }
+
+
+def point_current(root: Path, generation: str) -> None:
+    pointer = root / f".{CURRENT}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pointer.write_text(generation)
+    os.replace(pointer, root / CURRENT)
+
+
+def prune(root: Path, keep: int = KEEP_GENERATIONS) -> None:
+    """Delete all but the newest ``keep`` generations, never the current one."""
+    current = current_generation(root)
+    generations = sorted(path.name for path in root.glob("gen-*") if path.is_dir())
+    for name in generations[:-keep]:
+        if name != current:
+            shutil.rmtree(root / name, ignore_errors=True)
+
+
+def publish(root: Path, index) -> str:
+    """Write ``index`` as a new generation and make it the current one."""
+    generation = write_generation(root, index)
+    point_current(root, generation)
+    prune(root)
+    return generation
@@ -0,0 +1,121 @@
+"""Per-profile cache of ranked recommendations.
+
+Entries are keyed by a fingerprint of every profile field the ranking reads,
+a per-profile generation bumped on ``ProfileForm`` save, and the version of
+the job index (the newest ``JobChange`` it reflects). Job changes reach every
+process's index through ``JobChange`` rows, so a job saved on one worker
+changes the key on all of them within ``RECOMMENDER_SYNC_INTERVAL``, even
+with a per-process cache. Any of those changing simply makes the old entry
+unreachable; it then ages out with ``RECOMMENDER_CACHE_TIMEOUT``.
+
+Only the standard cache API (get/set/add/incr) is used, so the locmem,
+file-based and database backends shipped with Django all work. With the
+file-based backend ``incr`` is not atomic, so counters may undercount.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from portal.models import Job
+
+from .index import get_job_index, latest_job_change
+
+PREFIX = "recommender"
+HITS_KEY = f"{PREFIX}:hits"
+MISSES_KEY = f"{PREFIX}:misses"
+
+
+def _cache():
+    return caches[getattr(settings, "RECOMMENDER_CACHE_ALIAS", "default")]
+
+
+def _timeout():
+    return getattr(settings, "RECOMMENDER_CACHE_TIMEOUT", 900)
+
+
+def _incr(key: str) -> int:
+    cache = _cache()
+    cache.add(key, 0, None)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr().
+        cache.set(key, 1, None)
+        return 1
+
+
+def profile_fingerprint(profile) -> str:
+    fields = [
+        profile.skills,
+        profile.interests,
+        profile.projects,
+        profile.certifications,
+        profile.preferred_locations,
+        profile.branch,
+        "" if profile.cgpa is None else str(profile.cgpa),
+    ]
+    return hashlib.sha1("\x1f".join(f or "" for f in fields).encode()).hexdigest()
+
+
+def _profile_generation_key(profile) -> str:
+    return f"{PREFIX}:profile:{profile.pk}"
+
+
+def invalidate_profile_recommendations(profile) -> None:
+    _incr(_profile_generation_key(profile))
+
+
+def _key(profile, kind: str) -> str:
+    generation = _cache().get(_profile_generation_key(profile), 0)
+    return ":".join(
+        [
+            PREFIX,
+            kind,
+            str(profile.pk),
+            str(generation),
+            profile_fingerprint(profile),
+            str(get_job_index().version),
+        ]
+    )
+
+
+def cached_recommendations(profile, kind: str, compute):
+    """Return ``compute()``'s ranking for ``profile``, served from cache when fresh.
+
+    Only job ids, scores and reasons are stored; jobs are reloaded in one
+    query on a hit and jobs deleted since are dropped.
+    """
+    cache = _cache()
+    key = _key(profile, kind)
+    entry = cache.get(key)
+    if entry is None:
+        _incr(MISSES_KEY)
+        results = compute()
+        cache.set(
+            key,
+            [(item["job"].id, item["score"], item["reasons"]) for item in results],
+            _timeout(),
+        )
+        return results
+
+    _incr(HITS_KEY)
+    jobs = Job.objects.in_bulk([job_id for job_id, _, _ in entry])
+    return [
+        {"job": jobs[job_id], "score": score, "reasons": reasons}
+        for job_id, score, reasons in entry
+        if job_id in jobs
+    ]
+
+
+def cache_stats() -> dict:
+    cache = _cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+        "job_index_version": latest_job_change(),
+    }
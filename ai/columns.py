@@ -0,0 +1,341 @@
+"""Columnar job attributes for vectorised rule-based scoring.
+
+``JobColumns`` stores the attributes ``_rule_points`` looks at as arrays, one
+entry per index row, so the CGPA, branch, location and skill-overlap
+components for every job come out of a handful of NumPy operations:
+
+* ``min_cgpa`` - minimum CGPA in hundredths, compared exactly as integers.
+* ``location_codes`` - code of the lower-cased job location.
+* ``branch_bits`` - eligible branches as a bitmask, 64 branch codes per word.
+* ``skill_matrix`` - sparse job x skill incidence matrix.
+
+``StudentColumns`` is the mirror image used to rank students for one job.
+"""
+from decimal import Decimal
+
+import numpy as np
+from scipy import sparse
+
+from .features import JobFeatures
+
+SKILL_POINTS = 5
+CGPA_MET_POINTS = 10
+CGPA_BELOW_POINTS = -50
+BRANCH_POINTS = 8
+LOCATION_POINTS = 5
+
+
+def _cents(value) -> int:
+    return int((Decimal(str(value)) * 100).to_integral_value())
+
+
+def _code(vocabulary: dict, names: list, name: str) -> int:
+    code = vocabulary.get(name)
+    if code is None:
+        code = vocabulary[name] = len(names)
+        names.append(name)
+    return code
+
+
+class JobColumns:
+    def __init__(
+        self,
+        min_cgpa,
+        location_codes,
+        branch_bits,
+        skill_matrix,
+        locations,
+        branches,
+        skills,
+    ):
+        self.min_cgpa = min_cgpa
+        self.location_codes = location_codes
+        self.branch_bits = branch_bits
+        self.skill_matrix = skill_matrix
+        self.locations = locations
+        self.branches = branches
+        self.skills = skills
+        self.location_vocabulary = {name: code for code, name in enumerate(locations)}
+        self.branch_vocabulary = {name: code for code, name in enumerate(branches)}
+        self.skill_vocabulary = {name: code for code, name in enumerate(skills)}
+
+    @classmethod
+    def from_features(cls, features, locations=(), branches=(), skills=()):
+        locations, branches, skills = list(locations), list(branches), list(skills)
+        location_vocabulary = {name: code for code, name in enumerate(locations)}
+        branch_vocabulary = {name: code for code, name in enumerate(branches)}
+        skill_vocabulary = {name: code for code, name in enumerate(skills)}
+
+        location_codes = np.empty(len(features), dtype=np.int32)
+        branch_codes, skill_rows, skill_codes = [], [], []
+        for row, job in enumerate(features):
+            location_codes[row] = _code(location_vocabulary, locations, job.location)
+            branch_codes.append([_code(branch_vocabulary, branches, b) for b in job.branches])
+            for skill in job.skills:
+                skill_rows.append(row)
+                skill_codes.append(_code(skill_vocabulary, skills, skill))
+
+        branch_bits = np.zeros((len(features), max(1, -(-len(branches) // 64))), dtype=np.uint64)
+        for row, codes in enumerate(branch_codes):
+            for code in codes:
+                branch_bits[row, code // 64] |= np.uint64(1) << np.uint64(code % 64)
+
+        skill_matrix = sparse.csr_matrix(
+            (np.ones(len(skill_rows), dtype=np.int32), (skill_rows, skill_codes)),
+            shape=(len(features), len(skills)),
+        )
+        return cls(
+            np.array([_cents(job.min_cgpa) for job in features], dtype=np.int64),
+            location_codes,
+            branch_bits,
+            skill_matrix,
+            locations,
+            branches,
+            skills,
+        )
+
+    def __len__(self) -> int:
+        return len(self.min_cgpa)
+
+    def append(self, job: JobFeatures) -> "JobColumns":
+        """Return a copy with one more row; new names extend the vocabularies."""
+        return self.extend([job])
+
+    def extend(self, jobs) -> "JobColumns":
+        """Return a copy with a row appended per job."""
+        tail = JobColumns.from_features(list(jobs), self.locations, self.branches, self.skills)
+        width = tail.branch_bits.shape[1]
+        head_bits = self.branch_bits
+        if head_bits.shape[1] < width:
+            head_bits = np.pad(head_bits, ((0, 0), (0, width - head_bits.shape[1])))
+        head_skills = self.skill_matrix.copy()
+        head_skills.resize((len(self), len(tail.skills)))
+        return JobColumns(
+            np.append(self.min_cgpa, tail.min_cgpa),
+            np.append(self.location_codes, tail.location_codes),
+            np.vstack([head_bits, tail.branch_bits]),
+            sparse.vstack([head_skills, tail.skill_matrix], format="csr"),
+            tail.locations,
+            tail.branches,
+            tail.skills,
+        )
+
+    def rule_points(self, student) -> np.ndarray:
+        """Vectorised ``_rule_points`` of ``student`` against every row."""
+        skill_codes = [self.skill_vocabulary[s] for s in student.skills if s in self.skill_vocabulary]
+        if skill_codes:
+            selected = np.zeros(len(self.skills), dtype=np.int32)
+            selected[skill_codes] = 1
+            points = SKILL_POINTS * (self.skill_matrix @ selected).astype(float)
+        else:
+            points = np.zeros(len(self))
+
+        if student.cgpa is not None:
+            points += np.where(
+                _cents(student.cgpa) < self.min_cgpa, CGPA_BELOW_POINTS, CGPA_MET_POINTS
+            )
+
+        branch = self.branch_vocabulary.get(student.branch)
+        if branch is not None:
+            bits = self.branch_bits[:, branch // 64] >> np.uint64(branch % 64)
+            points += BRANCH_POINTS * (bits & np.uint64(1)).astype(float)
+
+        location_codes = [
+            self.location_vocabulary[name]
+            for name in student.locations
+            if name in self.location_vocabulary
+        ]
+        if location_codes:
+            points += LOCATION_POINTS * np.isin(self.location_codes, location_codes)
+        return points
+
+    def rule_points_batch(self, students: "StudentColumns") -> np.ndarray:
+        """``rule_points`` of many students at once: one row per student.
+
+        ``students`` must be built on this object's vocabularies, i.e.
+        ``StudentColumns.from_features(features, self.branches, self.skills,
+        self.locations)``; names only students use are coded past the end
+        and never match a job.
+        """
+        overlap = students.skill_matrix[:, : len(self.skills)] @ self.skill_matrix.T
+        points = SKILL_POINTS * overlap.toarray().astype(float)
+
+        cgpa = students.cgpa[:, None]
+        points += np.where(
+            cgpa < 0, 0, np.where(cgpa < self.min_cgpa, CGPA_BELOW_POINTS, CGPA_MET_POINTS)
+        )
+        points += BRANCH_POINTS * self._branch_matches(students.branch_codes)
+
+        locations = students.location_matrix[:, : len(self.locations)].toarray() > 0
+        points += LOCATION_POINTS * locations[:, self.location_codes]
+        return points
+
+    def eligible_batch(self, students: "StudentColumns", cgpa_margin=0) -> np.ndarray:
+        """Rows each student is eligible for, as ``candidate_jobs`` filters them.
+
+        CGPA passes up to ``cgpa_margin`` below the minimum; jobs that list
+        no branches are open to every branch, and students without a CGPA or
+        a branch pass that check everywhere. ``students`` as for
+        ``rule_points_batch``.
+        """
+        cgpa = students.cgpa[:, None]
+        eligible = (cgpa < 0) | (self.min_cgpa <= cgpa + _cents(cgpa_margin))
+        open_to_all = ~self.branch_bits.any(axis=1)
+        no_branch = (students.branch_codes < 0)[:, None]
+        return eligible & (open_to_all | no_branch | self._branch_matches(students.branch_codes))
+
+    def _branch_matches(self, branch_codes) -> np.ndarray:
+        matches = np.zeros((len(branch_codes), len(self)), dtype=bool)
+        known = (branch_codes >= 0) & (branch_codes < len(self.branches))
+        codes = branch_codes[known].astype(np.uint64)
+        words = self.branch_bits[:, codes // np.uint64(64)].T
+        matches[known] = ((words >> (codes % np.uint64(64))[:, None]) & np.uint64(1)) == 1
+        return matches
+
+    def features(self, row: int) -> JobFeatures:
+        """Rebuild the ``JobFeatures`` of one row, e.g. to explain a winner."""
+        skill_codes = self.skill_matrix.indices[
+            self.skill_matrix.indptr[row]:self.skill_matrix.indptr[row + 1]
+        ]
+        branches = [
+            name
+            for code, name in enumerate(self.branches)
+            if int(self.branch_bits[row, code // 64]) >> (code % 64) & 1
+        ]
+        return JobFeatures(
+            skills=frozenset(self.skills[code] for code in skill_codes),
+            branches=frozenset(branches),
+            location=self.locations[self.location_codes[row]],
+            min_cgpa=Decimal(int(self.min_cgpa[row])).scaleb(-2),
+        )
+
+
+class StudentColumns:
+    """Columnar student attributes for scoring one job against many students.
+
+    ``cgpa`` uses -1 for students who have not entered one; those get no
+    CGPA adjustment, as in ``_rule_points``.
+    """
+
+    def __init__(
+        self,
+        cgpa,
+        branch_codes,
+        skill_matrix,
+        location_matrix,
+        branches,
+        skills,
+        locations,
+    ):
+        self.cgpa = cgpa
+        self.branch_codes = branch_codes
+        self.skill_matrix = skill_matrix
+        self.location_matrix = location_matrix
+        self.branches = branches
+        self.skills = skills
+        self.locations = locations
+        self.branch_vocabulary = {name: code for code, name in enumerate(branches)}
+        self.skill_vocabulary = {name: code for code, name in enumerate(skills)}
+        self.location_vocabulary = {name: code for code, name in enumerate(locations)}
+
+    @classmethod
+    def from_features(cls, features, branches=(), skills=(), locations=()):
+        branches, skills, locations = list(branches), list(skills), list(locations)
+        branch_vocabulary = {name: code for code, name in enumerate(branches)}
+        skill_vocabulary = {name: code for code, name in enumerate(skills)}
+        location_vocabulary = {name: code for code, name in enumerate(locations)}
+
+        branch_codes = np.full(len(features), -1, dtype=np.int32)
+        skill_rows, skill_codes, location_rows, location_codes = [], [], [], []
+        for row, student in enumerate(features):
+            if student.branch:
+                branch_codes[row] = _code(branch_vocabulary, branches, student.branch)
+            for skill in student.skills:
+                skill_rows.append(row)
+                skill_codes.append(_code(skill_vocabulary, skills, skill))
+            for location in student.locations:
+                location_rows.append(row)
+                location_codes.append(_code(location_vocabulary, locations, location))
+
+        return cls(
+            np.array(
+                [-1 if s.cgpa is None else _cents(s.cgpa) for s in features], dtype=np.int64
+            ),
+            branch_codes,
+            sparse.csr_matrix(
+                (np.ones(len(skill_rows), dtype=np.int32), (skill_rows, skill_codes)),
+                shape=(len(features), len(skills)),
+            ),
+            sparse.csr_matrix(
+                (np.ones(len(location_rows), dtype=np.int32), (location_rows, location_codes)),
+                shape=(len(features), len(locations)),
+            ),
+            branches,
+            skills,
+            locations,
+        )
+
+    def __len__(self) -> int:
+        return len(self.cgpa)
+
+    def append(self, student) -> "StudentColumns":
+        """Return a copy with one more row; new names extend the vocabularies."""
+        return self.extend([student])
+
+    def extend(self, students) -> "StudentColumns":
+        """Return a copy with a row appended per student."""
+        tail = StudentColumns.from_features(
+            list(students), self.branches, self.skills, self.locations
+        )
+        head_skills = self.skill_matrix.copy()
+        head_skills.resize((len(self), len(tail.skills)))
+        head_locations = self.location_matrix.copy()
+        head_locations.resize((len(self), len(tail.locations)))
+        return StudentColumns(
+            np.append(self.cgpa, tail.cgpa),
+            np.append(self.branch_codes, tail.branch_codes),
+            sparse.vstack([head_skills, tail.skill_matrix], format="csr"),
+            sparse.vstack([head_locations, tail.location_matrix], format="csr"),
+            tail.branches,
+            tail.skills,
+            tail.locations,
+        )
+
+    def take(self, rows) -> "StudentColumns":
+        """The columns of ``rows`` only, with the same vocabularies."""
+        return StudentColumns(
+            self.cgpa[rows],
+            self.branch_codes[rows],
+            self.skill_matrix[rows],
+            self.location_matrix[rows],
+            self.branches,
+            self.skills,
+            self.locations,
+        )
+
+    def rule_points(self, job: JobFeatures, rows) -> np.ndarray:
+        """Vectorised ``_rule_points`` of every student in ``rows`` against ``job``."""
+        skill_codes = [self.skill_vocabulary[s] for s in job.skills if s in self.skill_vocabulary]
+        if skill_codes:
+            selected = np.zeros(len(self.skills), dtype=np.int32)
+            selected[skill_codes] = 1
+            points = SKILL_POINTS * (self.skill_matrix[rows] @ selected).astype(float)
+        else:
+            points = np.zeros(len(rows))
+
+        cgpa = self.cgpa[rows]
+        points += np.where(
+            cgpa < 0,
+            0,
+            np.where(cgpa < _cents(job.min_cgpa), CGPA_BELOW_POINTS, CGPA_MET_POINTS),
+        )
+
+        branch_codes = [self.branch_vocabulary[b] for b in job.branches if b in self.branch_vocabulary]
+        if branch_codes:
+            points += BRANCH_POINTS * np.isin(self.branch_codes[rows], branch_codes)
+
+        location = self.location_vocabulary.get(job.location)
+        if location is not None:
+            matches = self.location_matrix[rows][:, location].toarray().ravel()
+            points += LOCATION_POINTS * (matches > 0)
+        return points
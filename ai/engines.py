@@ -0,0 +1,230 @@
+"""Text vectorisers the recommender can run on, selected by ``RECOMMENDER_ENGINE``.
+
+* ``"tfidf"`` (default) - ``TfidfVectorizer`` fitted on the job corpus. Job
+  and student vectors depend on the fitted vocabulary and IDF, so the index
+  is refitted on compaction and every process needs that fitted state.
+* ``"hashing"`` - ``HashingTfidfVectorizer``: terms are hashed into a fixed
+  ``RECOMMENDER_HASHING_FEATURES`` columns, optionally weighted by document
+  frequencies precomputed with ``manage.py fit_hashing_idf``. Nothing is
+  fitted, so any process can vectorise a job or a profile on its own, the
+  index can be built in parallel shards and appended to without refitting,
+  and memory is bounded by the feature count rather than the vocabulary.
+* ``"lsa"`` - ``LsaVectorizer``: TF-IDF projected onto a fixed TruncatedSVD
+  basis of ``RECOMMENDER_LSA_DIMENSIONS`` columns, trained and refreshed
+  with ``manage.py train_lsa_model`` into ``RECOMMENDER_LSA_MODEL``. Vectors
+  are dense, L2-normalised float32 rows, so the job matrix is one
+  contiguous array and ranking a student is a single matrix-vector product.
+  Until a model is trained the engine falls back to ``"tfidf"``.
+
+``stack`` and ``dot`` work on either kind of matrix.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ("tfidf", "hashing", "lsa")
+STOP_WORDS = "english"
+
+
+class HashingTfidfVectorizer:
+    """Hashed term counts, scaled by ``idf_`` when given, L2-normalised.
+
+    Matches ``TfidfVectorizer``'s defaults (raw counts, smoothed IDF, L2
+    norm) apart from hash collisions.
+    """
+
+    def __init__(self, n_features: int, idf=None, stop_words=STOP_WORDS):
+        self.n_features = n_features
+        self.idf_ = idf
+        self.stop_words = stop_words
+        self._hasher = HashingVectorizer(
+            stop_words=stop_words, n_features=n_features, alternate_sign=False, norm=None
+        )
+
+    def fit_transform(self, texts):
+        return self.transform(texts)
+
+    def transform(self, texts):
+        counts = self._hasher.transform(texts)
+        if self.idf_ is not None:
+            counts.data *= self.idf_[counts.indices]
+        return normalize(counts, copy=False)
+
+    def document_frequencies(self, texts) -> np.ndarray:
+        """Number of ``texts`` each hashed feature occurs in."""
+        return np.bincount(self._hasher.transform(texts).indices, minlength=self.n_features)
+
+
+class LsaVectorizer:
+    """TF-IDF vectors projected onto ``components`` (dimensions x terms)."""
+
+    def __init__(self, tfidf, components):
+        self.tfidf = tfidf
+        self.components = components
+        self.stop_words = tfidf.stop_words
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[0]
+
+    def fit_transform(self, texts):
+        return self.transform(texts)
+
+    def transform(self, texts):
+        projected = np.asarray(self.tfidf.transform(texts) @ self.components.T, dtype=np.float32)
+        return normalize(projected, copy=False)
+
+
+def stack(parts):
+    """Stack row blocks of sparse or dense (LSA) vectors."""
+    if sparse.issparse(parts[0]):
+        return sparse.vstack(parts, format="csr")
+    return np.vstack(parts)
+
+
+def dot(matrix, vectors) -> np.ndarray:
+    """``matrix @ vectors.T`` as a dense array, for sparse or dense vectors."""
+    product = matrix @ vectors.T
+    return product.toarray() if sparse.issparse(product) else np.asarray(product)
+
+
+def engine_name() -> str:
+    name = getattr(settings, "RECOMMENDER_ENGINE", "tfidf")
+    if name not in ENGINES:
+        raise ImproperlyConfigured(f"RECOMMENDER_ENGINE must be one of {', '.join(ENGINES)}.")
+    return name
+
+
+def hashing_features() -> int:
+    return getattr(settings, "RECOMMENDER_HASHING_FEATURES", 2**18)
+
+
+def smoothed_idf(document_frequencies, documents: int) -> np.ndarray:
+    """``TfidfVectorizer``'s ``smooth_idf`` weights."""
+    return np.log((1 + documents) / (1 + np.asarray(document_frequencies, dtype=float))) + 1
+
+
+def load_hashing_idf():
+    """Weights saved by ``fit_hashing_idf``, or ``None`` to use plain term counts."""
+    path = getattr(settings, "RECOMMENDER_HASHING_IDF", None)
+    if not path or not Path(path).exists():
+        return None
+    idf = np.load(path)
+    if len(idf) != hashing_features():
+        logger.warning(
+            "Ignoring %s: %s weights for %s hashed features", path, len(idf), hashing_features()
+        )
+        return None
+    return idf
+
+
+def lsa_model_path():
+    path = getattr(settings, "RECOMMENDER_LSA_MODEL", None)
+    return Path(path) if path else None
+
+
+def save_lsa_model(vectorizer: LsaVectorizer, path: Path) -> None:
+    """Write a trained model as one ``.npz`` file, replaced atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    terms = sorted(vectorizer.tfidf.vocabulary_.items(), key=lambda item: item[1])
+    with open(staging, "wb") as file:
+        np.savez(
+            file,
+            terms=np.array([term for term, _ in terms]),
+            idf=vectorizer.tfidf.idf_,
+            components=vectorizer.components,
+            stop_words=np.array(vectorizer.stop_words or ""),
+        )
+    os.replace(staging, path)
+
+
+def load_lsa_model():
+    path = lsa_model_path()
+    if path is None or not path.exists():
+        return None
+    with np.load(path) as model:
+        tfidf = TfidfVectorizer(
+            stop_words=str(model["stop_words"]) or None,
+            vocabulary={str(term): column for column, term in enumerate(model["terms"])},
+        )
+        tfidf.idf_ = model["idf"]
+        return LsaVectorizer(tfidf, model["components"])
+
+
+def active_engine() -> str:
+    """``engine_name()``, or ``"tfidf"`` while the LSA engine has no trained model."""
+    name = engine_name()
+    if name == "lsa" and (lsa_model_path() is None or not lsa_model_path().exists()):
+        logger.warning("No trained LSA model; run train_lsa_model. Using the tfidf engine.")
+        return "tfidf"
+    return name
+
+
+def new_vectorizer():
+    name = active_engine()
+    if name == "hashing":
+        return HashingTfidfVectorizer(hashing_features(), load_hashing_idf())
+    if name == "lsa":
+        return load_lsa_model()
+    return TfidfVectorizer(stop_words=STOP_WORDS)
+
+
+def engine_of(vectorizer) -> str:
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+        return "hashing"
+    if isinstance(vectorizer, LsaVectorizer):
+        return "lsa"
+    return "tfidf"
+
+
+def _save_terms(tfidf, directory: Path) -> None:
+    terms = sorted(tfidf.vocabulary_.items(), key=lambda item: item[1])
+    (directory / "terms.json").write_text(json.dumps([term for term, _ in terms]))
+    np.save(directory / "idf.npy", tfidf.idf_)
+
+
+def _load_terms(directory: Path, stop_words):
+    terms = json.loads((directory / "terms.json").read_text())
+    tfidf = TfidfVectorizer(
+        stop_words=stop_words,
+        vocabulary={term: column for column, term in enumerate(terms)},
+    )
+    tfidf.idf_ = np.load(directory / "idf.npy")
+    return tfidf
+
+
+def save_vectorizer(vectorizer, directory: Path) -> dict:
+    """Write the state ``load_vectorizer`` needs into ``directory``; return its metadata."""
+    meta = {"engine": engine_of(vectorizer), "stop_words": vectorizer.stop_words}
+    if meta["engine"] == "hashing":
+        meta["n_features"] = vectorizer.n_features
+        meta["idf"] = vectorizer.idf_ is not None
+        if vectorizer.idf_ is not None:
+            np.save(directory / "idf.npy", vectorizer.idf_)
+    elif meta["engine"] == "lsa":
+        _save_terms(vectorizer.tfidf, directory)
+        np.save(directory / "components.npy", np.ascontiguousarray(vectorizer.components))
+    else:
+        _save_terms(vectorizer, directory)
+    return meta
+
+
+def load_vectorizer(meta: dict, directory: Path):
+    if meta["engine"] == "hashing":
+        idf = np.load(directory / "idf.npy") if meta["idf"] else None
+        return HashingTfidfVectorizer(meta["n_features"], idf, meta["stop_words"])
+    tfidf = _load_terms(directory, meta["stop_words"])
+    if meta["engine"] == "lsa":
+        return LsaVectorizer(tfidf, np.load(directory / "components.npy", mmap_mode="r"))
+    return tfidf
@@ -0,0 +1,58 @@
+"""Bounded worker pool for ranking work started from async views.
+
+Scoring is CPU-bound, so awaiting it on the event loop would stall every
+other request on that worker. ``run_ranking`` hands the call to a small
+thread pool (``RECOMMENDER_WORKERS`` threads) instead: the loop keeps
+serving I/O-bound requests while at most that many rankings run, and any
+further ones queue for a free thread.
+
+Threads rather than processes: the fitted ``JobIndex`` lives in this
+process's memory, and worker processes would each have to load their own.
+Each call runs with the caller's context variables (so request metrics
+still see its queries) and closes stale DB connections around it, as
+Django does around a request.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _max_workers() -> int:
+    return getattr(settings, "RECOMMENDER_WORKERS", None) or min(4, os.cpu_count() or 1)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_max_workers(), thread_name_prefix="recommender"
+                )
+    return _executor
+
+
+def _call(func, args, kwargs):
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_ranking(func, *args, **kwargs):
+    """Await ``func(*args, **kwargs)`` run on the ranking pool."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(context.run, _call, func, args, kwargs)
+    )
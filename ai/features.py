@@ -0,0 +1,59 @@
+"""Text and feature extraction shared by the recommender and its job index."""
+from decimal import Decimal
+from typing import FrozenSet, NamedTuple, Optional
+
+from portal.utils import split_csv
+
+
+def _build_student_text(profile) -> str:
+    fields = [
+        profile.skills,
+        profile.interests,
+        profile.projects,
+        profile.certifications,
+    ]
+    return " ".join([field for field in fields if field])
+
+
+def _build_job_text(job) -> str:
+    fields = [
+        job.description,
+        job.required_skills,
+        job.title,
+        job.company,
+    ]
+    return " ".join([field for field in fields if field])
+
+
+class JobFeatures(NamedTuple):
+    """Rule-scoring attributes of a job, pre-split once at index time."""
+
+    skills: FrozenSet[str]
+    branches: FrozenSet[str]
+    location: str
+    min_cgpa: Decimal
+
+
+class StudentFeatures(NamedTuple):
+    skills: FrozenSet[str]
+    cgpa: Optional[Decimal]
+    branch: str
+    locations: FrozenSet[str]
+
+
+def _job_features(job) -> JobFeatures:
+    return JobFeatures(
+        skills=frozenset(split_csv(job.required_skills)),
+        branches=frozenset(split_csv(job.eligible_branches)),
+        location=job.location.strip().lower(),
+        min_cgpa=job.min_cgpa,
+    )
+
+
+def _student_features(profile) -> StudentFeatures:
+    return StudentFeatures(
+        skills=frozenset(split_csv(profile.skills)),
+        cgpa=profile.cgpa,
+        branch=profile.branch.strip().lower() if profile.branch else "",
+        locations=frozenset(split_csv(profile.preferred_locations)),
+    )
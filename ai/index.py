@@ -0,0 +1,764 @@
+"""Persistent job-side TF-IDF index reused across recommendation requests.
+
+The vocabulary and the sparse job matrix are fitted once and kept in memory.
+A request only has to transform the student's text and run one sparse
+dot product against the matrix (with the LSA engine, the matrix is a dense
+float32 array and that product is a single BLAS matrix-vector multiply).
+
+Saving or deleting a job patches just that job's row: the old row is
+tombstoned and, for saves, a new row is appended using the fitted
+vocabulary. Every patch produces a new ``JobIndex`` that is swapped in
+atomically, so readers never see a half-applied update. After enough
+patches (or enough time) the index is compacted in a background thread:
+tombstones are dropped and the IDF weights are refitted from the database.
+The vectoriser comes from ``ai.engines`` (``RECOMMENDER_ENGINE``); the
+hashing and LSA engines have nothing to refit (the LSA projection is only
+retrained by ``train_lsa_model``), so there compaction only drops
+tombstones.
+
+With ``RECOMMENDER_ARTIFACT_DIR`` set, built indexes are also published as
+memory-mapped generations on disk (``ai.artifacts``) so worker processes
+share one copy. Each worker opens the current generation instead of
+building its own, and checks every ``RECOMMENDER_ARTIFACT_POLL_INTERVAL``
+seconds whether another process has published a newer one.
+
+Patches reach the other processes through ``JobChange`` rows: every patch
+(and ``invalidate_job_index``) records one after it is applied locally.
+Before serving its index, each process reads, at most every
+``RECOMMENDER_SYNC_INTERVAL`` seconds, the rows newer than the last change
+its index reflects and patches those jobs in as well; a bulk change, or an
+index not synced for longer than rows are kept
+(``RECOMMENDER_JOB_CHANGE_RETENTION``), makes it rebuild instead.
+
+``StudentIndex`` holds student profiles in the same vocabulary so a job can
+be ranked against every student (``recommend_students``). Profile patches
+reach the other processes the same way, through ``ProfileChange`` rows.
+"""
+import datetime
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Max
+from django.utils import timezone
+
+from portal.models import Job, JobChange, Profile, ProfileChange
+
+from . import artifacts
+from .columns import JobColumns, StudentColumns
+from .engines import HashingTfidfVectorizer, active_engine, dot, engine_of, new_vectorizer, stack
+from .features import _build_job_text, _build_student_text, _job_features, _student_features
+
+logger = logging.getLogger(__name__)
+
+JOB_INDEX_FIELDS = (
+    "id",
+    "title",
+    "company",
+    "description",
+    "required_skills",
+    "min_cgpa",
+    "eligible_branches",
+    "location",
+)
+STUDENT_INDEX_FIELDS = (
+    "id",
+    "role",
+    "branch",
+    "cgpa",
+    "skills",
+    "interests",
+    "projects",
+    "certifications",
+    "preferred_locations",
+)
+
+_lock = threading.Lock()
+_index = None
+_compacting = False
+_pending = []
+_rebuild = False
+_checked_at = 0.0
+_changes_checked_at = 0.0
+SYNC_BATCH = 500
+
+
+class JobIndex:
+    """Fitted vocabulary plus an L2-normalised matrix of job vectors.
+
+    The matrix is sparse CSR, or a contiguous float32 array for the LSA engine.
+
+    ``columns`` holds the rule-scoring attributes of each row as arrays so
+    ranking never has to load or re-parse ``Job`` instances. ``generation``
+    names the on-disk generation it was opened from (or patched on top of).
+    ``change_id`` is the last ``JobChange`` it reflects, as of the wall-clock
+    time ``synced_at``; ``applied_changes`` are newer ``JobChange`` ids this
+    process recorded and already patched into it, which syncing skips.
+    """
+
+    def __init__(
+        self,
+        vectorizer,
+        matrix,
+        job_ids,
+        columns,
+        alive=None,
+        mutations=0,
+        built_at=None,
+        generation=None,
+        change_id=0,
+        synced_at=None,
+        applied_changes=frozenset(),
+    ):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.job_ids = np.asarray(job_ids, dtype=np.int64)
+        self.columns = columns
+        self.alive = np.ones(len(self.job_ids), dtype=bool) if alive is None else alive
+        self.mutations = mutations
+        self.built_at = time.monotonic() if built_at is None else built_at
+        self.generation = generation
+        self.change_id = change_id
+        self.synced_at = time.time() if synced_at is None else synced_at
+        self.applied_changes = applied_changes
+        self.rows = {
+            int(job_id): row
+            for row, job_id in enumerate(self.job_ids)
+            if self.alive[row]
+        }
+
+    @classmethod
+    def build(cls, jobs, workers: int = 1, vectorizer=None):
+        """Fit (or, for the hashing and LSA engines, just vectorise) ``jobs``.
+
+        ``vectorizer`` defaults to a new one for the configured engine. With
+        the hashing engine and ``workers`` > 1 the texts are vectorised in
+        shards by that many processes and the shards stacked.
+        """
+        jobs = list(jobs)
+        texts = [_build_job_text(job) for job in jobs]
+        vectorizer = new_vectorizer() if vectorizer is None else vectorizer
+        if workers > 1 and isinstance(vectorizer, HashingTfidfVectorizer) and texts:
+            size = -(-len(texts) // workers)
+            shards = [texts[start:start + size] for start in range(0, len(texts), size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                matrix = stack(list(executor.map(vectorizer.transform, shards)))
+        else:
+            try:
+                matrix = vectorizer.fit_transform(texts)
+            except ValueError:
+                # Empty corpus or nothing but stop words: similarity is always zero.
+                vectorizer, matrix = None, None
+        return cls(
+            vectorizer,
+            matrix,
+            [job.id for job in jobs],
+            JobColumns.from_features([_job_features(job) for job in jobs]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def version(self) -> int:
+        """Newest ``JobChange`` reflected, counting this process's own patches."""
+        return max(self.change_id, max(self.applied_changes, default=0))
+
+    def transform(self, text: str):
+        if self.vectorizer is None or not text:
+            return None
+        return self.vectorizer.transform([text])
+
+    def similarities(self, vector, rows=None):
+        """Cosine similarity of a transformed vector against indexed rows."""
+        size = len(self.job_ids) if rows is None else len(rows)
+        if vector is None or self.matrix is None or size == 0:
+            return np.zeros(size)
+        if isinstance(self.matrix, np.ndarray):
+            # One matrix-vector product over the whole contiguous array is
+            # cheaper than gathering the rows into a copy first.
+            scores = self.matrix @ vector.ravel()
+            return scores if rows is None else scores[rows]
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return dot(matrix, vector).ravel()
+
+    def needs_compaction(self) -> bool:
+        return _needs_compaction(self.mutations, self.built_at)
+
+    def with_job(self, job):
+        """Return a copy with ``job`` added, or its previous row replaced."""
+        return self.with_jobs([job])
+
+    def with_jobs(self, jobs):
+        """``with_job`` for many jobs, transformed and stacked in one go."""
+        if self.vectorizer is None:
+            return None
+        alive = self._tombstoned(*[job.id for job in jobs])
+        rows = self.vectorizer.transform([_build_job_text(job) for job in jobs])
+        return JobIndex(
+            self.vectorizer,
+            stack([self.matrix, rows]),
+            np.append(self.job_ids, [job.id for job in jobs]),
+            self.columns.extend([_job_features(job) for job in jobs]),
+            np.append(alive, np.ones(len(jobs), dtype=bool)),
+            self.mutations + len(jobs),
+            self.built_at,
+            self.generation,
+            self.change_id,
+            self.synced_at,
+            self.applied_changes,
+        )
+
+    def without_job(self, job_id: int):
+        """Return a copy with the row for ``job_id`` tombstoned."""
+        if job_id not in self.rows:
+            return self
+        return JobIndex(
+            self.vectorizer,
+            self.matrix,
+            self.job_ids,
+            self.columns,
+            self._tombstoned(job_id),
+            self.mutations + 1,
+            self.built_at,
+            self.generation,
+            self.change_id,
+            self.synced_at,
+            self.applied_changes,
+        )
+
+    def _tombstoned(self, *job_ids: int):
+        alive = self.alive.copy()
+        for job_id in job_ids:
+            row = self.rows.get(job_id)
+            if row is not None:
+                alive[row] = False
+        return alive
+
+
+def _needs_compaction(mutations: int, built_at: float) -> bool:
+    compact_after = getattr(settings, "RECOMMENDER_COMPACT_AFTER", 200)
+    interval = getattr(settings, "RECOMMENDER_COMPACT_INTERVAL", 3600)
+    if mutations >= compact_after:
+        return True
+    return mutations > 0 and time.monotonic() - built_at >= interval
+
+
+def latest_job_change() -> int:
+    """Id of the newest ``JobChange``; anything ranked after reading it reflects it."""
+    return JobChange.objects.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def _build_from_db(workers: int = 1) -> JobIndex:
+    synced_at = time.time()
+    # Read first: changes committed during the build are replayed by the next sync.
+    change_id = latest_job_change()
+    index = JobIndex.build(Job.objects.only(*JOB_INDEX_FIELDS).order_by("id"), workers)
+    index.change_id, index.synced_at = change_id, synced_at
+    return index
+
+
+def _open_generation(root, generation: str) -> JobIndex:
+    arguments = artifacts.read_generation(root, generation)
+    vectorizer = arguments["vectorizer"]
+    if vectorizer is not None and engine_of(vectorizer) != active_engine():
+        raise ValueError(f"{generation} was built with the {engine_of(vectorizer)} engine")
+    return JobIndex(**arguments, generation=generation)
+
+
+def _publish(index: JobIndex) -> JobIndex:
+    """Publish ``index`` when artifacts are enabled and return its mapped copy."""
+    root = artifacts.artifact_root()
+    if root is None:
+        return index
+    try:
+        return _open_generation(root, artifacts.publish(root, index))
+    except (OSError, ValueError):
+        logger.exception("Could not publish the job index to %s", root)
+        return index
+
+
+def _load_or_build(rebuild: bool = False) -> JobIndex:
+    root = artifacts.artifact_root()
+    generation = None if root is None or rebuild else artifacts.current_generation(root)
+    if generation is not None:
+        try:
+            return _open_generation(root, generation)
+        except (OSError, ValueError):
+            logger.exception("Could not open job index generation %s", generation)
+    return _publish(_build_from_db())
+
+
+def _newer_generation(index: JobIndex):
+    """A generation published since ``index`` was opened, polled at an interval."""
+    global _checked_at
+    root = artifacts.artifact_root()
+    now = time.monotonic()
+    interval = getattr(settings, "RECOMMENDER_ARTIFACT_POLL_INTERVAL", 5)
+    if root is None or now - _checked_at < interval:
+        return None
+    _checked_at = now
+    generation = artifacts.current_generation(root)
+    return None if generation in (None, index.generation) else generation
+
+
+def _swap_in(generation: str):
+    global _index
+    try:
+        opened = _open_generation(artifacts.artifact_root(), generation)
+    except (OSError, ValueError):
+        logger.exception("Could not open job index generation %s", generation)
+        return None
+    with _lock:
+        # A compaction in progress publishes its own, newer generation.
+        if not _compacting and _index is not None:
+            _index = opened
+        return _index
+
+
+def _retention() -> int:
+    return getattr(settings, "RECOMMENDER_JOB_CHANGE_RETENTION", 24 * 3600)
+
+
+def _record_changes(job_ids) -> list:
+    """Record patches for the other processes to apply; returns the ``JobChange`` ids."""
+    try:
+        changes = JobChange.objects.bulk_create([JobChange(job_id=job_id) for job_id in job_ids])
+    except DatabaseError:
+        logger.exception("Could not record job index changes")
+        return []
+    return [change.pk for change in changes if change.pk is not None]
+
+
+def _sync(index: JobIndex):
+    """``index`` with other processes' job changes patched in; ``None`` to rebuild."""
+    global _index, _rebuild, _changes_checked_at
+    now = time.monotonic()
+    if now - _changes_checked_at < getattr(settings, "RECOMMENDER_SYNC_INTERVAL", 1):
+        return index
+    _changes_checked_at = now
+    synced_at = time.time()
+    changes = list(
+        JobChange.objects.filter(id__gt=index.change_id)
+        .order_by("id")
+        .values_list("id", "job_id")[: SYNC_BATCH + 1]
+    )
+    foreign = [job_id for change_id, job_id in changes if change_id not in index.applied_changes]
+    rebuild = (
+        synced_at - index.synced_at > _retention()
+        or len(changes) > SYNC_BATCH
+        or None in foreign
+    )
+    jobs = []
+    if foreign and not rebuild:
+        jobs = list(Job.objects.filter(id__in=set(foreign)).only(*JOB_INDEX_FIELDS))
+
+    with _lock:
+        if _index is not index:
+            return _index
+        patched = index.with_jobs(jobs) if jobs else index
+        for job_id in set(foreign) - {job.id for job in jobs}:
+            if patched is not None:
+                patched = patched.without_job(job_id)
+        if rebuild or patched is None:
+            _index, _rebuild = None, True
+            return None
+        if changes:
+            patched.change_id = changes[-1][0]
+            patched.applied_changes = frozenset(
+                change_id for change_id in index.applied_changes if change_id > patched.change_id
+            )
+        patched.synced_at = synced_at
+        _index = patched
+        return patched
+
+
+def get_job_index() -> JobIndex:
+    global _index, _rebuild, _changes_checked_at
+    index = _index
+    if index is not None:
+        generation = _newer_generation(index)
+        if generation is not None:
+            index = _swap_in(generation) or index
+        index = _sync(index)
+    if index is None:
+        with _lock:
+            if _index is None:
+                _index = _load_or_build(_rebuild)
+                _rebuild = False
+                _changes_checked_at = time.monotonic()
+            index = _index
+    elif index.needs_compaction():
+        compact_job_index(background=True)
+    return index
+
+
+def _apply(index, operation, payload, change_ids=()):
+    if index is None:
+        return None
+    if operation == "upsert":
+        index = index.with_job(payload)
+    elif operation == "upsert_many":
+        index = index.with_jobs(payload)
+    else:
+        index = index.without_job(payload)
+    if index is not None and change_ids:
+        index.applied_changes = index.applied_changes | frozenset(change_ids)
+    return index
+
+
+def _patch(operation, payload, change_ids) -> None:
+    global _index
+    with _lock:
+        if _compacting:
+            _pending.append((operation, payload, change_ids))
+        _index = _apply(_index, operation, payload, change_ids)
+
+
+def update_job(job) -> None:
+    """Add or replace a single job's row in the live index of every process."""
+    _patch("upsert", job, _record_changes([job.id]))
+
+
+def update_jobs(jobs) -> None:
+    """Add or replace many jobs' rows in every live index as one patch."""
+    if jobs:
+        jobs = list(jobs)
+        _patch("upsert_many", jobs, _record_changes([job.id for job in jobs]))
+
+
+def remove_job(job_id: int) -> None:
+    """Tombstone a single job's row in the live index of every process."""
+    _patch("delete", job_id, _record_changes([job_id]))
+
+
+def compact_job_index(background: bool = False) -> None:
+    """Rebuild from the database, dropping tombstones and refitting IDF.
+
+    With artifacts enabled the rebuilt index is published for every worker.
+    Readers keep using the patched index until the rebuilt one is swapped in.
+    Patches that arrive while the rebuild runs are replayed on top of it.
+    """
+    global _compacting
+    with _lock:
+        if _compacting:
+            return
+        _compacting = True
+        _pending.clear()
+
+    if background:
+        threading.Thread(target=_compact_in_thread, name="job-index-compaction", daemon=True).start()
+    else:
+        _run_compaction()
+
+
+def _compact_in_thread() -> None:
+    try:
+        _run_compaction()
+    finally:
+        connection.close()
+
+
+def _prune_changes() -> None:
+    cutoff = timezone.now() - datetime.timedelta(seconds=_retention())
+    JobChange.objects.filter(created_at__lt=cutoff).delete()
+    ProfileChange.objects.filter(created_at__lt=cutoff).delete()
+
+
+def _run_compaction() -> None:
+    global _index, _compacting
+    try:
+        rebuilt = _publish(_build_from_db())
+        _prune_changes()
+    except Exception:
+        logger.exception("Job index compaction failed")
+        with _lock:
+            _compacting = False
+        return
+
+    with _lock:
+        for operation, payload, change_ids in _pending:
+            rebuilt = _apply(rebuilt, operation, payload, change_ids)
+        _pending.clear()
+        _index = rebuilt
+        _compacting = False
+
+
+def invalidate_job_index() -> None:
+    """Drop the live index of every process, e.g. after a bulk load.
+
+    The next reader here rebuilds (and publishes) it; other processes
+    rebuild on their next sync.
+    """
+    global _index, _rebuild
+    with _lock:
+        _index = None
+        _rebuild = True
+    _record_changes([None])
+
+
+def publish_job_index(workers: int = 1) -> JobIndex:
+    """Rebuild from the database now and swap the result in, published if enabled."""
+    global _index
+    rebuilt = _publish(_build_from_db(workers))
+    _prune_changes()
+    with _lock:
+        _index = rebuilt
+    return rebuilt
+
+
+class StudentIndex:
+    """Student-profile vectors in the job index's vocabulary, for reverse matching.
+
+    It is tied to the ``JobIndex`` vectorizer it was built with and rebuilt
+    when compaction refits that vectorizer. Profile saves patch single rows
+    the same way job saves do, and the tombstoned rows they leave are dropped
+    after as many patches or as long as for ``JobIndex``. The vectorizer is
+    not refitted, so that compaction happens in memory. ``change_id``,
+    ``synced_at`` and ``applied_changes`` track ``ProfileChange`` rows the
+    way ``JobIndex`` tracks ``JobChange`` rows.
+    """
+
+    def __init__(
+        self,
+        vectorizer,
+        matrix,
+        profile_ids,
+        columns,
+        alive=None,
+        mutations=0,
+        built_at=None,
+        change_id=0,
+        synced_at=None,
+        applied_changes=frozenset(),
+    ):
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.profile_ids = np.asarray(profile_ids, dtype=np.int64)
+        self.columns = columns
+        self.alive = np.ones(len(self.profile_ids), dtype=bool) if alive is None else alive
+        self.mutations = mutations
+        self.built_at = time.monotonic() if built_at is None else built_at
+        self.change_id = change_id
+        self.synced_at = time.time() if synced_at is None else synced_at
+        self.applied_changes = applied_changes
+        self.rows = {
+            int(profile_id): row
+            for row, profile_id in enumerate(self.profile_ids)
+            if self.alive[row]
+        }
+
+    @classmethod
+    def build(cls, vectorizer, profiles):
+        profiles = list(profiles)
+        matrix = None
+        if vectorizer is not None:
+            matrix = vectorizer.transform([_build_student_text(p) for p in profiles])
+        return cls(
+            vectorizer,
+            matrix,
+            [profile.id for profile in profiles],
+            StudentColumns.from_features([_student_features(p) for p in profiles]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def similarities(self, vector, rows):
+        if vector is None or self.matrix is None or not len(rows):
+            return np.zeros(len(rows))
+        return dot(self.matrix[rows], vector).ravel()
+
+    def needs_compaction(self) -> bool:
+        return _needs_compaction(self.mutations, self.built_at)
+
+    def compacted(self):
+        """Return a copy without the tombstoned rows."""
+        rows = np.flatnonzero(self.alive)
+        return StudentIndex(
+            self.vectorizer,
+            None if self.matrix is None else self.matrix[rows],
+            self.profile_ids[rows],
+            self.columns.take(rows),
+            change_id=self.change_id,
+            synced_at=self.synced_at,
+            applied_changes=self.applied_changes,
+        )
+
+    def with_profile(self, profile):
+        return self.with_profiles([profile])
+
+    def with_profiles(self, profiles):
+        """Return a copy with ``profiles`` added, or their previous rows replaced."""
+        alive = self._tombstoned(*[profile.id for profile in profiles])
+        matrix = self.matrix
+        if self.vectorizer is not None:
+            rows = self.vectorizer.transform([_build_student_text(p) for p in profiles])
+            matrix = stack([self.matrix, rows])
+        return StudentIndex(
+            self.vectorizer,
+            matrix,
+            np.append(self.profile_ids, [profile.id for profile in profiles]),
+            self.columns.extend([_student_features(profile) for profile in profiles]),
+            np.append(alive, np.ones(len(profiles), dtype=bool)),
+            self.mutations + len(profiles),
+            self.built_at,
+            self.change_id,
+            self.synced_at,
+            self.applied_changes,
+        )
+
+    def without_profile(self, profile_id: int):
+        if profile_id not in self.rows:
+            return self
+        return StudentIndex(
+            self.vectorizer,
+            self.matrix,
+            self.profile_ids,
+            self.columns,
+            self._tombstoned(profile_id),
+            self.mutations + 1,
+            self.built_at,
+            self.change_id,
+            self.synced_at,
+            self.applied_changes,
+        )
+
+    def _tombstoned(self, *profile_ids: int):
+        alive = self.alive.copy()
+        for profile_id in profile_ids:
+            row = self.rows.get(profile_id)
+            if row is not None:
+                alive[row] = False
+        return alive
+
+
+_student_lock = threading.Lock()
+_student_index = None
+_profile_changes_checked_at = 0.0
+
+
+def latest_profile_change() -> int:
+    return ProfileChange.objects.aggregate(latest=Max("id"))["latest"] or 0
+
+
+def _build_student_index(vectorizer) -> StudentIndex:
+    global _profile_changes_checked_at
+    synced_at = time.time()
+    # Read first, as for jobs: profiles saved during the build are synced next.
+    change_id = latest_profile_change()
+    index = StudentIndex.build(
+        vectorizer,
+        Profile.objects.filter(role=Profile.ROLE_STUDENT)
+        .only(*STUDENT_INDEX_FIELDS)
+        .order_by("id"),
+    )
+    index.change_id, index.synced_at = change_id, synced_at
+    _profile_changes_checked_at = time.monotonic()
+    return index
+
+
+def _record_profile_change(profile_id: int) -> list:
+    """Record a patch for the other processes to apply; returns the ``ProfileChange`` ids."""
+    try:
+        return [ProfileChange.objects.create(profile_id=profile_id).pk]
+    except DatabaseError:
+        logger.exception("Could not record a student index change")
+        return []
+
+
+def _sync_students(index: StudentIndex):
+    """``index`` with other processes' profile changes patched in; ``None`` to rebuild."""
+    global _student_index, _profile_changes_checked_at
+    now = time.monotonic()
+    if now - _profile_changes_checked_at < getattr(settings, "RECOMMENDER_SYNC_INTERVAL", 1):
+        return index
+    _profile_changes_checked_at = now
+    synced_at = time.time()
+    changes = list(
+        ProfileChange.objects.filter(id__gt=index.change_id)
+        .order_by("id")
+        .values_list("id", "profile_id")[: SYNC_BATCH + 1]
+    )
+    foreign = {
+        profile_id
+        for change_id, profile_id in changes
+        if change_id not in index.applied_changes
+    }
+    rebuild = synced_at - index.synced_at > _retention() or len(changes) > SYNC_BATCH
+    profiles = []
+    if foreign and not rebuild:
+        profiles = list(
+            Profile.objects.filter(id__in=foreign, role=Profile.ROLE_STUDENT).only(
+                *STUDENT_INDEX_FIELDS
+            )
+        )
+
+    with _student_lock:
+        if _student_index is not index:
+            return _student_index
+        if rebuild:
+            _student_index = None
+            return None
+        patched = index.with_profiles(profiles) if profiles else index
+        # Deleted profiles, and profiles that stopped being students.
+        for profile_id in foreign - {profile.id for profile in profiles}:
+            patched = patched.without_profile(profile_id)
+        if changes:
+            patched.change_id = changes[-1][0]
+            patched.applied_changes = frozenset(
+                change_id for change_id in index.applied_changes if change_id > patched.change_id
+            )
+        patched.synced_at = synced_at
+        _student_index = patched
+        return patched
+
+
+def get_student_index() -> StudentIndex:
+    global _student_index
+    vectorizer = get_job_index().vectorizer
+    index = _student_index
+    if index is not None and index.vectorizer is vectorizer:
+        index = _sync_students(index)
+    if index is None or index.vectorizer is not vectorizer:
+        with _student_lock:
+            if _student_index is None or _student_index.vectorizer is not vectorizer:
+                _student_index = _build_student_index(vectorizer)
+            index = _student_index
+    elif index.needs_compaction():
+        with _student_lock:
+            if _student_index is index:
+                _student_index = index.compacted()
+            index = _student_index
+    return index
+
+
+def _patch_students(patch, change_ids) -> None:
+    global _student_index
+    with _student_lock:
+        if _student_index is None:
+            return
+        index = patch(_student_index)
+        if change_ids:
+            index.applied_changes = index.applied_changes | frozenset(change_ids)
+        _student_index = index.compacted() if index.needs_compaction() else index
+
+
+def update_profile(profile) -> None:
+    """Add, replace or (for non-students) drop one profile's row in every process."""
+    change_ids = _record_profile_change(profile.id)
+    if profile.role == Profile.ROLE_STUDENT:
+        _patch_students(lambda index: index.with_profile(profile), change_ids)
+    else:
+        _patch_students(lambda index: index.without_profile(profile.id), change_ids)
+
+
+def remove_profile(profile_id: int) -> None:
+    """Drop one profile's row in every process."""
+    _patch_students(
+        lambda index: index.without_profile(profile_id), _record_profile_change(profile_id)
+    )
@@ -1,62 +1,122 @@
-from typing import List
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from decimal import Decimal
+from typing import List, NamedTuple
 
-from portal.utils import split_csv
+import numpy as np
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
 
+from portal.models import Job, JobBranch, Profile, ProfileBranch
+from portal.taxonomy import normalize_name, normalize_names
 
-def _build_student_text(profile) -> str:
-    fields = [
-        profile.skills,
-        profile.interests,
-        profile.projects,
-        profile.certifications,
-    ]
-    return " ".join([field for field in fields if field])
+from .columns import (
+    BRANCH_POINTS,
+    CGPA_BELOW_POINTS,
+    CGPA_MET_POINTS,
+    LOCATION_POINTS,
+    SKILL_POINTS,
+    JobColumns,
+    StudentColumns,
+)
+from .engines import dot, stack
+from .features import (
+    _build_job_text,
+    _build_student_text,
+    _job_features,
+    _student_features,
+)
+from .index import JOB_INDEX_FIELDS, STUDENT_INDEX_FIELDS, get_job_index, get_student_index
 
 
-def _build_job_text(job) -> str:
-    fields = [
-        job.description,
-        job.required_skills,
-        job.title,
-        job.company,
-    ]
-    return " ".join([field for field in fields if field])
+def _split_indexed(index, jobs: List):
+    """Positions and index rows of indexed ``jobs``, and positions of the rest.
 
+    Jobs the index has not seen yet (unsaved, or saved after the last build)
+    have to be vectorised on the fly with the fitted vocabulary.
+    """
+    positions, rows, missing = [], [], []
+    for position, job in enumerate(jobs):
+        row = index.rows.get(job.id)
+        if row is None:
+            missing.append(position)
+        else:
+            positions.append(position)
+            rows.append(row)
+    return positions, rows, missing
+
+
+def _job_similarities(index, student_text: str, jobs: List):
+    """Similarity of the student text to each job, read from the job index."""
+    vector = index.transform(student_text)
+    scores = np.zeros(len(jobs))
+    if vector is None:
+        return scores
+
+    positions, rows, missing = _split_indexed(index, jobs)
+    if rows:
+        scores[positions] = index.similarities(vector, rows)
+    if missing:
+        matrix = index.vectorizer.transform([_build_job_text(jobs[i]) for i in missing])
+        scores[missing] = dot(matrix, vector).ravel()
+    return scores
+
+
+def _job_matrix(index, jobs: List):
+    """Vector rows of ``jobs``, in order, for scoring many students at once."""
+    positions, rows, missing = _split_indexed(index, jobs)
+    parts = []
+    if rows:
+        parts.append(index.matrix[rows])
+    if missing:
+        parts.append(index.vectorizer.transform([_build_job_text(jobs[i]) for i in missing]))
+    matrix = stack(parts)
+    return matrix[np.argsort(positions + missing)]
+
+
+def _rule_points(student, job) -> float:
+    """Rule-based adjustment only, without building any reason strings.
+
+    ``JobColumns.rule_points`` is the vectorised form used for ranking.
+    """
+    score = float(SKILL_POINTS * len(student.skills & job.skills))
+    if student.cgpa is not None:
+        score += CGPA_BELOW_POINTS if student.cgpa < job.min_cgpa else CGPA_MET_POINTS
+    if student.branch in job.branches:
+        score += BRANCH_POINTS
+    if job.location in student.locations:
+        score += LOCATION_POINTS
+    return score
 
-def _rule_based_score(profile, job):
-    reasons = []
-    score = 0.0
 
-    student_skills = set(split_csv(profile.skills))
-    required_skills = set(split_csv(job.required_skills))
-    overlap = sorted(student_skills.intersection(required_skills))
+def _rule_reasons(student, job) -> List[str]:
+    reasons = []
+    overlap = sorted(student.skills & job.skills)
     if overlap:
-        score += 5 * len(overlap)
         reasons.append(f"Matching skills: {', '.join(s.title() for s in overlap)}")
-
-    if profile.cgpa is not None:
-        if profile.cgpa < job.min_cgpa:
-            score -= 50
+    if student.cgpa is not None:
+        if student.cgpa < job.min_cgpa:
             reasons.append("CGPA below minimum requirement")
         else:
-            score += 10
             reasons.append("CGPA meets requirement")
+    if student.branch in job.branches:
+        reasons.append("Eligible branch match")
+    if job.location in student.locations:
+        reasons.append("Preferred location match")
+    return reasons
 
-    if profile.branch:
-        branches = set(split_csv(job.eligible_branches))
-        if profile.branch.strip().lower() in branches:
-            score += 8
-            reasons.append("Eligible branch match")
 
-    if profile.preferred_locations:
-        preferred = set(split_csv(profile.preferred_locations))
-        if job.location.strip().lower() in preferred:
-            score += 5
-            reasons.append("Preferred location match")
+def _rule_based_score(profile, job):
+    student = _student_features(profile)
+    features = _job_features(job)
+    return _rule_points(student, features), _rule_reasons(student, features)
+
 
-    return score, reasons
+def _final_reasons(reasons: List[str], student_text: str) -> List[str]:
+    if not reasons and student_text:
+        reasons.append("Profile text matched job description")
+    elif not student_text:
+        reasons.append("Complete your profile to get better matches")
+    return reasons
 
 
 def recommend_jobs(profile, jobs: List):
@@ -64,21 +124,13 @@ def recommend_jobs(profile, jobs: List):
         return []
 
     student_text = _build_student_text(profile)
-    job_texts = [_build_job_text(job) for job in jobs]
-
-    corpus = [student_text] + job_texts
-    if not any(corpus):
+    if not student_text and not any(_build_job_text(job) for job in jobs):
         return [
             {"job": job, "score": 0, "reasons": ["Insufficient data for recommendation."]}
             for job in jobs
         ]
 
-    vectorizer = TfidfVectorizer(stop_words="english")
-    try:
-        tfidf_matrix = vectorizer.fit_transform(corpus)
-        similarity_scores = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
-    except ValueError:
-        similarity_scores = [0 for _ in jobs]
+    similarity_scores = _job_similarities(get_job_index(), student_text, jobs)
 
     results = []
     for job, similarity in zip(jobs, similarity_scores):
@@ -87,18 +139,330 @@ def recommend_jobs(profile, jobs: List):
         final_score = base_score + rule_score
         final_score = max(0, min(100, final_score))
 
-        if not reasons and student_text:
-            reasons.append("Profile text matched job description")
-        elif not student_text:
-            reasons.append("Complete your profile to get better matches")
-
         results.append(
             {
                 "job": job,
                 "score": round(final_score, 1),
-                "reasons": reasons,
+                "reasons": _final_reasons(reasons, student_text),
             }
         )
 
     results.sort(key=lambda item: item["score"], reverse=True)
     return results
+
+
+def _top_rows(scores, job_ids, k: int):
+    """Indices of the ``k`` best scores, highest first, newest job on ties.
+
+    ``argpartition`` selects the winners in linear time; only they are
+    sorted. Rows tied with the k-th score are all kept until the final sort
+    so the tie-break matches a full sort.
+    """
+    if k < len(scores):
+        kth = np.argpartition(-scores, k - 1)[k - 1]
+        candidates = np.flatnonzero(scores >= scores[kth])
+    else:
+        candidates = np.arange(len(scores))
+    order = np.lexsort((-job_ids[candidates], -scores[candidates]))
+    return candidates[order][:k]
+
+
+def open_jobs():
+    """Jobs still taking applications, newest first."""
+    return Job.objects.filter(last_date__gte=timezone.localdate()).order_by("-created_at")
+
+
+def _stretch_margin(stretch) -> Decimal:
+    if stretch is None:
+        stretch = getattr(settings, "RECOMMENDER_INCLUDE_STRETCH", False)
+    if not stretch:
+        return Decimal(0)
+    return Decimal(str(getattr(settings, "RECOMMENDER_STRETCH_CGPA_MARGIN", 0.5)))
+
+
+def candidate_jobs(profile, stretch=None):
+    """Open jobs ``profile`` is eligible for: the retrieval stage before ranking.
+
+    Drops jobs past their ``last_date``, jobs whose minimum CGPA is above the
+    student's, and jobs whose branch list (``JobBranch``) leaves out the
+    student's branch; jobs listing no branches are open to all. A missing
+    CGPA or branch filters nothing, as ranking does not penalise either. With
+    ``stretch`` (default ``RECOMMENDER_INCLUDE_STRETCH``) jobs asking up to
+    ``RECOMMENDER_STRETCH_CGPA_MARGIN`` more CGPA are kept too, and ranking
+    still applies the CGPA penalty to them. Newest first, so ranking ties
+    keep the order ``recommend_jobs`` has always used.
+    """
+    jobs = open_jobs()
+    if profile.cgpa is not None:
+        jobs = jobs.filter(min_cgpa__lte=profile.cgpa + _stretch_margin(stretch))
+    names = normalize_name(profile.branch)
+    if names:
+        branches = JobBranch.objects.filter(job=OuterRef("pk"))
+        jobs = jobs.filter(~Exists(branches) | Exists(branches.filter(branch__name__in=names)))
+    return jobs
+
+
+def _unindexed_jobs(index, job_ids) -> List:
+    """Jobs among ``job_ids`` this process's index has not seen yet, oldest first."""
+    if job_ids is None:
+        return []
+    missing = [job_id for job_id in job_ids if job_id not in index.rows]
+    if not missing:
+        return []
+    return list(Job.objects.filter(id__in=missing).only(*JOB_INDEX_FIELDS).order_by("id"))
+
+
+def recommend_top_k(profile, k: int = 5, job_ids=None, index=None):
+    """Best ``k`` jobs for ``profile``, in the ``recommend_jobs`` format.
+
+    ``job_ids`` limits ranking to those jobs, e.g. the ids of
+    ``candidate_jobs(profile)``; by default every indexed job competes.
+    Candidates the index has not seen yet (saved since this process last
+    patched it) are loaded and vectorised on the fly, as ``recommend_jobs``
+    does. ``index`` defaults to the live job index. Every job is scored into
+    one array; reasons and ``Job`` instances are only built for the winners.
+    """
+    index = get_job_index() if index is None else index
+    if job_ids is None:
+        rows = np.fromiter(index.rows.values(), dtype=np.int64, count=len(index.rows))
+    else:
+        job_ids = list(job_ids)
+        rows = np.fromiter(
+            (row for row in map(index.rows.get, job_ids) if row is not None), dtype=np.int64
+        )
+    extra = _unindexed_jobs(index, job_ids)
+    if k <= 0 or not len(rows) + len(extra):
+        return []
+
+    student = _student_features(profile)
+    student_text = _build_student_text(profile)
+    extra_features = [_job_features(job) for job in extra]
+    ids = np.concatenate([index.job_ids[rows], [job.id for job in extra]]).astype(np.int64)
+
+    def features(i):
+        return index.columns.features(rows[i]) if i < len(rows) else extra_features[i - len(rows)]
+
+    if not student_text and index.vectorizer is None:
+        winners = _top_rows(np.zeros(len(ids)), ids, k)
+        scored = [(ids[i], 0, ["Insufficient data for recommendation."]) for i in winners]
+    else:
+        vector = index.transform(student_text)
+        similarities = np.zeros(len(ids))
+        similarities[: len(rows)] = index.similarities(vector, rows)
+        if extra and vector is not None:
+            matrix = index.vectorizer.transform([_build_job_text(job) for job in extra])
+            similarities[len(rows):] = dot(matrix, vector).ravel()
+        points = np.concatenate(
+            [
+                index.columns.rule_points(student)[rows],
+                [_rule_points(student, job) for job in extra_features],
+            ]
+        )
+        scores = np.round(np.clip(similarities * 70 + points, 0, 100), 1)
+        winners = _top_rows(scores, ids, k)
+        scored = [
+            (
+                ids[i],
+                float(scores[i]),
+                _final_reasons(_rule_reasons(student, features(i)), student_text),
+            )
+            for i in winners
+        ]
+
+    jobs = Job.objects.in_bulk([int(job_id) for job_id, _, _ in scored])
+    results = []
+    for job_id, score, reasons in scored:
+        job = jobs.get(int(job_id))
+        if job is not None:
+            results.append({"job": job, "score": score, "reasons": reasons})
+    return results
+
+
+def _batch_chunk_rows(job_count: int, memory_budget=None) -> int:
+    if memory_budget is None:
+        memory_budget = getattr(settings, "RECOMMENDER_BATCH_MEMORY_MB", 64) * 2**20
+    # Similarities, rule points, scores and one temporary: four float64 arrays.
+    return max(1, memory_budget // (4 * 8 * max(1, job_count)))
+
+
+class JobBatch(NamedTuple):
+    """The job side of ``recommend_jobs_batch``, prepared once for many calls."""
+
+    jobs: List
+    vectorizer: object
+    matrix: object
+    features: List
+    columns: JobColumns
+    any_text: bool
+
+
+def prepare_job_batch(jobs) -> JobBatch:
+    """Vectorise ``jobs`` and lay out their rule columns for ``recommend_jobs_batch``."""
+    jobs = list(jobs)
+    index = get_job_index()
+    features = [_job_features(job) for job in jobs]
+    return JobBatch(
+        jobs,
+        index.vectorizer,
+        None if index.vectorizer is None or not jobs else _job_matrix(index, jobs),
+        features,
+        JobColumns.from_features(features),
+        any(_build_job_text(job) for job in jobs),
+    )
+
+
+def recommend_jobs_batch(
+    profiles, jobs, k: int = 5, eligible_only: bool = False, stretch=None, memory_budget=None
+):
+    """Top ``k`` of ``jobs`` for each profile, one list per profile in order.
+
+    Each list matches ``recommend_jobs(profile, jobs)[:k]`` up to rounding.
+    With ``eligible_only`` a profile only ranks the jobs ``candidate_jobs``
+    would keep for it (pass open jobs, e.g. from ``open_jobs()``). ``jobs``
+    may also be a ``prepare_job_batch`` result, to reuse the job vectors and
+    columns across calls.
+
+    The vocabulary is not refitted. Profiles are scored in chunks, sized so
+    that the dense score arrays stay within ``memory_budget`` bytes (default
+    ``RECOMMENDER_BATCH_MEMORY_MB``). Each chunk takes one matrix product for
+    similarities and one ``JobColumns.rule_points_batch`` call for the rules.
+    Reasons are only built for the winners.
+    """
+    batch = jobs if isinstance(jobs, JobBatch) else prepare_job_batch(jobs)
+    profiles, jobs = list(profiles), batch.jobs
+    if k <= 0 or not jobs:
+        return [[] for _ in profiles]
+
+    vectorizer, job_matrix, columns = batch.vectorizer, batch.matrix, batch.columns
+    job_features, any_job_text = batch.features, batch.any_text
+    margin = _stretch_margin(stretch)
+    chunk_rows = _batch_chunk_rows(len(jobs), memory_budget)
+
+    results = []
+    for start in range(0, len(profiles), chunk_rows):
+        chunk = profiles[start:start + chunk_rows]
+        texts = [_build_student_text(profile) for profile in chunk]
+        features = [_student_features(profile) for profile in chunk]
+        students = StudentColumns.from_features(
+            features, columns.branches, columns.skills, columns.locations
+        )
+        if job_matrix is None:
+            similarities = np.zeros((len(chunk), len(jobs)))
+        else:
+            similarities = dot(vectorizer.transform(texts), job_matrix)
+        scores = np.round(
+            np.clip(similarities * 70 + columns.rule_points_batch(students), 0, 100), 1
+        )
+        eligible = columns.eligible_batch(students, margin) if eligible_only else None
+
+        for row, (text, student) in enumerate(zip(texts, features)):
+            positions = np.flatnonzero(eligible[row]) if eligible_only else np.arange(len(jobs))
+            if not text and not any_job_text:
+                results.append(
+                    [
+                        {
+                            "job": jobs[i],
+                            "score": 0,
+                            "reasons": ["Insufficient data for recommendation."],
+                        }
+                        for i in positions[:k]
+                    ]
+                )
+                continue
+            # Ties go to the earlier job, as in recommend_jobs' stable sort.
+            winners = positions[_top_rows(scores[row, positions], -positions, k)]
+            results.append(
+                [
+                    {
+                        "job": jobs[i],
+                        "score": float(scores[row, i]),
+                        "reasons": _final_reasons(_rule_reasons(student, job_features[i]), text),
+                    }
+                    for i in winners
+                ]
+            )
+    return results
+
+
+def eligible_profiles(job):
+    """Student profiles that pass the job's CGPA and branch requirements.
+
+    Used as the database-side pre-filter for ``recommend_students``. Students
+    without a CGPA or a branch are kept, as in ``candidate_jobs``; the branch
+    list is matched through ``ProfileBranch``.
+    """
+    profiles = Profile.objects.filter(
+        Q(cgpa__isnull=True) | Q(cgpa__gte=job.min_cgpa), role=Profile.ROLE_STUDENT
+    )
+    names = normalize_names(job.eligible_branches)
+    if names:
+        branches = ProfileBranch.objects.filter(profile=OuterRef("pk"))
+        profiles = profiles.filter(
+            ~Exists(branches) | Exists(branches.filter(branch__name__in=names))
+        )
+    return profiles
+
+
+def _unindexed_profiles(index, profile_ids) -> List:
+    """Students among ``profile_ids`` this process's student index has not seen yet."""
+    missing = [profile_id for profile_id in profile_ids if profile_id not in index.rows]
+    if not missing:
+        return []
+    return list(
+        Profile.objects.filter(id__in=missing, role=Profile.ROLE_STUDENT)
+        .only(*STUDENT_INDEX_FIELDS)
+        .order_by("id")
+    )
+
+
+def recommend_students(job, k: int = 10, profiles=None):
+    """Best ``k`` students for ``job``, scored like ``recommend_jobs`` scores jobs.
+
+    ``profiles`` narrows the candidates in the database before scoring and
+    defaults to ``eligible_profiles(job)``. Candidates the student index has
+    not seen yet are loaded and vectorised on the fly, as ``recommend_top_k``
+    does for jobs. Returns dicts with ``profile``, ``score`` and ``reasons``.
+    """
+    if profiles is None:
+        profiles = eligible_profiles(job)
+    index = get_student_index()
+    candidate_ids = list(profiles.values_list("id", flat=True))
+    rows = np.fromiter(
+        (row for row in map(index.rows.get, candidate_ids) if row is not None), dtype=np.int64
+    )
+    extra = _unindexed_profiles(index, candidate_ids)
+    if k <= 0 or not len(rows) + len(extra):
+        return []
+
+    features = _job_features(job)
+    ids = np.concatenate([index.profile_ids[rows], [p.id for p in extra]]).astype(np.int64)
+    vector = index.vectorizer.transform([_build_job_text(job)]) if index.vectorizer else None
+    similarities = np.zeros(len(ids))
+    similarities[: len(rows)] = index.similarities(vector, rows)
+    if extra and vector is not None:
+        matrix = index.vectorizer.transform([_build_student_text(p) for p in extra])
+        similarities[len(rows):] = dot(matrix, vector).ravel()
+    points = np.concatenate(
+        [
+            index.columns.rule_points(features, rows),
+            [_rule_points(_student_features(p), features) for p in extra],
+        ]
+    )
+    scores = np.round(np.clip(similarities * 70 + points, 0, 100), 1)
+    winners = _top_rows(scores, ids, k)
+
+    profiles_by_id = Profile.objects.select_related("user").in_bulk([int(ids[i]) for i in winners])
+    results = []
+    for i in winners:
+        profile = profiles_by_id.get(int(ids[i]))
+        if profile is None:
+            continue
+        reasons = _rule_reasons(_student_features(profile), features)
+        results.append(
+            {
+                "profile": profile,
+                "score": float(scores[i]),
+                "reasons": _final_reasons(reasons, _build_student_text(profile)),
+            }
+        )
+    return results
@@ -0,0 +1,112 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from ai import artifacts
+from ai import index as job_index
+from ai.index import get_job_index, invalidate_job_index, publish_job_index
+from ai.recommender import recommend_top_k
+from portal.tests.factories import make_job, make_recruiter, make_student
+
+
+def _is_mapped(array) -> bool:
+    """Whether ``array`` is, or is a view of, a memory-mapped file."""
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+class ArtifactTestCase(TestCase):
+    """Job index generations published to a temporary ``RECOMMENDER_ARTIFACT_DIR``."""
+
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings = self.settings(
+            RECOMMENDER_ARTIFACT_DIR=str(self.root), RECOMMENDER_ARTIFACT_POLL_INTERVAL=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.recruiter = make_recruiter()
+        make_job(self.recruiter, title="Python Developer", required_skills="Python, Django")
+        make_job(
+            self.recruiter, title="Data Analyst", required_skills="SQL, Excel", location="Pune"
+        )
+        self.profile = make_student(preferred_locations="Pune").profile
+
+    def _ranking(self, index):
+        return [
+            (result["job"].id, result["score"], result["reasons"])
+            for result in recommend_top_k(self.profile, 5, index=index)
+        ]
+
+
+@override_settings(RECOMMENDER_SYNC_INTERVAL=0)
+class PublishedGenerationTests(ArtifactTestCase):
+    def test_round_trips_through_the_memmap_loader(self):
+        built = publish_job_index()
+        generation = artifacts.current_generation(self.root)
+        self.assertEqual(built.generation, generation)
+
+        arguments = artifacts.read_generation(self.root, generation)
+        for array in (
+            arguments["job_ids"],
+            arguments["alive"],
+            arguments["matrix"].data,
+            arguments["columns"].min_cgpa,
+            arguments["columns"].skill_matrix.indices,
+        ):
+            self.assertTrue(_is_mapped(array))
+
+        # A freshly started worker: nothing loaded and nothing to rebuild.
+        job_index._index, job_index._rebuild = None, False
+        opened = get_job_index()
+        self.assertEqual(opened.generation, generation)
+        self.assertEqual(opened.rows, built.rows)
+        self.assertEqual(opened.change_id, built.change_id)
+        self.assertEqual(self._ranking(opened), self._ranking(built))
+
+    def test_current_switches_only_to_complete_generations(self):
+        first = publish_job_index().generation
+        make_job(self.recruiter, title="Go Developer", required_skills="Go")
+        second = publish_job_index().generation
+        self.assertNotEqual(first, second)
+        self.assertEqual(artifacts.current_generation(self.root), second)
+        self.assertEqual(sorted(path.name for path in self.root.glob(".*")), [])
+        # The superseded generation stays readable for processes still mapping it.
+        self.assertEqual(len(artifacts.read_generation(self.root, first)["job_ids"]), 2)
+
+    def test_failed_publish_keeps_the_current_generation(self):
+        current = publish_job_index().generation
+        broken = get_job_index()
+        broken.columns = None
+        with self.assertRaises(AttributeError):
+            artifacts.publish(self.root, broken)
+        self.assertEqual(artifacts.current_generation(self.root), current)
+        self.assertEqual([path.name for path in self.root.glob("gen-*")], [current])
+        self.assertEqual(sorted(path.name for path in self.root.glob(".*")), [])
+
+    def test_workers_swap_in_a_newer_generation(self):
+        before = get_job_index()
+        # Another process publishes a rebuilt index.
+        job = make_job(self.recruiter, title="Go Developer", required_skills="Go")
+        published = artifacts.publish(self.root, job_index._build_from_db())
+        index = get_job_index()
+        self.assertIsNot(index, before)
+        self.assertEqual(index.generation, published)
+        self.assertIn(job.id, index.rows)
+
+    def test_keeps_only_the_newest_generations(self):
+        count = artifacts.KEEP_GENERATIONS + 2
+        published = [publish_job_index().generation for _ in range(count)]
+        self.assertEqual(
+            sorted(path.name for path in self.root.glob("gen-*")),
+            published[-artifacts.KEEP_GENERATIONS:],
+        )
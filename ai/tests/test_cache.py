@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ai.cache import cache_stats, cached_recommendations, invalidate_profile_recommendations
+from ai.index import invalidate_job_index
+from ai.recommender import candidate_jobs, recommend_jobs
+from portal.models import JobChange
+from portal.tests.factories import make_job, make_recruiter, make_student
+
+
+@override_settings(RECOMMENDER_SYNC_INTERVAL=0)
+class CachedRecommendationsTests(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        cache.clear()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(cache.clear)
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter, title="Python Developer")
+        make_job(self.recruiter, title="Data Analyst", required_skills="SQL")
+        self.profile = make_student().profile
+        self.computed = 0
+
+    def _recommendations(self):
+        def compute():
+            self.computed += 1
+            return recommend_jobs(self.profile, list(candidate_jobs(self.profile)))
+
+        results = cached_recommendations(self.profile, "all", compute)
+        return [(result["job"].id, result["score"]) for result in results]
+
+    def test_repeated_request_is_a_hit(self):
+        first = self._recommendations()
+        self.assertEqual(self._recommendations(), first)
+        self.assertEqual(self.computed, 1)
+        self.assertEqual(cache_stats()["hits"], 1)
+        self.assertEqual(cache_stats()["misses"], 1)
+
+    def test_profile_edit_invalidates(self):
+        self._recommendations()
+        self.profile.skills = "SQL, Excel"
+        self._recommendations()
+        self.assertEqual(self.computed, 2)
+
+        invalidate_profile_recommendations(self.profile)
+        self._recommendations()
+        self.assertEqual(self.computed, 3)
+
+    def test_job_edit_invalidates(self):
+        self._recommendations()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.required_skills = "Go"
+            self.job.save()
+        self._recommendations()
+        self.assertEqual(self.computed, 2)
+
+    def test_job_edit_in_another_process_invalidates(self):
+        self._recommendations()
+        # Saved elsewhere: only the JobChange row reaches this process.
+        job = make_job(self.recruiter, title="Django Developer")
+        JobChange.objects.create(job_id=job.id)
+        self._recommendations()
+        self.assertEqual(self.computed, 2)
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from ai.columns import JobColumns, StudentColumns
+from ai.features import JobFeatures, StudentFeatures
+from ai.recommender import _rule_points
+
+MANY_BRANCHES = frozenset(f"b{number}" for number in range(70))
+
+JOBS = [
+    JobFeatures(
+        frozenset({"python", "django"}), frozenset({"cse", "it"}), "bengaluru", Decimal("7")
+    ),
+    # No branch list, no location and no minimum.
+    JobFeatures(frozenset(), frozenset(), "", Decimal("0")),
+    JobFeatures(frozenset({"java"}), frozenset({"ece"}), "pune", Decimal("8.25")),
+    JobFeatures(frozenset({"python"}), frozenset({"cse"}), "remote", Decimal("8.00")),
+    # Branch codes past the first 64-bit word.
+    JobFeatures(frozenset({"sql"}), MANY_BRANCHES, "chennai", Decimal("6.5")),
+]
+
+STUDENTS = [
+    # Nothing filled in: no CGPA, no branch, no skills or locations.
+    StudentFeatures(frozenset(), None, "", frozenset()),
+    # "go" and "mumbai" are unknown to every job.
+    StudentFeatures(frozenset({"python", "go"}), Decimal("8.00"), "cse", frozenset({"mumbai"})),
+    StudentFeatures(frozenset({"java"}), Decimal("7.99"), "mech", frozenset({"pune", "remote"})),
+    StudentFeatures(frozenset({"sql", "java"}), Decimal("8.25"), "ece", frozenset({"bengaluru"})),
+    StudentFeatures(frozenset({"python"}), None, "b69", frozenset({"chennai"})),
+]
+
+
+def _eligible(student, job, margin) -> bool:
+    """``candidate_jobs``'s filter for one student and job."""
+    cgpa_ok = student.cgpa is None or job.min_cgpa <= student.cgpa + margin
+    branch_ok = not job.branches or not student.branch or student.branch in job.branches
+    return cgpa_ok and branch_ok
+
+
+class RulePointsParityTests(SimpleTestCase):
+    def setUp(self):
+        self.jobs = JobColumns.from_features(JOBS)
+        self.students = StudentColumns.from_features(
+            STUDENTS, self.jobs.branches, self.jobs.skills, self.jobs.locations
+        )
+        self.expected = np.array(
+            [[_rule_points(student, job) for job in JOBS] for student in STUDENTS]
+        )
+
+    def test_batch_matches_scalar_rule_points(self):
+        np.testing.assert_array_equal(self.jobs.rule_points_batch(self.students), self.expected)
+
+    def test_per_student_and_per_job_match_scalar_rule_points(self):
+        for row, student in enumerate(STUDENTS):
+            with self.subTest(student=row):
+                np.testing.assert_array_equal(self.jobs.rule_points(student), self.expected[row])
+        students = StudentColumns.from_features(STUDENTS)
+        rows = np.arange(len(STUDENTS))
+        for column, job in enumerate(JOBS):
+            with self.subTest(job=column):
+                np.testing.assert_array_equal(
+                    students.rule_points(job, rows), self.expected[:, column]
+                )
+
+    def test_eligible_batch_matches_the_candidate_filter(self):
+        for margin in (Decimal("0"), Decimal("0.5")):
+            with self.subTest(margin=margin):
+                expected = [[_eligible(s, job, margin) for job in JOBS] for s in STUDENTS]
+                np.testing.assert_array_equal(
+                    self.jobs.eligible_batch(self.students, margin), expected
+                )
+
+    def test_appended_rows_keep_parity(self):
+        head, tail = JOBS[:2], JOBS[2:]
+        jobs = JobColumns.from_features(head).extend(tail)
+        students = StudentColumns.from_features(
+            STUDENTS, jobs.branches, jobs.skills, jobs.locations
+        )
+        np.testing.assert_array_equal(jobs.rule_points_batch(students), self.expected)
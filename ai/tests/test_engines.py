@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ai import artifacts
+from ai.engines import HashingTfidfVectorizer, LsaVectorizer, engine_of
+from ai.index import get_job_index, invalidate_job_index, publish_job_index
+from ai.recommender import recommend_top_k
+from portal.tests.factories import make_job, make_recruiter, make_student
+
+
+class EngineTestCase(TestCase):
+    """Jobs that only differ in their text, so similarity alone decides the order."""
+
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        recruiter = make_recruiter()
+        fields = {"required_skills": "Communication", "company": "Acme"}
+        self.matching = make_job(
+            recruiter,
+            title="Web Developer",
+            description="Build Python and Django web applications backed by SQL databases.",
+            **fields,
+        )
+        self.other = make_job(
+            recruiter,
+            title="Mobile Developer",
+            description="Ship Kotlin and Swift apps for Android and iOS phones.",
+            **fields,
+        )
+        self.profile = make_student(
+            skills="Python, Django, SQL", interests="web applications"
+        ).profile
+
+    def assertRanksMatchingJobFirst(self):
+        results = recommend_top_k(self.profile, 2)
+        self.assertEqual(
+            [result["job"].id for result in results], [self.matching.id, self.other.id]
+        )
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+
+@override_settings(RECOMMENDER_ENGINE="hashing", RECOMMENDER_HASHING_FEATURES=2**12)
+class HashingEngineTests(EngineTestCase):
+    def test_ranks_a_matching_job_above_a_non_matching_one(self):
+        index = get_job_index()
+        self.assertIsInstance(index.vectorizer, HashingTfidfVectorizer)
+        self.assertEqual(engine_of(index.vectorizer), "hashing")
+        self.assertEqual(index.matrix.shape[1], 2**12)
+        self.assertRanksMatchingJobFirst()
+
+
+class LsaEngineTests(EngineTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.model = self.root / "lsa.npz"
+        call_command(
+            "train_lsa_model", output=str(self.model), dimensions=2, sample=0, stdout=StringIO()
+        )
+        settings = self.settings(RECOMMENDER_ENGINE="lsa", RECOMMENDER_LSA_MODEL=str(self.model))
+        settings.enable()
+        self.addCleanup(settings.disable)
+        invalidate_job_index()
+
+    def test_ranks_a_matching_job_above_a_non_matching_one(self):
+        index = get_job_index()
+        self.assertIsInstance(index.vectorizer, LsaVectorizer)
+        self.assertIsInstance(index.matrix, np.ndarray)
+        self.assertEqual(index.matrix.dtype, np.float32)
+        self.assertEqual(index.matrix.shape, (2, 2))
+        self.assertRanksMatchingJobFirst()
+
+    def test_published_generation_maps_the_dense_matrix(self):
+        with self.settings(RECOMMENDER_ARTIFACT_DIR=str(self.root / "index")):
+            built = publish_job_index()
+            arguments = artifacts.read_generation(self.root / "index", built.generation)
+        self.assertIsInstance(arguments["matrix"], np.memmap)
+        self.assertEqual(engine_of(arguments["vectorizer"]), "lsa")
+        np.testing.assert_array_equal(arguments["matrix"], built.matrix)
+        self.assertRanksMatchingJobFirst()
@@ -0,0 +1,175 @@
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from ai import artifacts
+from ai import index as job_index
+from ai.index import get_job_index, get_student_index, invalidate_job_index, publish_job_index
+from ai.recommender import recommend_students
+from portal.models import Job, JobChange, Profile, ProfileChange
+from portal.tests.factories import make_job, make_recruiter, make_student
+
+
+@override_settings(RECOMMENDER_SYNC_INTERVAL=0)
+class JobIndexPatchTests(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter, title="Python Developer")
+
+    def test_saved_job_is_patched_in(self):
+        before = get_job_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(self.recruiter, title="Data Engineer", required_skills="Spark")
+        index = get_job_index()
+        self.assertIsNot(index, before)
+        self.assertIn(job.id, index.rows)
+        self.assertEqual(index.mutations, 1)
+        self.assertTrue(JobChange.objects.filter(job_id=job.id).exists())
+
+    def test_edited_job_replaces_its_row(self):
+        old_row = get_job_index().rows[self.job.id]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.required_skills = "Go, Kubernetes"
+            self.job.save()
+        index = get_job_index()
+        self.assertNotEqual(index.rows[self.job.id], old_row)
+        self.assertFalse(index.alive[old_row])
+        self.assertEqual(len(index), 1)
+
+    def test_deleted_job_is_tombstoned(self):
+        get_job_index()
+        job_id = self.job.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        self.assertNotIn(job_id, get_job_index().rows)
+
+    def test_applies_changes_recorded_by_other_processes(self):
+        get_job_index()
+        # Another worker's save: the row and its JobChange, without this
+        # process's on_commit patch.
+        job = make_job(self.recruiter, title="Data Engineer")
+        JobChange.objects.create(job_id=job.id)
+        self.assertIn(job.id, get_job_index().rows)
+
+        Job.objects.filter(pk=job.pk).delete()
+        JobChange.objects.create(job_id=job.id)
+        self.assertNotIn(job.id, get_job_index().rows)
+
+    def test_bulk_change_from_another_process_rebuilds(self):
+        index = get_job_index()
+        job = make_job(self.recruiter, title="Data Engineer")
+        JobChange.objects.create(job_id=None)
+        rebuilt = get_job_index()
+        self.assertIsNot(rebuilt, index)
+        self.assertIn(job.id, rebuilt.rows)
+        self.assertEqual(rebuilt.mutations, 0)
+
+    def test_own_changes_are_not_applied_twice(self):
+        get_job_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.recruiter, title="Data Engineer")
+        patched = get_job_index()
+        self.assertIs(get_job_index(), patched)
+        self.assertEqual(job_index._index.mutations, 1)
+
+    def test_own_changes_are_reapplied_after_swapping_in_an_older_generation(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        with self.settings(RECOMMENDER_ARTIFACT_DIR=root, RECOMMENDER_ARTIFACT_POLL_INTERVAL=0):
+            stale = publish_job_index()
+            with self.captureOnCommitCallbacks(execute=True):
+                self.job.required_skills = "Go, Kubernetes"
+                self.job.save()
+            # Another worker publishes a generation built before this save.
+            artifacts.publish(artifacts.artifact_root(), stale)
+            index = get_job_index()
+        self.assertNotEqual(index.generation, stale.generation)
+        features = index.columns.features(index.rows[self.job.id])
+        self.assertEqual(features.skills, {"go", "kubernetes"})
+
+
+@override_settings(RECOMMENDER_SYNC_INTERVAL=0, RECOMMENDER_COMPACT_AFTER=3)
+class StudentIndexCompactionTests(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(setattr, job_index, "_student_index", None)
+        job_index._student_index = None
+        self.job = make_job(make_recruiter(), title="Python Developer")
+        self.students = [
+            make_student("student1"),
+            make_student("student2", skills="Python, Flask"),
+            make_student("student3", skills="Java"),
+        ]
+
+    def _save_skills(self, student, skills):
+        with self.captureOnCommitCallbacks(execute=True):
+            student.profile.skills = skills
+            student.profile.save()
+
+    def test_patches_leave_tombstones_until_compaction(self):
+        get_student_index()
+        self._save_skills(self.students[0], "Python, Django, Docker")
+        self._save_skills(self.students[2], "Java, Python")
+        index = get_student_index()
+        self.assertEqual(index.mutations, 2)
+        self.assertEqual(len(index.profile_ids), 5)
+
+        self._save_skills(self.students[1], "Python")
+        index = get_student_index()
+        self.assertEqual(index.mutations, 0)
+        self.assertEqual(len(index.profile_ids), len(index), 3)
+        self.assertTrue(index.alive.all())
+        self.assertEqual(index.matrix.shape[0], len(index.columns))
+
+        compacted = recommend_students(self.job, 3)
+        job_index._student_index = None
+        rebuilt = recommend_students(self.job, 3)
+        self.assertEqual(
+            [(r["profile"].id, r["score"]) for r in compacted],
+            [(r["profile"].id, r["score"]) for r in rebuilt],
+        )
+
+    def test_old_patches_are_compacted_after_the_interval(self):
+        get_student_index()
+        self._save_skills(self.students[0], "Python, Go")
+        with self.settings(RECOMMENDER_COMPACT_INTERVAL=0):
+            index = get_student_index()
+        self.assertEqual(index.mutations, 0)
+        self.assertEqual(len(index.profile_ids), 3)
+
+
+@override_settings(RECOMMENDER_SYNC_INTERVAL=0)
+class StudentIndexSyncTests(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(setattr, job_index, "_student_index", None)
+        job_index._student_index = None
+        make_job(make_recruiter(), title="Python Developer")
+        self.profile = make_student().profile
+
+    def test_applies_changes_recorded_by_other_processes(self):
+        get_student_index()
+        # Another worker's saves: the rows and their ProfileChanges, without
+        # this process's on_commit patches.
+        fresh = make_student("student2", skills="Go").profile
+        Profile.objects.filter(pk=self.profile.pk).update(role=Profile.ROLE_RECRUITER)
+        ProfileChange.objects.create(profile_id=fresh.id)
+        ProfileChange.objects.create(profile_id=self.profile.id)
+        index = get_student_index()
+        self.assertIn(fresh.id, index.rows)
+        self.assertNotIn(self.profile.id, index.rows)
+
+    def test_own_changes_are_not_applied_twice(self):
+        get_student_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.skills = "Python, Go"
+            self.profile.save()
+        self.assertTrue(ProfileChange.objects.filter(profile_id=self.profile.id).exists())
+        index = get_student_index()
+        self.assertIs(get_student_index(), index)
+        self.assertEqual(index.mutations, 1)
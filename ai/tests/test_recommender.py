@@ -0,0 +1,160 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from ai import index as job_index
+from ai.index import get_job_index, get_student_index, invalidate_job_index
+from ai.recommender import (
+    candidate_jobs,
+    eligible_profiles,
+    open_jobs,
+    recommend_jobs,
+    recommend_jobs_batch,
+    recommend_students,
+    recommend_top_k,
+)
+from portal.tests.factories import make_job, make_recruiter, make_student
+
+
+def _ranking(results):
+    return [(result["job"].id, result["score"], result["reasons"]) for result in results]
+
+
+class RecommenderTestCase(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.recruiter = make_recruiter()
+        make_job(self.recruiter, title="Python Developer", required_skills="Python, Django")
+        make_job(self.recruiter, title="Data Analyst", required_skills="SQL, Excel")
+        make_job(
+            self.recruiter,
+            title="Java Engineer",
+            required_skills="Java, Spring",
+            location="Pune",
+            min_cgpa=Decimal("9.0"),
+        )
+        make_job(self.recruiter, title="Web Developer", eligible_branches="ECE")
+        self.profile = make_student(preferred_locations="Bengaluru").profile
+
+
+class RecommendTopKTests(RecommenderTestCase):
+    def test_matches_recommend_jobs(self):
+        candidates = list(candidate_jobs(self.profile))
+        expected = _ranking(recommend_jobs(self.profile, candidates))
+        for k in (1, 2, 10):
+            with self.subTest(k=k):
+                top = recommend_top_k(self.profile, k, [job.id for job in candidates])
+                self.assertEqual(_ranking(top), expected[:k])
+
+    def test_scores_candidates_missing_from_the_index(self):
+        get_job_index()
+        # Saved after the index was built; outside a transaction test the
+        # on_commit patch would add it, here the index stays stale.
+        fresh = make_job(self.recruiter, title="Django Developer", required_skills="Python")
+        self.assertNotIn(fresh.id, get_job_index().rows)
+
+        candidates = list(candidate_jobs(self.profile))
+        top = recommend_top_k(self.profile, 10, [job.id for job in candidates])
+        self.assertIn(fresh.id, [result["job"].id for result in top])
+        self.assertEqual(_ranking(top), _ranking(recommend_jobs(self.profile, candidates)))
+
+
+class CandidateJobsTests(RecommenderTestCase):
+    def _titles(self, profile):
+        return set(candidate_jobs(profile).values_list("title", flat=True))
+
+    def test_filters_by_branch_and_cgpa(self):
+        self.assertEqual(self._titles(self.profile), {"Python Developer", "Data Analyst"})
+
+    def test_missing_branch_or_cgpa_filters_nothing(self):
+        profile = make_student("student2", branch="", cgpa=None).profile
+        self.assertEqual(set(candidate_jobs(profile)), set(open_jobs()))
+
+
+class RecommendJobsBatchTests(RecommenderTestCase):
+    def setUp(self):
+        super().setUp()
+        self.profiles = [
+            self.profile,
+            make_student("student2", skills="SQL, Excel", cgpa=Decimal("9.5")).profile,
+            make_student("student3", branch="ECE", skills="", cgpa=None).profile,
+            make_student("student4", branch="", skills="Java").profile,
+        ]
+        self.jobs = list(open_jobs())
+
+    def assertSameRanking(self, batch, expected):
+        self.assertEqual(
+            [(result["job"].id, result["reasons"]) for result in batch],
+            [(result["job"].id, result["reasons"]) for result in expected],
+        )
+        for got, want in zip(batch, expected):
+            self.assertAlmostEqual(got["score"], want["score"], places=1)
+
+    def test_matches_recommend_jobs_per_profile(self):
+        for k in (2, 10):
+            batches = recommend_jobs_batch(self.profiles, self.jobs, k)
+            for profile, batch in zip(self.profiles, batches):
+                with self.subTest(k=k, profile=profile.user.username):
+                    self.assertSameRanking(batch, recommend_jobs(profile, self.jobs)[:k])
+
+    def test_eligible_only_ranks_candidate_jobs(self):
+        for stretch in (False, True):
+            batches = recommend_jobs_batch(
+                self.profiles, self.jobs, 10, eligible_only=True, stretch=stretch
+            )
+            for profile, batch in zip(self.profiles, batches):
+                with self.subTest(stretch=stretch, profile=profile.user.username):
+                    candidates = list(candidate_jobs(profile, stretch))
+                    self.assertSameRanking(batch, recommend_jobs(profile, candidates)[:10])
+
+
+class RecommendStudentsTests(TestCase):
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.job = make_job(make_recruiter(), eligible_branches="CSE, IT", min_cgpa=Decimal("7.0"))
+        self.students = {
+            "cse": make_student("cse").profile,
+            "it": make_student("it", branch=" it ").profile,
+            "no_cgpa": make_student("no_cgpa", cgpa=None).profile,
+            "low_cgpa": make_student("low_cgpa", cgpa=Decimal("6.5")).profile,
+            "ece": make_student("ece", branch="ECE").profile,
+        }
+
+    def _ids(self, *names):
+        return {self.students[name].id for name in names}
+
+    def test_eligible_profiles_keep_students_without_a_cgpa(self):
+        self.assertEqual(
+            set(eligible_profiles(self.job).values_list("id", flat=True)),
+            self._ids("cse", "it", "no_cgpa"),
+        )
+
+    def test_eligible_profiles_keep_students_without_a_branch(self):
+        profile = make_student("no_branch", branch="").profile
+        self.assertIn(profile.id, eligible_profiles(self.job).values_list("id", flat=True))
+
+    def test_eligible_profiles_match_branches_through_the_taxonomy(self):
+        profile = self.students["ece"]
+        profile.branch = "CSE"
+        profile.save()
+        self.assertIn(profile.id, eligible_profiles(self.job).values_list("id", flat=True))
+
+    def test_scores_profiles_missing_from_the_index(self):
+        get_student_index()
+        # As for jobs: without the on_commit patch the student index is stale.
+        fresh = make_student("fresh", skills="Python, Django").profile
+        self.assertNotIn(fresh.id, get_student_index().rows)
+
+        ranked = recommend_students(self.job, 10)
+        self.assertEqual(
+            {result["profile"].id for result in ranked},
+            self._ids("cse", "it", "no_cgpa") | {fresh.id},
+        )
+        job_index._student_index = None
+        rebuilt = recommend_students(self.job, 10)
+        self.assertEqual(
+            [(result["profile"].id, result["score"]) for result in ranked],
+            [(result["profile"].id, result["score"]) for result in rebuilt],
+        )
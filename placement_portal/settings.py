@@ -24,11 +24,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "portal.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "portal.middleware.ProfileMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -37,7 +39,7 @@ ROOT_URLCONF = "placement_portal.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "portal.metrics.InstrumentedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -74,6 +76,86 @@ DATABASES = {
 #     }
 # }
 
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Shared caches across worker processes (run `manage.py createcachetable` for the DB one):
+# CACHES = {
+#     "default": {
+#         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+#         "LOCATION": BASE_DIR / "cache",
+#     }
+# }
+# CACHES = {
+#     "default": {
+#         "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+#         "LOCATION": "portal_cache",
+#     }
+# }
+
+# Cached rankings are keyed on the job index version, which follows job changes in
+# every process, so a per-process cache stays correct; a shared one also shares hits.
+RECOMMENDER_CACHE_ALIAS = "default"
+RECOMMENDER_CACHE_TIMEOUT = 15 * 60
+# Threads that run rankings for async views (ai.executor); default min(4, CPUs).
+RECOMMENDER_WORKERS = None
+# Recommendations only rank open jobs the student is eligible for; stretch jobs
+# (CGPA minimum up to the margin above theirs) can be included too, or per
+# request with ?stretch=1.
+RECOMMENDER_INCLUDE_STRETCH = False
+RECOMMENDER_STRETCH_CGPA_MARGIN = 0.5
+# Memory for the dense score arrays of one recommend_jobs_batch chunk.
+RECOMMENDER_BATCH_MEMORY_MB = 64
+# Precomputed dashboard recommendations are used until a job changes or they are
+# this old (seconds); then the dashboard ranks live.
+RECOMMENDER_SNAPSHOT_TTL = 24 * 3600
+# Directory for memory-mapped job index generations shared by worker processes
+# (see ai/artifacts.py), e.g. BASE_DIR / "var" / "job-index". None keeps a
+# private in-memory index per process.
+RECOMMENDER_ARTIFACT_DIR = None
+RECOMMENDER_ARTIFACT_POLL_INTERVAL = 5
+# Every process patches its job and student indexes with rows other processes
+# changed (JobChange and ProfileChange rows), checking at most this often; rows
+# older than the retention are pruned.
+RECOMMENDER_SYNC_INTERVAL = 1
+RECOMMENDER_JOB_CHANGE_RETENTION = 24 * 3600
+# "tfidf" fits a vocabulary on the job corpus; "hashing" needs no fitted state;
+# "lsa" ranks with dense vectors (see ai/engines.py). RECOMMENDER_HASHING_IDF is
+# written by fit_hashing_idf, RECOMMENDER_LSA_MODEL by train_lsa_model, e.g.
+# BASE_DIR / "var" / "lsa.npz".
+RECOMMENDER_ENGINE = "tfidf"
+RECOMMENDER_HASHING_FEATURES = 2**18
+RECOMMENDER_HASHING_IDF = None
+RECOMMENDER_LSA_DIMENSIONS = 192
+RECOMMENDER_LSA_MODEL = None
+
+
+# Per-view query budgets checked by portal.metrics.MetricsMiddleware. Over budget
+# logs a warning, or raises when PORTAL_QUERY_BUDGET_STRICT is on (use it in tests;
+# portal/tests/test_query_budgets.py runs every view in strict mode). A first-time
+# apply includes the recruiter stats updates; a cold dashboard builds the job index.
+PORTAL_QUERY_BUDGETS = {
+    "landing": 8,
+    "student_dashboard": 8,
+    "student_profile": 6,
+    "student_jobs": 6,
+    "student_job_detail": 6,
+    "apply_job": 10,
+    "recommendations": 6,
+    "roadmap": 5,
+    "resume_bullets": 5,
+    "recruiter_dashboard": 7,
+    "job_applicants": 7,
+    "job_candidates": 9,
+    "analytics": 8,
+}
+PORTAL_QUERY_BUDGET_STRICT = False
+PORTAL_METRICS_BUFFER_SIZE = 1000
+
+AUTHENTICATION_BACKENDS = ["portal.backends.ProfileModelBackend"]
 
 AUTH_PASSWORD_VALIDATORS = [
     {
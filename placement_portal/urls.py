@@ -13,6 +13,7 @@ urlpatterns = [
     path("accounts/", include("accounts.urls")),
     path("student/", include("portal.urls.student_urls")),
     path("recruiter/", include("portal.urls.recruiter_urls")),
+    path("ops/", include("portal.urls.ops_urls")),
 ]
 
 if settings.DEBUG:
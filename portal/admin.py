@@ -1,6 +1,16 @@
 from django.contrib import admin
 
-from .models import Application, Job, Profile
+from .models import (
+    Application,
+    Branch,
+    Job,
+    Location,
+    Profile,
+    RecommendationSnapshot,
+    RecruiterStats,
+    Skill,
+    SkillDemand,
+)
 
 
 @admin.register(Profile)
@@ -20,3 +30,27 @@ class JobAdmin(admin.ModelAdmin):
 class ApplicationAdmin(admin.ModelAdmin):
     list_display = ("job", "student", "status", "created_at")
     list_filter = ("status",)
+
+
+@admin.register(Skill, Branch, Location)
+class TaxonomyAdmin(admin.ModelAdmin):
+    list_display = ("name",)
+    search_fields = ("name",)
+
+
+@admin.register(RecommendationSnapshot)
+class RecommendationSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("profile", "rank", "job", "score", "created_at")
+    list_select_related = ("profile__user", "job")
+
+
+@admin.register(RecruiterStats)
+class RecruiterStatsAdmin(admin.ModelAdmin):
+    list_display = ("recruiter", "total_jobs", "total_applications", "shortlisted", "hired")
+    list_select_related = ("recruiter",)
+
+
+@admin.register(SkillDemand)
+class SkillDemandAdmin(admin.ModelAdmin):
+    list_display = ("recruiter", "skill", "applicants")
+    list_select_related = ("recruiter", "skill")
@@ -0,0 +1,58 @@
+"""Writes to applications that need more care than a plain ``save()``.
+
+``QuerySet.update`` skips model signals, so the ``RecruiterStats`` deltas
+that ``portal.signals`` applies for single saves are applied here directly.
+"""
+from typing import Iterable, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+
+from . import stats
+from .models import Application
+
+
+def apply_to_job(job, student) -> Tuple[Application, bool]:
+    """Return ``(application, created)`` for ``student`` applying to ``job``.
+
+    The insert is tried first and the ``unique_application`` constraint
+    decides duplicates, so concurrent submissions cannot both succeed or
+    fail with an ``IntegrityError``; the loser gets the existing row.
+    """
+    try:
+        with transaction.atomic():
+            return Application.objects.create(job=job, student=student), True
+    except IntegrityError:
+        return Application.objects.get(job=job, student=student), False
+
+
+def bulk_update_status(
+    job,
+    status: str,
+    application_ids: Optional[Iterable[int]] = None,
+    min_cgpa=None,
+    current_status: str = "",
+) -> dict:
+    """Move the selected applications to ``job`` to ``status`` in one transaction.
+
+    Selection is the intersection of the given ids and filters. Rows are
+    updated with one ``UPDATE`` per previous status so the number moved out
+    of each bucket is exact; returns those counts and their total.
+    """
+    applications = Application.objects.filter(job=job)
+    if application_ids is not None:
+        applications = applications.filter(id__in=list(application_ids))
+    if min_cgpa is not None:
+        applications = applications.filter(student__profile__cgpa__gte=min_cgpa)
+    if current_status:
+        applications = applications.filter(status=current_status)
+
+    moved = {}
+    with transaction.atomic():
+        for previous, _ in Application.STATUS_CHOICES:
+            if previous == status or (current_status and previous != current_status):
+                continue
+            count = applications.filter(status=previous).update(status=status)
+            if count:
+                moved[previous] = count
+        stats.applications_moved(job.recruiter_id, moved, status)
+    return {"updated": sum(moved.values()), "from": moved}
@@ -6,4 +6,4 @@ class PortalConfig(AppConfig):
     name = "portal"
 
     def ready(self) -> None:
-        from . import signals  # noqa: F401
+        from . import metrics, signals  # noqa: F401
@@ -0,0 +1,179 @@
+"""Benchmarks for the recommender and the busiest views.
+
+Each dataset size is generated with ``portal.synthetic`` into a fresh test
+database. Every case runs once to warm up, ``repeat`` more times to time it,
+and once more under ``tracemalloc`` to record peak Python memory; timing
+runs are not traced, so tracing overhead does not skew them. View cases
+clear the cache before every run so they measure the uncached path.
+Queries are counted with ``portal.metrics.collect``, so those the async
+views run on ``ai.executor`` threads are included. The job index does not
+check for other processes' changes during the runs (in production that is
+at most one query a second), so counts do not depend on timing.
+
+Results are keyed ``"<size>/<case>"`` and can be compared against a stored
+baseline with a relative ``threshold``.
+"""
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from django.core.cache import caches
+from django.db.models import Count
+from django.test import Client, override_settings
+
+from ai.recommender import _rule_based_score, recommend_jobs, recommend_jobs_batch
+from .metrics import collect
+from .models import Job, Profile
+from .synthetic import generate
+from .utils import generate_skill_gap, top_skills_from_profiles
+
+SIZES = {
+    "small": {"students": 500, "jobs": 100, "applications": 2000},
+    "medium": {"students": 5000, "jobs": 1000, "applications": 50000},
+    "large": {"students": 50000, "jobs": 10000, "applications": 500000},
+}
+BATCH_PROFILES = 200
+SYNC_INTERVAL = 24 * 3600
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[], object]
+    reset: Optional[Callable[[], None]] = None
+
+
+def _clear_caches() -> None:
+    for cache in caches.all():
+        cache.clear()
+
+
+def _get(client: Client, url: str) -> Callable[[], object]:
+    def run():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} returned {response.status_code}")
+        return response
+
+    return run
+
+
+def build_cases() -> List[Case]:
+    """Cases over the current database, using its busiest student, recruiter and job."""
+    student = (
+        Profile.objects.filter(role=Profile.ROLE_STUDENT)
+        .exclude(skills="")
+        .annotate(applied=Count("user__applications"))
+        .order_by("-applied", "id")
+        .select_related("user")
+        .first()
+    )
+    job = (
+        Job.objects.annotate(applicants=Count("applications"))
+        .order_by("-applicants", "id")
+        .first()
+    )
+    recruiter = job.recruiter
+    jobs = list(Job.objects.order_by("-created_at"))
+    students = list(
+        Profile.objects.filter(role=Profile.ROLE_STUDENT).order_by("id")[:BATCH_PROFILES]
+    )
+    applicant_profiles = Profile.objects.filter(
+        user__applications__job__recruiter=recruiter
+    ).distinct()
+
+    student_client = Client()
+    student_client.force_login(student.user)
+    recruiter_client = Client()
+    recruiter_client.force_login(recruiter)
+
+    return [
+        Case("recommend_jobs", lambda: recommend_jobs(student, jobs)),
+        Case("recommend_jobs_batch", lambda: recommend_jobs_batch(students, jobs, 10)),
+        Case("rule_based_score", lambda: [_rule_based_score(student, j) for j in jobs]),
+        Case(
+            "top_skills_from_profiles",
+            lambda: top_skills_from_profiles(applicant_profiles.all()),
+        ),
+        Case("generate_skill_gap", lambda: [generate_skill_gap(student, j) for j in jobs]),
+        Case("view:student_dashboard", _get(student_client, "/student/dashboard/"), _clear_caches),
+        Case("view:student_jobs", _get(student_client, "/student/jobs/"), _clear_caches),
+        Case(
+            "view:job_applicants",
+            _get(recruiter_client, f"/recruiter/jobs/{job.id}/applicants/"),
+            _clear_caches,
+        ),
+        Case("view:analytics", _get(recruiter_client, "/recruiter/analytics/"), _clear_caches),
+    ]
+
+
+def measure(case: Case, repeat: int) -> Dict[str, float]:
+    if case.reset:
+        case.reset()
+    case.run()
+
+    timings = []
+    for _ in range(repeat):
+        if case.reset:
+            case.reset()
+        with collect() as metrics:
+            start = time.perf_counter()
+            case.run()
+            timings.append(time.perf_counter() - start)
+        queries = metrics.queries
+
+    if case.reset:
+        case.reset()
+    tracemalloc.start()
+    try:
+        case.run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(statistics.median(timings), 6),
+        "min_seconds": round(min(timings), 6),
+        "queries": queries,
+        "peak_kib": round(peak / 1024),
+    }
+
+
+def run_size(size: str, repeat: int, seed: int, log=None) -> Dict[str, dict]:
+    """Populate the (empty, test) database for ``size`` and benchmark every case."""
+    log = log or (lambda message: None)
+    start = time.perf_counter()
+    generate(**SIZES[size], seed=seed)
+    log(f"[{size}] dataset generated in {time.perf_counter() - start:.1f}s")
+
+    results = {}
+    with override_settings(RECOMMENDER_SYNC_INTERVAL=SYNC_INTERVAL):
+        for case in build_cases():
+            results[f"{size}/{case.name}"] = result = measure(case, repeat)
+            log(
+                f"[{size}] {case.name}: {result['seconds'] * 1000:.1f} ms, "
+                f"{result['queries']} queries, {result['peak_kib']} KiB peak"
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Describe every result that regressed against ``baseline``.
+
+    Time and peak memory regress when they grow by more than ``threshold``
+    (0.2 = 20%); query counts regress on any increase.
+    """
+    regressions = []
+    for key, result in sorted(results.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for metric in ("seconds", "peak_kib"):
+            if before[metric] and result[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{key}: {metric} {before[metric]} -> {result[metric]} "
+                    f"(+{result[metric] / before[metric] - 1:.0%})"
+                )
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{key}: queries {before['queries']} -> {result['queries']}")
+    return regressions
@@ -1,11 +1,2 @@
-from .models import Profile
-
-
 def user_role(request):
-    role = None
-    if request.user.is_authenticated:
-        try:
-            role = request.user.profile.role
-        except Profile.DoesNotExist:
-            role = None
-    return {"user_role": role}
+    return {"user_role": getattr(request, "user_role", None)}
@@ -1,25 +1,50 @@
 from functools import wraps
 
+from asgiref.sync import iscoroutinefunction
 from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
 from django.shortcuts import redirect
 from django.urls import reverse
 
-from .models import Profile
+
+def _deny(request, role: str):
+    if not request.user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if request.profile is None:
+        messages.error(request, "Complete your profile first.")
+        return redirect(reverse("landing"))
+    if request.user_role != role:
+        messages.error(request, "You do not have access to that page.")
+        return redirect(reverse("landing"))
+    return None
 
 
 def role_required(role: str):
+    """Allow only users whose profile has ``role``; relies on ``ProfileMiddleware``.
+
+    Works on async views too, without touching the ORM: the middleware has
+    already loaded the user and profile. Anonymous users are sent to the
+    login page, so async views need no ``login_required`` (which is
+    sync-only in Django 4.2).
+    """
+
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def _wrapped_async(request, *args, **kwargs):
+                denied = _deny(request, role)
+                if denied is not None:
+                    return denied
+                return await view_func(request, *args, **kwargs)
+
+            return _wrapped_async
+
         @wraps(view_func)
         def _wrapped(request, *args, **kwargs):
-            if not request.user.is_authenticated:
-                return redirect(reverse("login"))
-            try:
-                if request.user.profile.role != role:
-                    messages.error(request, "You do not have access to that page.")
-                    return redirect(reverse("landing"))
-            except Profile.DoesNotExist:
-                messages.error(request, "Complete your profile first.")
-                return redirect(reverse("landing"))
+            denied = _deny(request, role)
+            if denied is not None:
+                return denied
             return view_func(request, *args, **kwargs)
 
         return _wrapped
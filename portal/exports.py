@@ -0,0 +1,76 @@
+"""Streaming applicant exports.
+
+Rows are read with ``values_list(...).iterator()`` and written one at a time,
+so memory stays flat however many applicants a job has and the first bytes
+reach the client before the last row is read.
+"""
+import csv
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Application
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = (
+    ("username", "student__username"),
+    ("first_name", "student__first_name"),
+    ("last_name", "student__last_name"),
+    ("email", "student__email"),
+    ("branch", "student__profile__branch"),
+    ("year", "student__profile__year"),
+    ("cgpa", "student__profile__cgpa"),
+    ("skills", "student__profile__skills"),
+    ("status", "status"),
+    ("applied_at", "created_at"),
+)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+def applicant_rows(job):
+    return (
+        Application.objects.filter(job=job)
+        .order_by("-created_at", "-id")
+        .values_list(*[lookup for _, lookup in EXPORT_FIELDS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def _formatted(row):
+    # Timestamps as full-precision ISO 8601 in both formats.
+    return [
+        value.isoformat() if isinstance(value, datetime.datetime) else value for value in row
+    ]
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for row in rows:
+        yield writer.writerow(_formatted(row))
+
+
+def stream_jsonl(rows):
+    names = [name for name, _ in EXPORT_FIELDS]
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(names, _formatted(row)))) + "\n"
+
+
+def stream_applicants(job, export_format: str):
+    rows = applicant_rows(job)
+    if export_format == "jsonl":
+        return stream_jsonl(rows)
+    return stream_csv(rows)
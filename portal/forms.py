@@ -1,7 +1,11 @@
 from django import forms
 from django.utils import timezone
 
-from .models import Job, Profile
+from ai.cache import invalidate_profile_recommendations
+
+from .applications import bulk_update_status
+from .models import Application, Job, Profile
+from .utils import IMPORT_FORMATS, detect_format
 
 
 class ProfileForm(forms.ModelForm):
@@ -33,6 +37,12 @@ class ProfileForm(forms.ModelForm):
             raise forms.ValidationError("CGPA must be between 0 and 10.")
         return cgpa
 
+    def save(self, commit: bool = True) -> Profile:
+        profile = super().save(commit=commit)
+        if commit:
+            invalidate_profile_recommendations(profile)
+        return profile
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         for field in self.fields.values():
@@ -89,3 +99,86 @@ class JobForm(forms.ModelForm):
             field.widget.attrs.update(
                 {"class": "w-full border border-slate-200 rounded-md px-3 py-2"}
             )
+
+
+class IdListField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return []
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        try:
+            return [int(item) for item in value]
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Enter a list of application ids.")
+
+
+class BulkStatusForm(forms.Form):
+    """Select applications by id and/or filter, and the status to move them to."""
+
+    status = forms.ChoiceField(choices=Application.STATUS_CHOICES)
+    application_ids = IdListField(required=False)
+    min_cgpa = forms.DecimalField(
+        required=False, min_value=0, max_value=10, max_digits=4, decimal_places=2
+    )
+    current_status = forms.ChoiceField(
+        choices=[("", "Any status")] + Application.STATUS_CHOICES, required=False
+    )
+
+    def clean(self):
+        cleaned = super().clean()
+        if (
+            not cleaned.get("application_ids")
+            and cleaned.get("min_cgpa") is None
+            and not cleaned.get("current_status")
+        ):
+            raise forms.ValidationError("Select applicants or set a filter.")
+        return cleaned
+
+    def update(self, job) -> dict:
+        return bulk_update_status(
+            job,
+            self.cleaned_data["status"],
+            self.cleaned_data["application_ids"] or None,
+            self.cleaned_data["min_cgpa"],
+            self.cleaned_data["current_status"],
+        )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ("status", "min_cgpa", "current_status"):
+            self.fields[name].widget.attrs.update(
+                {"class": "border border-slate-200 rounded-md px-2 py-1"}
+            )
+        self.fields["min_cgpa"].widget.attrs.update({"step": "0.1", "placeholder": "Min CGPA"})
+
+
+class JobImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with a header row, a JSON array, or JSON Lines.")
+    file_format = forms.ChoiceField(
+        choices=[
+            ("", "Detect from file name"),
+            ("csv", "CSV"),
+            ("json", "JSON"),
+            ("jsonl", "JSON Lines"),
+        ],
+        required=False,
+    )
+
+    def clean(self):
+        cleaned = super().clean()
+        upload = cleaned.get("file")
+        if upload and not cleaned.get("file_format"):
+            cleaned["file_format"] = detect_format(upload.name)
+        if upload and cleaned["file_format"] not in IMPORT_FORMATS:
+            self.add_error("file_format", "Choose CSV, JSON or JSON Lines.")
+        return cleaned
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            field.widget.attrs.update(
+                {"class": "w-full border border-slate-200 rounded-md px-3 py-2"}
+            )
@@ -0,0 +1,122 @@
+"""Bulk job import from CSV, JSON or JSON Lines files.
+
+Rows are read lazily and validated with ``JobForm`` (which also runs
+``Job.clean``), then inserted with ``bulk_create`` in batches. Invalid rows
+are reported and skipped; valid rows are imported. Because ``bulk_create``
+sends no signals, the taxonomy links, recruiter counters and recommender
+index that ``portal.signals`` maintains for single saves are updated here,
+the index as a single patch per import rather than once per job.
+"""
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from django.db import transaction
+
+from ai.index import update_jobs
+
+from . import stats
+from .forms import JobForm
+from .models import Job
+from .taxonomy import sync_new_jobs_taxonomy
+
+IMPORT_BATCH_SIZE = 500
+
+
+class RowError(NamedTuple):
+    row: int
+    errors: Dict[str, List[str]]
+
+
+class JobImportReport(NamedTuple):
+    created: int
+    errors: List[RowError]
+
+
+def read_rows(stream, file_format: str) -> Iterator[Tuple[int, object]]:
+    """Yield ``(row_number, data)`` from a binary file; unparseable rows yield a ``ValueError``.
+
+    CSV and JSON Lines are streamed; a JSON file must hold a single array
+    and is parsed whole. A file that is not UTF-8 text or not valid CSV
+    yields one file-level error as row 0 and stops there.
+    """
+    if file_format not in ("csv", "jsonl", "json"):
+        raise ValueError(f"Unsupported import format: {file_format}")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from _parse_rows(text, file_format)
+    except UnicodeDecodeError:
+        yield 0, ValueError("The file is not UTF-8 text; save it as UTF-8 and try again.")
+    except csv.Error as error:
+        yield 0, ValueError(f"Invalid CSV: {error}")
+
+
+def _parse_rows(text, file_format: str) -> Iterator[Tuple[int, object]]:
+    if file_format == "csv":
+        yield from enumerate(csv.DictReader(text), start=1)
+    elif file_format == "jsonl":
+        number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield number, json.loads(line)
+            except ValueError as error:
+                yield number, ValueError(f"Invalid JSON: {error}")
+    else:
+        try:
+            data = json.load(text)
+        except UnicodeDecodeError:
+            raise
+        except ValueError as error:
+            yield 0, ValueError(f"Invalid JSON: {error}")
+            return
+        if not isinstance(data, list):
+            yield 0, ValueError("Expected a JSON array of jobs.")
+            return
+        yield from enumerate(data, start=1)
+
+
+def _save_batch(recruiter, batch: List[Job]) -> List[Job]:
+    with transaction.atomic():
+        created = Job.objects.bulk_create(batch)
+        sync_new_jobs_taxonomy(created)
+        stats.adjust_recruiter(recruiter.pk, total_jobs=len(created))
+    return created
+
+
+def import_jobs(
+    recruiter, rows: Iterable[Tuple[int, object]], batch_size: int = IMPORT_BATCH_SIZE
+) -> JobImportReport:
+    created = []
+    errors = []
+    batch = []
+    for number, data in rows:
+        if isinstance(data, ValueError):
+            errors.append(RowError(number, {"__all__": [str(data)]}))
+            continue
+        if not isinstance(data, dict):
+            errors.append(RowError(number, {"__all__": ["Expected an object of job fields."]}))
+            continue
+        form = JobForm(data=data)
+        if not form.is_valid():
+            messages = {
+                field: [error["message"] for error in field_errors]
+                for field, field_errors in form.errors.get_json_data().items()
+            }
+            errors.append(RowError(number, messages))
+            continue
+        job = form.save(commit=False)
+        job.recruiter = recruiter
+        batch.append(job)
+        if len(batch) >= batch_size:
+            created += _save_batch(recruiter, batch)
+            batch = []
+    if batch:
+        created += _save_batch(recruiter, batch)
+
+    if created:
+        transaction.on_commit(lambda: update_jobs(created))
+    return JobImportReport(len(created), errors)
@@ -0,0 +1,78 @@
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from portal.benchmarks import SIZES, compare, run_size
+
+
+class Command(BaseCommand):
+    help = "Benchmark the recommender and hot views on synthetic data in a test database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="small",
+            help=f"Comma-separated dataset sizes: {', '.join(SIZES)}.",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument("--baseline", help="Results file to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed relative slowdown or memory growth before failing (0.2 = 20%%).",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        sizes = [size.strip() for size in options["sizes"].split(",") if size.strip()]
+        unknown = set(sizes) - set(SIZES)
+        if unknown:
+            raise CommandError(f"Unknown sizes: {', '.join(sorted(unknown))}.")
+        baseline = None
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())["results"]
+
+        results = {}
+        # DEBUG off, as in production; query counting does not need it.
+        setup_test_environment(debug=False)
+        try:
+            for size in sizes:
+                old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+                try:
+                    results.update(
+                        run_size(size, options["repeat"], options["seed"], self.stdout.write)
+                    )
+                finally:
+                    connection.creation.destroy_test_db(old_name, verbosity=0)
+        finally:
+            teardown_test_environment()
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": options["repeat"],
+            "seed": options["seed"],
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2) + "\n")
+        self.stdout.write(f"Wrote {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options["threshold"])
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(line)
+                raise CommandError(f"{len(regressions)} benchmark regression(s).")
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
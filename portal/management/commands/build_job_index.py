@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.artifacts import artifact_root
+from ai.index import publish_job_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job index from the database and publish it for all workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes vectorising job shards in parallel (hashing engine only).",
+        )
+
+    def handle(self, *args, **options):
+        if artifact_root() is None:
+            raise CommandError("Set RECOMMENDER_ARTIFACT_DIR to publish the job index.")
+        index = publish_job_index(options["workers"])
+        if index.generation is None:
+            raise CommandError("Publishing the job index failed; see the log.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Published {index.generation} with {len(index)} jobs to {artifact_root()}."
+            )
+        )
@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.engines import HashingTfidfVectorizer, hashing_features, smoothed_idf
+from ai.features import _build_job_text
+from ai.index import JOB_INDEX_FIELDS
+from portal.models import Job
+
+
+class Command(BaseCommand):
+    help = "Compute document-frequency weights for the hashing recommender engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=getattr(settings, "RECOMMENDER_HASHING_IDF", None),
+            help="Where to save the weights (default: RECOMMENDER_HASHING_IDF).",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Jobs per chunk.")
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            raise CommandError("Pass --output or set RECOMMENDER_HASHING_IDF.")
+        vectorizer = HashingTfidfVectorizer(hashing_features())
+        frequencies = np.zeros(hashing_features(), dtype=np.int64)
+        chunk, documents = [], 0
+        jobs = Job.objects.only(*JOB_INDEX_FIELDS).order_by("id")
+        for job in jobs.iterator(chunk_size=options["chunk_size"]):
+            chunk.append(_build_job_text(job))
+            if len(chunk) == options["chunk_size"]:
+                frequencies += vectorizer.document_frequencies(chunk)
+                documents += len(chunk)
+                chunk = []
+        if chunk:
+            frequencies += vectorizer.document_frequencies(chunk)
+            documents += len(chunk)
+
+        output = Path(options["output"])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        staging = output.with_name(f".{output.name}.tmp")
+        with open(staging, "wb") as file:
+            np.save(file, smoothed_idf(frequencies, documents))
+        os.replace(staging, output)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved weights for {hashing_features()} features from {documents} jobs to "
+                f"{output}. Rebuild the job index to apply them."
+            )
+        )
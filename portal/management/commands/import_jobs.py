@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from portal.imports import IMPORT_BATCH_SIZE, import_jobs, read_rows
+from portal.models import Profile
+from portal.utils import IMPORT_FORMATS, detect_format
+
+
+class Command(BaseCommand):
+    help = "Import jobs for a recruiter from a CSV, JSON or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument("--recruiter", required=True, help="Username of the posting recruiter.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            recruiter = User.objects.get(
+                username=options["recruiter"], profile__role=Profile.ROLE_RECRUITER
+            )
+        except User.DoesNotExist:
+            raise CommandError(f"No recruiter named {options['recruiter']!r}.")
+        file_format = options["format"] or detect_format(options["path"])
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError("Cannot tell the file format; pass --format.")
+
+        with open(options["path"], "rb") as stream:
+            report = import_jobs(
+                recruiter, read_rows(stream, file_format), options["batch_size"]
+            )
+
+        for error in report.errors:
+            details = "; ".join(
+                f"{field}: {' '.join(messages)}" for field, messages in error.errors.items()
+            )
+            where = f"Row {error.row}" if error.row else "File"
+            self.stderr.write(f"{where}: {details}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {report.created} jobs, rejected {len(report.errors)} rows.")
+        )
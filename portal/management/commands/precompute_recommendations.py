@@ -0,0 +1,118 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from ai.cache import profile_fingerprint
+from ai.index import JOB_INDEX_FIELDS, latest_job_change
+from ai.recommender import open_jobs, prepare_job_batch, recommend_jobs_batch
+from portal.models import Profile, RecommendationSnapshot
+
+
+_jobs = None
+
+
+def _load_jobs() -> None:
+    """Prepare the open jobs once per process; every batch ranks against them."""
+    global _jobs
+    _jobs = prepare_job_batch(open_jobs().only(*JOB_INDEX_FIELDS))
+
+
+def _init_worker() -> None:
+    # Forked workers must not share the parent's database connections;
+    # spawned workers need Django configured first.
+    django.setup()
+    connections.close_all()
+    _load_jobs()
+
+
+def _rank_batch(profile_ids, top: int, stretch: bool):
+    profiles = list(Profile.objects.filter(id__in=profile_ids))
+    return [
+        (
+            profile.id,
+            profile_fingerprint(profile),
+            [(item["job"].id, item["score"], item["reasons"]) for item in results],
+        )
+        for profile, results in zip(
+            profiles,
+            recommend_jobs_batch(profiles, _jobs, top, eligible_only=True, stretch=stretch),
+        )
+    ]
+
+
+def _save_batch(rankings, job_version: int, stretch: bool) -> int:
+    snapshots = [
+        RecommendationSnapshot(
+            profile_id=profile_id,
+            job_id=job_id,
+            rank=rank,
+            score=score,
+            reasons=reasons,
+            fingerprint=fingerprint,
+            job_version=job_version,
+            stretch=stretch,
+        )
+        for profile_id, fingerprint, items in rankings
+        for rank, (job_id, score, reasons) in enumerate(items, start=1)
+    ]
+    with transaction.atomic():
+        RecommendationSnapshot.objects.filter(
+            profile_id__in=[profile_id for profile_id, _, _ in rankings]
+        ).delete()
+        RecommendationSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+    return len(snapshots)
+
+
+class Command(BaseCommand):
+    help = "Precompute and store each student's top recommendations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=10, help="Jobs stored per student.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Profiles per task.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes; 1 ranks in this process.",
+        )
+
+    def handle(self, *args, **options):
+        top = options["top"]
+        batch_size = options["batch_size"]
+        # Read before ranking: a job changed meanwhile makes these snapshots stale.
+        job_version = latest_job_change()
+        stretch = getattr(settings, "RECOMMENDER_INCLUDE_STRETCH", False)
+        profile_ids = list(
+            Profile.objects.filter(role=Profile.ROLE_STUDENT)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        batches = [
+            profile_ids[start:start + batch_size]
+            for start in range(0, len(profile_ids), batch_size)
+        ]
+
+        saved = 0
+        if options["workers"] <= 1:
+            _load_jobs()
+            for batch in batches:
+                saved += _save_batch(_rank_batch(batch, top, stretch), job_version, stretch)
+        else:
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=_init_worker
+            ) as executor:
+                for rankings in executor.map(
+                    _rank_batch, batches, [top] * len(batches), [stretch] * len(batches)
+                ):
+                    saved += _save_batch(rankings, job_version, stretch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {saved} recommendations for {len(profile_ids)} students."
+            )
+        )
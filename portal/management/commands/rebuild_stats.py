@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from portal.models import RecruiterStats, SkillDemand
+from portal.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute recruiter analytics counters from jobs, applications and profiles"
+
+    def handle(self, *args, **options):
+        rebuild_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt stats for {RecruiterStats.objects.count()} recruiters "
+                f"({SkillDemand.objects.count()} skill rows)."
+            )
+        )
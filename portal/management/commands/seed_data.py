@@ -5,12 +5,48 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from portal.models import Job, Profile
+from portal.synthetic import CHUNK_SIZE, SYNTHETIC_PASSWORD, generate
 
 
 class Command(BaseCommand):
     help = "Seed initial data for Smart College Placement Portal"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=0, help="Synthetic students to add.")
+        parser.add_argument("--jobs", type=int, default=0, help="Synthetic jobs to add.")
+        parser.add_argument(
+            "--applications", type=int, default=0, help="Synthetic applications to add."
+        )
+        parser.add_argument(
+            "--recruiters",
+            type=int,
+            default=0,
+            help="Synthetic recruiters to add (default: one per 50 jobs).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for reproducible data.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
     def handle(self, *args, **options):
+        self.seed_demo_data()
+        counts = {
+            key: options[key] for key in ("students", "jobs", "applications", "recruiters")
+        }
+        if any(counts.values()):
+            created = generate(
+                **counts,
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+                log=lambda message: self.stdout.write(message),
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Synthetic data created: "
+                    + ", ".join(f"{count} {kind}" for kind, count in created.items())
+                    + f". Synthetic users log in with password {SYNTHETIC_PASSWORD}."
+                )
+            )
+
+    def seed_demo_data(self) -> None:
         recruiter_user, _ = User.objects.get_or_create(
             username="recruiter1",
             defaults={"email": "recruiter@example.com", "first_name": "Riya", "last_name": "Recruiter"},
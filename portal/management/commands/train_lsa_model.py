@@ -0,0 +1,134 @@
+import random
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ai.engines import STOP_WORDS, LsaVectorizer, save_lsa_model
+from ai.features import _build_student_text
+from ai.index import JOB_INDEX_FIELDS, STUDENT_INDEX_FIELDS, JobIndex
+from ai.recommender import recommend_top_k
+from portal.models import Application, Job, Profile
+
+
+def _sample_students(size: int, seed: int):
+    """Up to ``size`` students with applications, and the job ids each applied to."""
+    applied = defaultdict(set)
+    for profile_id, job_id in Application.objects.filter(
+        student__profile__role=Profile.ROLE_STUDENT
+    ).values_list("student__profile__id", "job_id"):
+        applied[profile_id].add(job_id)
+    ids = sorted(applied)
+    ids = sorted(random.Random(seed).sample(ids, min(size, len(ids))))
+    profiles = Profile.objects.filter(id__in=ids).only(*STUDENT_INDEX_FIELDS).order_by("id")
+    return [(profile, applied[profile.id]) for profile in profiles]
+
+
+def _rank(index: JobIndex, profile, k: int):
+    vector = index.transform(_build_student_text(profile))
+    start = time.perf_counter()
+    index.similarities(vector)
+    elapsed = time.perf_counter() - start
+    return [result["job"].id for result in recommend_top_k(profile, k, index=index)], elapsed
+
+
+def _evaluate(indexes: dict, students, k: int) -> dict:
+    """Recall@k of applied jobs and similarity time per engine, plus top-k overlap."""
+    recall = {name: [] for name in indexes}
+    seconds = {name: [] for name in indexes}
+    overlap = []
+    for profile, applied in students:
+        top = {}
+        for name, index in indexes.items():
+            ranked, elapsed = _rank(index, profile, k)
+            top[name] = set(ranked)
+            recall[name].append(len(top[name] & applied) / min(k, len(applied)))
+            seconds[name].append(elapsed)
+        first, second = top.values()
+        overlap.append(len(first & second) / k)
+    return {
+        "recall": {name: statistics.mean(values) for name, values in recall.items()},
+        "ms": {name: statistics.median(values) * 1000 for name, values in seconds.items()},
+        "overlap": statistics.mean(overlap),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Train (or refresh) the LSA recommender engine on the job corpus and report its "
+        "ranking quality against the TF-IDF engine"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=getattr(settings, "RECOMMENDER_LSA_MODEL", None),
+            help="Where to save the model (default: RECOMMENDER_LSA_MODEL).",
+        )
+        parser.add_argument(
+            "--dimensions",
+            type=int,
+            default=getattr(settings, "RECOMMENDER_LSA_DIMENSIONS", 192),
+            help="TruncatedSVD components (default: RECOMMENDER_LSA_DIMENSIONS).",
+        )
+        parser.add_argument(
+            "--sample", type=int, default=500, help="Students compared between the engines."
+        )
+        parser.add_argument("--k", type=int, default=10, help="Recommendations compared.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            raise CommandError("Pass --output or set RECOMMENDER_LSA_MODEL.")
+        if options["k"] <= 0:
+            raise CommandError("--k must be positive.")
+        jobs = list(Job.objects.only(*JOB_INDEX_FIELDS).order_by("id"))
+        tfidf = JobIndex.build(jobs, vectorizer=TfidfVectorizer(stop_words=STOP_WORDS))
+        if tfidf.vectorizer is None:
+            raise CommandError("The jobs have no text to train on.")
+        terms = tfidf.matrix.shape[1]
+        dimensions = min(options["dimensions"], terms - 1)
+        if dimensions < 1:
+            raise CommandError(f"{terms} terms are too few for an LSA model.")
+
+        start = time.perf_counter()
+        svd = TruncatedSVD(n_components=dimensions, random_state=options["seed"])
+        svd.fit(tfidf.matrix)
+        model = LsaVectorizer(tfidf.vectorizer, svd.components_.astype(np.float32))
+        lsa = JobIndex.build(jobs, vectorizer=model)
+        self.stdout.write(
+            f"Fitted {dimensions} dimensions over {terms} terms and {len(jobs)} jobs in "
+            f"{time.perf_counter() - start:.1f}s "
+            f"({svd.explained_variance_ratio_.sum():.0%} of the variance)."
+        )
+
+        students = _sample_students(options["sample"], options["seed"])
+        if students:
+            k = options["k"]
+            report = _evaluate({"tfidf": tfidf, "lsa": lsa}, students, k)
+            for name in ("tfidf", "lsa"):
+                self.stdout.write(
+                    f"{name:>6}: recall@{k} of applied jobs {report['recall'][name]:.3f}, "
+                    f"similarities {report['ms'][name]:.3f} ms per student"
+                )
+            self.stdout.write(
+                f"Over {len(students)} students, lsa recall@{k} differs by "
+                f"{report['recall']['lsa'] - report['recall']['tfidf']:+.3f} and "
+                f"{report['overlap']:.0%} of its top {k} is shared with tfidf."
+            )
+        else:
+            self.stdout.write("No students with applications to compare the engines on.")
+
+        output = Path(options["output"])
+        save_lsa_model(model, output)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved the model to {output}. Rebuild the job index to apply it."
+            )
+        )
@@ -0,0 +1,199 @@
+"""Per-request query count, DB time, template time and latency, by URL name.
+
+``MetricsMiddleware`` records one sample per request into an in-process ring
+buffer per URL name (``PORTAL_METRICS_BUFFER_SIZE`` samples each); staff can
+read percentiles at ``/ops/metrics/``. Template time is measured by the
+``InstrumentedDjangoTemplates`` backend configured in ``TEMPLATES``. Queries
+are counted by an execute wrapper installed on every new DB connection, so
+those an async view runs through ``sync_to_async`` or ``ai.executor`` are
+attributed to its request as well.
+
+``PORTAL_QUERY_BUDGETS`` maps URL names to a maximum query count. Going over
+logs a warning, or raises ``QueryBudgetExceeded`` when
+``PORTAL_QUERY_BUDGET_STRICT`` is on (enable it in test settings so a
+regression fails the test that hit the view).
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+METRICS = ("total_ms", "db_ms", "template_ms", "queries")
+
+_current = contextvars.ContextVar("portal_request_metrics", default=None)
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=getattr(settings, "PORTAL_METRICS_BUFFER_SIZE", 1000)))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class RequestMetrics:
+    """Counters for one request; queries are also added to an enclosing ``collect()``."""
+
+    __slots__ = ("queries", "db_time", "template_time", "parent")
+
+    def __init__(self, parent: "Optional[RequestMetrics]" = None):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.parent = parent
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics = self
+            while metrics is not None:
+                metrics.db_time += elapsed
+                metrics.queries += 1
+                metrics = metrics.parent
+
+
+@contextmanager
+def collect() -> Iterator[RequestMetrics]:
+    """Count the queries run inside the block, including those of requests it makes.
+
+    Like a request's own count, this covers every thread that inherits the
+    context (``sync_to_async``, ``ai.executor``), which ``CaptureQueriesContext``
+    on one connection would miss.
+    """
+    metrics = RequestMetrics(_current.get())
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def _instrument(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_instrumentation(sender, connection, **kwargs):
+    if _instrument not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_instrument)
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """``DjangoTemplates`` whose top-level renders are timed per request."""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return InstrumentedTemplate(template.template, self)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with collect() as metrics:
+            response = self.get_response(request)
+        self.finish(request, metrics, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with collect() as metrics:
+            response = await self.get_response(request)
+        self.finish(request, metrics, time.perf_counter() - start)
+        return response
+
+    def finish(self, request, metrics: RequestMetrics, total: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        name = match.url_name if match and match.url_name else "unresolved"
+        record(name, metrics, total)
+        check_budget(name, metrics.queries)
+
+
+def record(name: str, metrics: RequestMetrics, total: float) -> None:
+    sample = (
+        total * 1000,
+        metrics.db_time * 1000,
+        metrics.template_time * 1000,
+        metrics.queries,
+    )
+    with _lock:
+        _samples[name].append(sample)
+
+
+def check_budget(name: str, queries: int) -> None:
+    budget = getattr(settings, "PORTAL_QUERY_BUDGETS", {}).get(name)
+    if budget is None or queries <= budget:
+        return
+    message = f"{name} ran {queries} queries (budget {budget})"
+    if getattr(settings, "PORTAL_QUERY_BUDGET_STRICT", False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def _percentile(ordered, percent: int):
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summary() -> dict:
+    """Percentiles of every metric per URL name over the buffered samples."""
+    with _lock:
+        snapshot = {name: list(samples) for name, samples in _samples.items()}
+
+    report = {}
+    for name, samples in sorted(snapshot.items()):
+        if not samples:
+            continue
+        entry = {"count": len(samples)}
+        for position, metric in enumerate(METRICS):
+            ordered = sorted(sample[position] for sample in samples)
+            entry[metric] = {
+                f"p{percent}": round(_percentile(ordered, percent), 2) for percent in PERCENTILES
+            }
+        report[name] = entry
+    return report
+
+
+def reset() -> None:
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,43 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .models import Profile
+
+
+class ProfileMiddleware:
+    """Resolve the logged-in user's profile and role once per request.
+
+    ``ProfileModelBackend`` fetches the user and profile in one query; the
+    result is attached as ``request.profile`` and ``request.user_role`` for
+    ``role_required``, the ``user_role`` context processor and the views.
+
+    Under ASGI the lookup runs in one ``sync_to_async`` hop, so async views
+    get ``request.user`` and ``request.profile`` already loaded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.resolve(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        await sync_to_async(self.resolve)(request)
+        return await self.get_response(request)
+
+    def resolve(self, request) -> None:
+        request.profile = None
+        request.user_role = None
+        if request.user.is_authenticated:
+            try:
+                request.profile = request.user.profile
+            except Profile.DoesNotExist:
+                return
+            request.user_role = request.profile.role
@@ -0,0 +1,125 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Branch",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "verbose_name_plural": "branches",
+            },
+        ),
+        migrations.CreateModel(
+            name="Location",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="Skill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProfileSkill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("profile", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.profile")),
+                ("skill", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.skill")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProfileLocation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("location", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.location")),
+                ("profile", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.profile")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobSkill",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("job", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.job")),
+                ("skill", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.skill")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobBranch",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("branch", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.branch")),
+                ("job", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.job")),
+            ],
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="eligible_branch_tags",
+            field=models.ManyToManyField(blank=True, related_name="jobs", through="portal.JobBranch", to="portal.branch"),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="location_tag",
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="jobs", to="portal.location"),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="required_skill_tags",
+            field=models.ManyToManyField(blank=True, related_name="jobs", through="portal.JobSkill", to="portal.skill"),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="preferred_location_tags",
+            field=models.ManyToManyField(blank=True, related_name="profiles", through="portal.ProfileLocation", to="portal.location"),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="skill_tags",
+            field=models.ManyToManyField(blank=True, related_name="profiles", through="portal.ProfileSkill", to="portal.skill"),
+        ),
+        migrations.AddIndex(
+            model_name="profileskill",
+            index=models.Index(fields=["skill", "profile"], name="portal_prof_skill_i_df60d1_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="profileskill",
+            constraint=models.UniqueConstraint(fields=("profile", "skill"), name="unique_profile_skill"),
+        ),
+        migrations.AddIndex(
+            model_name="profilelocation",
+            index=models.Index(fields=["location", "profile"], name="portal_prof_locatio_db24d6_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="profilelocation",
+            constraint=models.UniqueConstraint(fields=("profile", "location"), name="unique_profile_location"),
+        ),
+        migrations.AddIndex(
+            model_name="jobskill",
+            index=models.Index(fields=["skill", "job"], name="portal_jobs_skill_i_474ea6_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="jobskill",
+            constraint=models.UniqueConstraint(fields=("job", "skill"), name="unique_job_skill"),
+        ),
+        migrations.AddIndex(
+            model_name="jobbranch",
+            index=models.Index(fields=["branch", "job"], name="portal_jobb_branch__00f5ac_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="jobbranch",
+            constraint=models.UniqueConstraint(fields=("job", "branch"), name="unique_job_branch"),
+        ),
+    ]
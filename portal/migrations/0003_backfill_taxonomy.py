@@ -0,0 +1,100 @@
+from django.db import migrations
+
+NAME_MAX_LENGTH = 100
+
+
+def _names(text):
+    if not text:
+        return set()
+    return {item.strip().lower()[:NAME_MAX_LENGTH] for item in text.split(",") if item.strip()}
+
+
+def _location(text):
+    name = (text or "").strip().lower()[:NAME_MAX_LENGTH]
+    return {name} if name else set()
+
+
+def _ids(model, names):
+    model.objects.bulk_create(
+        [model(name=name) for name in names], batch_size=1000, ignore_conflicts=True
+    )
+    return dict(model.objects.values_list("name", "id"))
+
+
+def backfill(apps, schema_editor):
+    Profile = apps.get_model("portal", "Profile")
+    Job = apps.get_model("portal", "Job")
+    Skill = apps.get_model("portal", "Skill")
+    Branch = apps.get_model("portal", "Branch")
+    Location = apps.get_model("portal", "Location")
+    ProfileSkill = apps.get_model("portal", "ProfileSkill")
+    ProfileLocation = apps.get_model("portal", "ProfileLocation")
+    JobSkill = apps.get_model("portal", "JobSkill")
+    JobBranch = apps.get_model("portal", "JobBranch")
+
+    profiles = list(Profile.objects.values_list("id", "skills", "preferred_locations"))
+    jobs = list(Job.objects.values_list("id", "required_skills", "eligible_branches", "location"))
+
+    skill_ids = _ids(
+        Skill,
+        set().union(*[_names(p[1]) for p in profiles], *[_names(j[1]) for j in jobs]),
+    )
+    branch_ids = _ids(Branch, set().union(*[_names(j[2]) for j in jobs]))
+    location_ids = _ids(
+        Location,
+        set().union(*[_names(p[2]) for p in profiles], *[_location(j[3]) for j in jobs]),
+    )
+
+    ProfileSkill.objects.bulk_create(
+        [
+            ProfileSkill(profile_id=pk, skill_id=skill_ids[name])
+            for pk, skills, _ in profiles
+            for name in _names(skills)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    ProfileLocation.objects.bulk_create(
+        [
+            ProfileLocation(profile_id=pk, location_id=location_ids[name])
+            for pk, _, locations in profiles
+            for name in _names(locations)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    JobSkill.objects.bulk_create(
+        [
+            JobSkill(job_id=pk, skill_id=skill_ids[name])
+            for pk, skills, _, _ in jobs
+            for name in _names(skills)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    JobBranch.objects.bulk_create(
+        [
+            JobBranch(job_id=pk, branch_id=branch_ids[name])
+            for pk, _, branches, _ in jobs
+            for name in _names(branches)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    jobs_by_location = {}
+    for pk, _, _, location in jobs:
+        for name in _location(location):
+            jobs_by_location.setdefault(name, []).append(pk)
+    for name, pks in jobs_by_location.items():
+        Job.objects.filter(pk__in=pks).update(location_tag_id=location_ids[name])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0002_taxonomy"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations
+
+# A frozen copy of the schema portal.search installs; the post_migrate receiver
+# in portal.signals reinstalls the current one (and any PORTAL_SEARCH_BACKEND).
+FTS_TABLE = "portal_job_fts"
+FTS_COLUMNS = "title, description, required_skills"
+FTS_NEW = "new.title, new.description, new.required_skills"
+FTS_OLD = "old.title, old.description, old.required_skills"
+FTS_TRIGGERS = {
+    "portal_job_fts_ai": (
+        f"AFTER INSERT ON portal_job BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); END"
+    ),
+    "portal_job_fts_ad": (
+        f"AFTER DELETE ON portal_job BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS}) "
+        f"VALUES ('delete', old.id, {FTS_OLD}); END"
+    ),
+    "portal_job_fts_au": (
+        f"AFTER UPDATE ON portal_job BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {FTS_COLUMNS}) "
+        f"VALUES ('delete', old.id, {FTS_OLD}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); END"
+    ),
+}
+PG_INDEX = "portal_job_search_idx"
+PG_DOCUMENT = "to_tsvector('english', title || ' ' || description || ' ' || required_skills)"
+
+
+def install(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{FTS_COLUMNS}, content='portal_job', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        for name, body in FTS_TRIGGERS.items():
+            schema_editor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON portal_job USING GIN ({PG_DOCUMENT})"
+        )
+
+
+def uninstall(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for name in FTS_TRIGGERS:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {PG_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0004_job_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
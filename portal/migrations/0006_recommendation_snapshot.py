@@ -0,0 +1,29 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0005_job_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecommendationSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                ("reasons", models.JSONField(default=list)),
+                ("fingerprint", models.CharField(max_length=40)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("job", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="portal.job")),
+                ("profile", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="recommendation_snapshots", to="portal.profile")),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="recommendationsnapshot",
+            constraint=models.UniqueConstraint(fields=("profile", "rank"), name="unique_snapshot_rank"),
+        ),
+    ]
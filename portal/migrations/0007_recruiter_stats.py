@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+STATUS_FIELDS = {
+    "Applied": "applied",
+    "Shortlisted": "shortlisted",
+    "Rejected": "rejected",
+    "Hired": "hired",
+}
+
+
+def backfill(apps, schema_editor):
+    Job = apps.get_model("portal", "Job")
+    Application = apps.get_model("portal", "Application")
+    ProfileSkill = apps.get_model("portal", "ProfileSkill")
+    RecruiterStats = apps.get_model("portal", "RecruiterStats")
+    SkillDemand = apps.get_model("portal", "SkillDemand")
+
+    stats = {}
+    for recruiter_id, total in Job.objects.values_list("recruiter_id").annotate(Count("id")):
+        row = stats.setdefault(recruiter_id, RecruiterStats(recruiter_id=recruiter_id))
+        row.total_jobs = total
+    for recruiter_id, status, total in (
+        Application.objects.values_list("job__recruiter_id", "status").annotate(Count("id"))
+    ):
+        row = stats.setdefault(recruiter_id, RecruiterStats(recruiter_id=recruiter_id))
+        row.total_applications += total
+        if status in STATUS_FIELDS:
+            setattr(row, STATUS_FIELDS[status], getattr(row, STATUS_FIELDS[status]) + total)
+    RecruiterStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+    SkillDemand.objects.bulk_create(
+        [
+            SkillDemand(recruiter_id=recruiter_id, skill_id=skill_id, applicants=total)
+            for recruiter_id, skill_id, total in (
+                ProfileSkill.objects.filter(profile__user__applications__isnull=False)
+                .values_list("profile__user__applications__job__recruiter_id", "skill_id")
+                .annotate(Count("profile_id", distinct=True))
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("portal", "0006_recommendation_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecruiterStats",
+            fields=[
+                ("recruiter", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="recruiter_stats", serialize=False, to=settings.AUTH_USER_MODEL)),
+                ("total_jobs", models.PositiveIntegerField(default=0)),
+                ("total_applications", models.PositiveIntegerField(default=0)),
+                ("applied", models.PositiveIntegerField(default=0)),
+                ("shortlisted", models.PositiveIntegerField(default=0)),
+                ("rejected", models.PositiveIntegerField(default=0)),
+                ("hired", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "recruiter stats",
+            },
+        ),
+        migrations.CreateModel(
+            name="SkillDemand",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("applicants", models.PositiveIntegerField(default=0)),
+                ("recruiter", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="skill_demand", to=settings.AUTH_USER_MODEL)),
+                ("skill", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="portal.skill")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["recruiter", "-applicants"], name="skill_demand_top_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="skilldemand",
+            constraint=models.UniqueConstraint(fields=("recruiter", "skill"), name="unique_skill_demand"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
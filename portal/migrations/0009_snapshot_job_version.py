@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0008_jobchange"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recommendationsnapshot",
+            name="job_version",
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0009_snapshot_job_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recommendationsnapshot",
+            name="stretch",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+NAME_MAX_LENGTH = 100
+
+
+def backfill(apps, schema_editor):
+    Profile = apps.get_model("portal", "Profile")
+    Branch = apps.get_model("portal", "Branch")
+    ProfileBranch = apps.get_model("portal", "ProfileBranch")
+
+    branches = {
+        pk: branch.strip().lower()[:NAME_MAX_LENGTH]
+        for pk, branch in Profile.objects.exclude(branch="").values_list("id", "branch")
+    }
+    names = {name for name in branches.values() if name}
+    Branch.objects.bulk_create(
+        [Branch(name=name) for name in names], batch_size=1000, ignore_conflicts=True
+    )
+    branch_ids = dict(Branch.objects.filter(name__in=names).values_list("name", "id"))
+    ProfileBranch.objects.bulk_create(
+        [
+            ProfileBranch(profile_id=pk, branch_id=branch_ids[name])
+            for pk, name in branches.items()
+            if name
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0010_snapshot_stretch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileChange",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("profile_id", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProfileBranch",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("branch", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.branch")),
+                ("profile", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="portal.profile")),
+            ],
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="branch_tags",
+            field=models.ManyToManyField(blank=True, related_name="profiles", through="portal.ProfileBranch", to="portal.branch"),
+        ),
+        migrations.AddIndex(
+            model_name="profilebranch",
+            index=models.Index(fields=["branch", "profile"], name="portal_prof_branch__157e11_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="profilebranch",
+            constraint=models.UniqueConstraint(fields=("profile", "branch"), name="unique_profile_branch"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,30 @@ from django.db import models
 from django.utils import timezone
 
 
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Branch(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        verbose_name_plural = "branches"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class Location(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
 class Profile(models.Model):
     ROLE_STUDENT = "student"
     ROLE_RECRUITER = "recruiter"
@@ -31,6 +55,15 @@ class Profile(models.Model):
     preferred_locations = models.TextField(blank=True)
     phone = models.CharField(max_length=20, blank=True)
     resume_file = models.FileField(upload_to="resumes/", null=True, blank=True)
+    skill_tags = models.ManyToManyField(
+        Skill, through="ProfileSkill", related_name="profiles", blank=True
+    )
+    preferred_location_tags = models.ManyToManyField(
+        Location, through="ProfileLocation", related_name="profiles", blank=True
+    )
+    branch_tags = models.ManyToManyField(
+        Branch, through="ProfileBranch", related_name="profiles", blank=True
+    )
 
     def clean(self) -> None:
         if self.cgpa is not None and (self.cgpa < 0 or self.cgpa > 10):
@@ -63,17 +96,99 @@ class Job(models.Model):
     salary_max = models.PositiveIntegerField()
     last_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    location_tag = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs"
+    )
+    required_skill_tags = models.ManyToManyField(
+        Skill, through="JobSkill", related_name="jobs", blank=True
+    )
+    eligible_branch_tags = models.ManyToManyField(
+        Branch, through="JobBranch", related_name="jobs", blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="job_created_idx"),
+            models.Index(fields=["job_type", "-created_at", "-id"], name="job_type_created_idx"),
+            models.Index(fields=["job_type", "min_cgpa"], name="job_type_cgpa_idx"),
+            models.Index(fields=["min_cgpa", "-created_at"], name="job_cgpa_created_idx"),
+            models.Index(
+                fields=["location_tag", "-created_at", "-id"], name="job_location_created_idx"
+            ),
+            models.Index(fields=["last_date"], name="job_last_date_idx"),
+        ]
 
     def clean(self) -> None:
-        if self.last_date < timezone.localdate():
+        if self.last_date is not None and self.last_date < timezone.localdate():
             raise ValidationError({"last_date": "Last date must be today or later."})
-        if self.salary_max < self.salary_min:
+        if (
+            self.salary_min is not None
+            and self.salary_max is not None
+            and self.salary_max < self.salary_min
+        ):
             raise ValidationError({"salary_max": "Max salary must be >= min salary."})
 
     def __str__(self) -> str:
         return f"{self.title} at {self.company}"
 
 
+class ProfileSkill(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "skill"], name="unique_profile_skill")
+        ]
+        indexes = [models.Index(fields=["skill", "profile"])]
+
+
+class ProfileLocation(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profile", "location"], name="unique_profile_location"
+            )
+        ]
+        indexes = [models.Index(fields=["location", "profile"])]
+
+
+class ProfileBranch(models.Model):
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "branch"], name="unique_profile_branch")
+        ]
+        indexes = [models.Index(fields=["branch", "profile"])]
+
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "skill"], name="unique_job_skill")
+        ]
+        indexes = [models.Index(fields=["skill", "job"])]
+
+
+class JobBranch(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["job", "branch"], name="unique_job_branch")
+        ]
+        indexes = [models.Index(fields=["branch", "job"])]
+
+
 class Application(models.Model):
     STATUS_APPLIED = "Applied"
     STATUS_SHORTLISTED = "Shortlisted"
@@ -99,3 +214,99 @@ class Application(models.Model):
 
     def __str__(self) -> str:
         return f"{self.student.username} -> {self.job.title} ({self.status})"
+
+
+class JobChange(models.Model):
+    """A saved or deleted job, in commit order, for every worker to patch its job index.
+
+    ``job_id`` is null for changes too broad to patch row by row (bulk loads),
+    after which workers rebuild their index. See ``ai.index``.
+    """
+
+    job_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self) -> str:
+        return f"Job {self.job_id or 'all'} changed at {self.created_at}"
+
+
+class ProfileChange(models.Model):
+    """A saved or deleted profile, in commit order, for every worker to patch its student index.
+
+    The ``JobChange`` counterpart for ``ai.index.StudentIndex``.
+    """
+
+    profile_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self) -> str:
+        return f"Profile {self.profile_id} changed at {self.created_at}"
+
+
+class RecommendationSnapshot(models.Model):
+    """One precomputed recommendation, written by ``precompute_recommendations``.
+
+    ``fingerprint`` records the profile state the ranking was computed from and
+    ``job_version`` the last ``JobChange`` it saw, so readers can ignore
+    snapshots made stale by a profile edit and re-score just the jobs changed
+    since. ``stretch`` says whether stretch jobs were ranked.
+    """
+
+    profile = models.ForeignKey(
+        Profile, on_delete=models.CASCADE, related_name="recommendation_snapshots"
+    )
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    reasons = models.JSONField(default=list)
+    fingerprint = models.CharField(max_length=40)
+    job_version = models.BigIntegerField(default=0)
+    stretch = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "rank"], name="unique_snapshot_rank")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.profile.user.username} #{self.rank}: {self.job.title}"
+
+
+class RecruiterStats(models.Model):
+    """Running job and application counts for one recruiter, kept by ``portal.stats``."""
+
+    recruiter = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="recruiter_stats"
+    )
+    total_jobs = models.PositiveIntegerField(default=0)
+    total_applications = models.PositiveIntegerField(default=0)
+    applied = models.PositiveIntegerField(default=0)
+    shortlisted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    hired = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "recruiter stats"
+
+    def __str__(self) -> str:
+        return f"Stats for {self.recruiter.username}"
+
+
+class SkillDemand(models.Model):
+    """Distinct applicants to ``recruiter``'s jobs who list ``skill``."""
+
+    recruiter = models.ForeignKey(User, on_delete=models.CASCADE, related_name="skill_demand")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="+")
+    applicants = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["recruiter", "skill"], name="unique_skill_demand")
+        ]
+        indexes = [
+            models.Index(fields=["recruiter", "-applicants"], name="skill_demand_top_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.skill.name}: {self.applicants}"
@@ -0,0 +1,86 @@
+"""Keyset (cursor) pagination over a descending, unique ordering.
+
+Instead of ``OFFSET`` the next page starts strictly after the last row of the
+current one, so every page is an index range scan no matter how deep the
+reader goes. The cursor is an opaque URL-safe token holding the ordering
+values of that last row. Datetimes keep their microseconds: rows created in
+the same millisecond (``bulk_create``) would otherwise fall on the wrong side
+of the comparison and be skipped.
+"""
+import base64
+import datetime
+import json
+from typing import List, NamedTuple, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class KeysetPage(NamedTuple):
+    items: List
+    next_cursor: Optional[str]
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """``DjangoJSONEncoder`` without its rounding of datetimes to milliseconds."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), cls=CursorEncoder).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Optional[list]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def _after(fields: Sequence[str], values: Sequence) -> Q:
+    """Rows ordered after ``values`` when every field is sorted descending.
+
+    The redundant bound on the leading field lets the database turn the OR
+    into a single index range scan.
+    """
+    condition = Q()
+    for position in range(len(fields) - 1, -1, -1):
+        equal = {field: value for field, value in zip(fields[:position], values[:position])}
+        condition |= Q(**equal, **{f"{fields[position]}__lt": values[position]})
+    return Q(**{f"{fields[0]}__lte": values[0]}) & condition
+
+
+def keyset_paginate(
+    queryset, cursor: str, page_size: int, fields: Sequence[str] = ("created_at", "id")
+) -> KeysetPage:
+    """Return one page of ``queryset`` ordered by ``fields`` descending.
+
+    The last field must be unique (normally ``id``) so the order is total.
+    """
+    queryset = queryset.order_by(*[f"-{field}" for field in fields])
+    values = decode_cursor(cursor, len(fields))
+    if values is not None:
+        try:
+            queryset = queryset.filter(_after(fields, values))
+        except (TypeError, ValueError, ValidationError):
+            pass
+
+    items = list(queryset[: page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, field) for field in fields])
+    return KeysetPage(items, next_cursor)
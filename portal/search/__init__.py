@@ -0,0 +1,53 @@
+"""Ranked keyword search over job title, description and required skills.
+
+The backend is picked from ``PORTAL_SEARCH_BACKEND`` (a dotted path) or, by
+default, from the database vendor: an FTS5 table on SQLite and a GIN-indexed
+``tsvector`` expression on PostgreSQL. Anything else falls back to
+``icontains`` filtering.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.module_loading import import_string
+
+from .base import BasicSearchBackend, SearchBackend, tokenize
+from .postgres import PostgresSearchBackend
+from .sqlite import SqliteFtsBackend
+
+VENDOR_BACKENDS = {
+    "sqlite": SqliteFtsBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+__all__ = [
+    "BasicSearchBackend",
+    "PostgresSearchBackend",
+    "SearchBackend",
+    "SqliteFtsBackend",
+    "get_search_backend",
+    "install_search_index",
+    "tokenize",
+    "uninstall_search_index",
+]
+
+
+def _backend_class(connection):
+    path = getattr(settings, "PORTAL_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)
+    return VENDOR_BACKENDS.get(connection.vendor, BasicSearchBackend)
+
+
+def get_search_backend(using: str = DEFAULT_DB_ALIAS) -> SearchBackend:
+    connection = connections[using]
+    backend = _backend_class(connection)(connection)
+    if not backend.is_installed():
+        return BasicSearchBackend(connection)
+    return backend
+
+
+def install_search_index(connection) -> None:
+    _backend_class(connection)(connection).install()
+
+
+def uninstall_search_index(connection) -> None:
+    _backend_class(connection)(connection).uninstall()
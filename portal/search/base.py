@@ -0,0 +1,105 @@
+import re
+from typing import List, Optional
+
+from django.db.models import Q
+
+from portal.pagination import KeysetPage, decode_cursor, encode_cursor, keyset_paginate
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+MAX_TOKENS = 16
+
+
+def tokenize(query: str) -> List[str]:
+    """Words of a user query; everything else is dropped so it cannot inject syntax."""
+    return TOKEN_RE.findall((query or "").lower())[:MAX_TOKENS]
+
+
+class SearchBackend:
+    """Ranks jobs of a filtered queryset against a keyword query.
+
+    Results come back as a ``KeysetPage`` ordered by relevance, newest job
+    first on ties. The cursor holds the (score, id) of the last row.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def is_installed(self) -> bool:
+        return True
+
+    def install(self) -> None:
+        pass
+
+    def uninstall(self) -> None:
+        pass
+
+    def search(self, queryset, query: str, page_size: int, cursor: str = "") -> KeysetPage:
+        raise NotImplementedError
+
+
+class BasicSearchBackend(SearchBackend):
+    """Unranked ``icontains`` matching for databases without a full-text index."""
+
+    def search(self, queryset, query, page_size, cursor=""):
+        for token in tokenize(query):
+            queryset = queryset.filter(
+                Q(title__icontains=token)
+                | Q(description__icontains=token)
+                | Q(required_skills__icontains=token)
+            )
+        return keyset_paginate(queryset, cursor, page_size)
+
+
+class RankedSqlBackend(SearchBackend):
+    """Shared keyset paging for backends that rank in SQL.
+
+    Subclasses return a query producing ``id`` and ``score`` columns (higher
+    is better) for matching jobs whose id is in the given subquery.
+    """
+
+    def ranked_sql(self, tokens, ids_sql: str):
+        raise NotImplementedError
+
+    def search(self, queryset, query, page_size, cursor=""):
+        tokens = tokenize(query)
+        if not tokens:
+            return keyset_paginate(queryset, cursor, page_size)
+
+        ids_sql, ids_params = queryset.order_by().values("id").query.sql_with_params()
+        ranked, ranked_params = self.ranked_sql(tokens, ids_sql)
+        sql = f"SELECT id, score FROM ({ranked}) ranked"
+        params = [*ranked_params, *ids_params]
+
+        after = self._after(cursor)
+        if after is not None:
+            sql += " WHERE score < %s OR (score = %s AND id < %s)"
+            params += [after[0], after[0], after[1]]
+        sql += " ORDER BY score DESC, id DESC LIMIT %s"
+        params.append(page_size + 1)
+
+        with self.connection.cursor() as db_cursor:
+            db_cursor.execute(sql, params)
+            rows = db_cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor([rows[-1][1], rows[-1][0]])
+        jobs = queryset.model._default_manager.in_bulk([job_id for job_id, _ in rows])
+        items = []
+        for job_id, score in rows:
+            job = jobs.get(job_id)
+            if job is not None:
+                job.search_score = score
+                items.append(job)
+        return KeysetPage(items, next_cursor)
+
+    @staticmethod
+    def _after(cursor: str) -> Optional[tuple]:
+        values = decode_cursor(cursor, 2)
+        if values is None:
+            return None
+        try:
+            return float(values[0]), int(values[1])
+        except (TypeError, ValueError):
+            return None
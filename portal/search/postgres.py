@@ -0,0 +1,33 @@
+from .base import RankedSqlBackend
+
+INDEX = "portal_job_search_idx"
+# The ranking query must repeat this exact expression for the index to apply.
+DOCUMENT = (
+    "to_tsvector('english', title || ' ' || description || ' ' || required_skills)"
+)
+
+
+class PostgresSearchBackend(RankedSqlBackend):
+    """GIN expression index over a ``tsvector`` of the job's text columns."""
+
+    def is_installed(self) -> bool:
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [INDEX])
+            return cursor.fetchone() is not None
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {INDEX} ON portal_job USING GIN ({DOCUMENT})")
+
+    def uninstall(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {INDEX}")
+
+    def ranked_sql(self, tokens, ids_sql):
+        query = " & ".join(f"{token}:*" for token in tokens)
+        sql = (
+            f"SELECT id, ts_rank({DOCUMENT}, query) AS score "
+            "FROM portal_job, to_tsquery('english', %s) query "
+            f"WHERE {DOCUMENT} @@ query AND id IN ({ids_sql})"
+        )
+        return sql, [query]
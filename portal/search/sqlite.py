@@ -0,0 +1,70 @@
+from .base import RankedSqlBackend
+
+TABLE = "portal_job_fts"
+COLUMNS = ("title", "description", "required_skills")
+TRIGGERS = {
+    "portal_job_fts_ai": (
+        "AFTER INSERT ON portal_job BEGIN "
+        "INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new}); END"
+    ),
+    "portal_job_fts_ad": (
+        "AFTER DELETE ON portal_job BEGIN "
+        "INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old}); END"
+    ),
+    "portal_job_fts_au": (
+        "AFTER UPDATE ON portal_job BEGIN "
+        "INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old}); "
+        "INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new}); END"
+    ),
+}
+
+
+class SqliteFtsBackend(RankedSqlBackend):
+    """FTS5 external-content table over ``portal_job`` kept in sync by triggers.
+
+    Rebuilding ``portal_job`` during a migration drops its triggers, so
+    ``install`` is idempotent and re-run after every ``migrate``; it
+    recreates missing triggers and rebuilds the FTS table from scratch.
+    """
+
+    def _existing(self, kind: str):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = %s", [kind])
+            return {row[0] for row in cursor.fetchall()}
+
+    def is_installed(self) -> bool:
+        return TABLE in self._existing("table")
+
+    def install(self) -> None:
+        if set(TRIGGERS) <= self._existing("trigger") and self.is_installed():
+            return
+        columns = ", ".join(COLUMNS)
+        values = {
+            "table": TABLE,
+            "columns": columns,
+            "new": ", ".join(f"new.{c}" for c in COLUMNS),
+            "old": ", ".join(f"old.{c}" for c in COLUMNS),
+        }
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+                f"{columns}, content='portal_job', content_rowid='id', "
+                "tokenize='porter unicode61')"
+            )
+            for name, body in TRIGGERS.items():
+                cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body.format(**values)}")
+            cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('rebuild')")
+
+    def uninstall(self) -> None:
+        with self.connection.cursor() as cursor:
+            for name in TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+
+    def ranked_sql(self, tokens, ids_sql):
+        match = " ".join(f'"{token}"*' for token in tokens)
+        sql = (
+            f"SELECT rowid AS id, -bm25({TABLE}) AS score FROM {TABLE} "
+            f"WHERE {TABLE} MATCH %s AND rowid IN ({ids_sql})"
+        )
+        return sql, [match]
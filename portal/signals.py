@@ -1,11 +1,134 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
-from .models import Profile
+from ai.index import remove_job, remove_profile, update_job, update_profile
+from . import stats
+from .models import Application, Job, Profile
+from .search import install_search_index
+from .taxonomy import sync_job_taxonomy, sync_profile_taxonomy
 
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance: User, created: bool, **kwargs) -> None:
     if created:
         Profile.objects.get_or_create(user=instance)
+
+
+def _touches(update_fields, fields) -> bool:
+    return update_fields is None or bool(set(update_fields) & set(fields))
+
+
+@receiver(post_save, sender=Profile)
+def sync_profile_tags(sender, instance: Profile, update_fields=None, **kwargs) -> None:
+    if _touches(update_fields, ("skills", "preferred_locations", "branch")):
+        added, removed = sync_profile_taxonomy(instance)
+        stats.profile_skills_changed(instance, added, removed)
+
+
+@receiver(post_save, sender=Profile)
+def index_saved_profile(sender, instance: Profile, **kwargs) -> None:
+    transaction.on_commit(lambda: update_profile(instance))
+
+
+@receiver(post_delete, sender=Profile)
+def unindex_deleted_profile(sender, instance: Profile, **kwargs) -> None:
+    profile_id = instance.pk
+    transaction.on_commit(lambda: remove_profile(profile_id))
+
+
+@receiver(post_save, sender=Job)
+def sync_job_tags(sender, instance: Job, update_fields=None, **kwargs) -> None:
+    if _touches(update_fields, ("required_skills", "eligible_branches", "location")):
+        sync_job_taxonomy(instance)
+
+
+@receiver(post_save, sender=Job)
+def index_saved_job(sender, instance: Job, **kwargs) -> None:
+    transaction.on_commit(lambda: update_job(instance))
+
+
+@receiver(post_delete, sender=Job)
+def unindex_deleted_job(sender, instance: Job, **kwargs) -> None:
+    job_id = instance.pk
+    transaction.on_commit(lambda: remove_job(job_id))
+
+
+@receiver(post_save, sender=Job)
+def count_saved_job(sender, instance: Job, created: bool, **kwargs) -> None:
+    if created:
+        stats.job_created(instance)
+
+
+# Jobs between their pre_delete and post_delete; the per-application delete
+# receivers leave applications cascading from them to ``count_deleted_job``.
+_deleting_jobs = set()
+
+
+def _cascades_from_job(origin) -> bool:
+    if isinstance(origin, QuerySet):
+        return origin.model is Job
+    return isinstance(origin, Job)
+
+
+@receiver(pre_delete, sender=Job)
+def remember_job_applications(sender, instance: Job, **kwargs) -> None:
+    instance._applications = stats.job_applications(instance)
+    _deleting_jobs.add(instance.pk)
+
+
+@receiver(post_delete, sender=Job)
+def count_deleted_job(sender, instance: Job, **kwargs) -> None:
+    _deleting_jobs.discard(instance.pk)
+    stats.job_deleted(instance, *instance._applications)
+
+
+def _recruiter_id(application: Application) -> int:
+    if Application.job.is_cached(application):
+        return application.job.recruiter_id
+    return Job.objects.filter(pk=application.job_id).values_list("recruiter_id", flat=True).get()
+
+
+@receiver(pre_save, sender=Application)
+def remember_application_status(sender, instance: Application, update_fields=None, **kwargs):
+    instance._previous_status = None
+    if instance.pk and _touches(update_fields, ("status",)):
+        instance._previous_status = (
+            Application.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Application)
+def count_saved_application(sender, instance: Application, created: bool, **kwargs) -> None:
+    if created:
+        stats.application_created(instance, _recruiter_id(instance))
+    elif instance._previous_status is not None:
+        stats.application_status_changed(
+            _recruiter_id(instance), instance._previous_status, instance.status
+        )
+
+
+@receiver(pre_delete, sender=Application)
+def remember_application_owners(sender, instance: Application, origin=None, **kwargs) -> None:
+    if _cascades_from_job(origin):
+        return
+    # Cascading deletes remove the job or the student's profile before post_delete runs.
+    instance._recruiter_id = _recruiter_id(instance)
+    instance._skill_ids = stats.student_skill_ids(instance.student_id)
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance: Application, **kwargs) -> None:
+    if instance.job_id in _deleting_jobs:
+        return
+    stats.application_deleted(instance, instance._recruiter_id, instance._skill_ids)
+
+
+@receiver(post_migrate)
+def reinstall_job_search(sender, using: str = DEFAULT_DB_ALIAS, **kwargs) -> None:
+    # SQLite table rebuilds during migrations drop the FTS triggers.
+    connection = connections[using]
+    if sender.name == "portal" and Job._meta.db_table in connection.introspection.table_names():
+        install_search_index(connection)
@@ -0,0 +1,221 @@
+"""Incrementally maintained recruiter analytics.
+
+``RecruiterStats`` holds each recruiter's job count and application counts
+per status; ``SkillDemand`` counts, per recruiter and skill, the distinct
+students who applied to any of that recruiter's jobs and list the skill.
+Receivers in ``portal.signals`` apply deltas with ``F()`` updates as jobs,
+applications and profile skills change, so the analytics page reads a few
+rows instead of aggregating every application. The counter writes are
+deferred with ``transaction.on_commit``: the row locks they take on these
+shared rows are then held for one statement, not for the rest of the
+transaction that saved the job or application (e.g. ``apply_to_job``).
+
+Deletions recount the affected skill rows rather than decrementing, because
+a cascade may remove several of one student's applications at once. A
+deleted job is counted as one unit with the applications it cascades to. Run
+``python manage.py rebuild_stats`` to recompute everything from scratch.
+"""
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import Case, Count, Exists, F, Value, When
+
+from .models import Application, Job, ProfileSkill, RecruiterStats, SkillDemand
+
+STATUS_FIELDS = {
+    Application.STATUS_APPLIED: "applied",
+    Application.STATUS_SHORTLISTED: "shortlisted",
+    Application.STATUS_REJECTED: "rejected",
+    Application.STATUS_HIRED: "hired",
+}
+
+
+def _update_recruiter(recruiter_id: int, deltas: Dict[str, int], create: bool = True) -> None:
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    rows = RecruiterStats.objects.filter(recruiter_id=recruiter_id)
+    if rows.update(**updates) or not create:
+        return
+    RecruiterStats.objects.bulk_create(
+        [RecruiterStats(recruiter_id=recruiter_id)], ignore_conflicts=True
+    )
+    rows.update(**updates)
+
+
+def adjust_recruiter(recruiter_id: int, **deltas: int) -> None:
+    """Add ``deltas`` to the recruiter's counters once the current transaction commits."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _update_recruiter(recruiter_id, deltas))
+
+
+def status_deltas(counts: Dict[str, int]) -> Dict[str, int]:
+    """Map ``{status: change}`` to ``adjust_recruiter`` keyword arguments."""
+    deltas = {}
+    for status, change in counts.items():
+        field = STATUS_FIELDS.get(status)
+        if field:
+            deltas[field] = deltas.get(field, 0) + change
+    return deltas
+
+
+def student_skill_ids(student_id: int):
+    return list(
+        ProfileSkill.objects.filter(profile__user_id=student_id).values_list("skill_id", flat=True)
+    )
+
+
+def _add_skill_demand(recruiter_ids: Iterable[int], skill_ids, delta: int) -> None:
+    recruiter_ids = list(recruiter_ids)
+    skill_ids = list(skill_ids)
+    if recruiter_ids and skill_ids:
+        transaction.on_commit(lambda: _update_skill_demand(recruiter_ids, skill_ids, delta))
+
+
+def _update_skill_demand(recruiter_ids, skill_ids, delta: int) -> None:
+    if delta > 0:
+        SkillDemand.objects.bulk_create(
+            [
+                SkillDemand(recruiter_id=recruiter_id, skill_id=skill_id)
+                for recruiter_id in recruiter_ids
+                for skill_id in skill_ids
+            ],
+            ignore_conflicts=True,
+        )
+    SkillDemand.objects.filter(recruiter_id__in=recruiter_ids, skill_id__in=skill_ids).update(
+        applicants=F("applicants") + delta
+    )
+
+
+def recount_skill_demand(recruiter_id: int, skill_ids) -> None:
+    if skill_ids:
+        transaction.on_commit(lambda: _recount_skill_demand(recruiter_id, skill_ids))
+
+
+def _recount_skill_demand(recruiter_id: int, skill_ids) -> None:
+    counts = dict(
+        ProfileSkill.objects.filter(
+            skill_id__in=skill_ids,
+            profile__user__applications__job__recruiter_id=recruiter_id,
+        )
+        .values("skill_id")
+        .annotate(total=Count("profile_id", distinct=True))
+        .values_list("skill_id", "total")
+    )
+    SkillDemand.objects.filter(recruiter_id=recruiter_id, skill_id__in=skill_ids).update(
+        applicants=Case(
+            *[When(skill_id=skill_id, then=Value(total)) for skill_id, total in counts.items()],
+            default=Value(0),
+        )
+    )
+
+
+def job_created(job: Job) -> None:
+    adjust_recruiter(job.recruiter_id, total_jobs=1)
+
+
+def job_applications(job: Job):
+    """``({status: applications}, applicant skill ids)`` of ``job``, read before deleting it."""
+    counts = dict(
+        Application.objects.filter(job=job)
+        .values_list("status")
+        .annotate(total=Count("id"))
+        .values_list("status", "total")
+    )
+    skill_ids = list(
+        ProfileSkill.objects.filter(profile__user__applications__job=job)
+        .values_list("skill_id", flat=True)
+        .distinct()
+    )
+    return counts, skill_ids
+
+
+def job_deleted(job: Job, counts: Dict[str, int], skill_ids) -> None:
+    """Count ``job`` and its cascaded applications (``job_applications``) as deleted at once."""
+    recruiter_id = job.recruiter_id
+    deltas = {
+        "total_jobs": -1,
+        "total_applications": -sum(counts.values()),
+        **status_deltas({status: -count for status, count in counts.items()}),
+    }
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    transaction.on_commit(lambda: _update_recruiter(recruiter_id, deltas, create=False))
+    recount_skill_demand(recruiter_id, skill_ids)
+
+
+def application_created(application: Application, recruiter_id: int) -> None:
+    adjust_recruiter(
+        recruiter_id,
+        total_applications=1,
+        **status_deltas({application.status: 1}),
+    )
+    # The student's skills count towards the recruiter only on their first application to them.
+    earlier = Application.objects.filter(
+        student_id=application.student_id, job__recruiter_id=recruiter_id
+    ).exclude(pk=application.pk)
+    skill_ids = ProfileSkill.objects.filter(profile__user_id=application.student_id).exclude(
+        Exists(earlier)
+    )
+    _add_skill_demand([recruiter_id], skill_ids.values_list("skill_id", flat=True), 1)
+
+
+def application_status_changed(
+    recruiter_id: int, old_status: str, new_status: str, count: int = 1
+) -> None:
+    applications_moved(recruiter_id, {old_status: count}, new_status)
+
+
+def applications_moved(recruiter_id: int, moved: Dict[str, int], new_status: str) -> None:
+    """Count ``moved`` (``{previous status: applications}``) as now in ``new_status``."""
+    counts = {status: -count for status, count in moved.items() if status != new_status}
+    counts[new_status] = -sum(counts.values())
+    adjust_recruiter(recruiter_id, **status_deltas(counts))
+
+
+def application_deleted(application: Application, recruiter_id: int, skill_ids) -> None:
+    """Call after the delete, with ids read before it (a cascade may remove the profile)."""
+    deltas = {"total_applications": -1, **status_deltas({application.status: -1})}
+    transaction.on_commit(lambda: _update_recruiter(recruiter_id, deltas, create=False))
+    recount_skill_demand(recruiter_id, skill_ids)
+
+
+def profile_skills_changed(profile, added, removed) -> None:
+    if not added and not removed:
+        return
+    recruiter_ids = set(
+        Job.objects.filter(applications__student_id=profile.user_id).values_list(
+            "recruiter_id", flat=True
+        )
+    )
+    _add_skill_demand(recruiter_ids, list(added), 1)
+    _add_skill_demand(recruiter_ids, list(removed), -1)
+
+
+def rebuild_stats() -> None:
+    """Recompute every ``RecruiterStats`` and ``SkillDemand`` row from the source tables."""
+    stats = {}
+    for recruiter_id, total in Job.objects.values_list("recruiter_id").annotate(Count("id")):
+        row = stats.setdefault(recruiter_id, RecruiterStats(recruiter_id=recruiter_id))
+        row.total_jobs = total
+    for recruiter_id, status, total in (
+        Application.objects.values_list("job__recruiter_id", "status").annotate(Count("id"))
+    ):
+        row = stats.setdefault(recruiter_id, RecruiterStats(recruiter_id=recruiter_id))
+        row.total_applications += total
+        field = STATUS_FIELDS.get(status)
+        if field:
+            setattr(row, field, getattr(row, field) + total)
+
+    demand = [
+        SkillDemand(recruiter_id=recruiter_id, skill_id=skill_id, applicants=total)
+        for recruiter_id, skill_id, total in (
+            ProfileSkill.objects.filter(profile__user__applications__isnull=False)
+            .values_list("profile__user__applications__job__recruiter_id", "skill_id")
+            .annotate(Count("profile_id", distinct=True))
+        )
+    ]
+
+    with transaction.atomic():
+        RecruiterStats.objects.all().delete()
+        SkillDemand.objects.all().delete()
+        RecruiterStats.objects.bulk_create(stats.values(), batch_size=1000)
+        SkillDemand.objects.bulk_create(demand, batch_size=1000)
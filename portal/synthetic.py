@@ -0,0 +1,453 @@
+"""Synthetic students, recruiters, jobs and applications for load testing.
+
+Everything is written with ``bulk_create`` in chunks. All synthetic users
+share one password hash computed up front, so no per-user PBKDF2 work is
+done. Because ``bulk_create`` skips signals, the taxonomy links are synced in
+bulk per chunk and the recruiter counters are rebuilt once at the end.
+
+Students follow a career track (web, data, embedded, ...) correlated with
+their branch, so skills, interests and projects hang together and the
+recommender sees realistic overlap; job popularity is Zipf-like so a few
+postings collect most applications, as on a real deadline day.
+"""
+import random
+import re
+from datetime import timedelta
+from typing import Dict
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from ai.index import invalidate_job_index
+
+from .models import Application, Job, Profile
+from .stats import rebuild_stats
+from .taxonomy import sync_new_jobs_taxonomy, sync_new_profiles_taxonomy
+
+SYNTHETIC_PASSWORD = "Synthetic@123"
+CHUNK_SIZE = 5000
+JOBS_PER_RECRUITER = 50
+# Near saturation most sampled pairs are duplicates; stop short rather than spin.
+MAX_SAMPLING_ROUNDS = 20
+
+TRACKS = {
+    "web": {
+        "skills": [
+            "python",
+            "django",
+            "javascript",
+            "react",
+            "html",
+            "css",
+            "sql",
+            "rest",
+            "node.js",
+            "typescript",
+        ],
+        "interests": ["web development", "backend", "frontend", "cloud"],
+        "titles": [
+            "Backend Developer",
+            "Frontend Engineer",
+            "Full Stack Developer",
+            "Web Developer",
+        ],
+        "projects": ["Placement portal", "E-commerce store", "Blog platform", "Chat application"],
+        "branches": {"cse": 5, "it": 4, "ece": 1},
+    },
+    "data": {
+        "skills": [
+            "python",
+            "sql",
+            "pandas",
+            "numpy",
+            "machine learning",
+            "scikit-learn",
+            "excel",
+            "data visualization",
+            "statistics",
+            "deep learning",
+        ],
+        "interests": ["data science", "analytics", "ai", "machine learning"],
+        "titles": [
+            "Data Analyst",
+            "Data Science Intern",
+            "ML Engineer",
+            "Business Intelligence Analyst",
+        ],
+        "projects": [
+            "Sales forecasting",
+            "Resume classifier",
+            "Churn prediction",
+            "Movie recommender",
+        ],
+        "branches": {"cse": 4, "it": 4, "ece": 1, "eee": 1},
+    },
+    "embedded": {
+        "skills": [
+            "c",
+            "c++",
+            "embedded systems",
+            "iot",
+            "microcontrollers",
+            "networking",
+            "matlab",
+            "pcb design",
+        ],
+        "interests": ["embedded", "iot", "automation", "robotics"],
+        "titles": [
+            "IoT Engineer",
+            "Embedded Software Intern",
+            "Firmware Engineer",
+            "Hardware Design Engineer",
+        ],
+        "projects": [
+            "Smart home automation",
+            "IoT water quality monitor",
+            "Line follower robot",
+            "Smart energy meter",
+        ],
+        "branches": {"ece": 5, "eee": 4, "cse": 1},
+    },
+    "devops": {
+        "skills": [
+            "linux",
+            "docker",
+            "kubernetes",
+            "aws",
+            "ci/cd",
+            "python",
+            "bash",
+            "terraform",
+            "networking",
+        ],
+        "interests": ["cloud", "infrastructure", "automation", "security"],
+        "titles": [
+            "DevOps Engineer",
+            "Cloud Support Associate",
+            "Site Reliability Intern",
+            "Systems Engineer",
+        ],
+        "projects": [
+            "CI pipeline for college apps",
+            "Kubernetes cluster setup",
+            "Log monitoring stack",
+            "Infrastructure as code",
+        ],
+        "branches": {"cse": 4, "it": 4, "ece": 2},
+    },
+    "core": {
+        "skills": [
+            "autocad",
+            "solidworks",
+            "matlab",
+            "project management",
+            "excel",
+            "thermodynamics",
+            "quality control",
+        ],
+        "interests": ["design", "manufacturing", "operations", "energy"],
+        "titles": [
+            "Graduate Engineer Trainee",
+            "Design Engineer",
+            "Production Engineer",
+            "Site Engineer",
+        ],
+        "projects": [
+            "Solar dryer design",
+            "Gearbox optimisation",
+            "Bridge load analysis",
+            "Plant layout study",
+        ],
+        "branches": {"mech": 5, "civil": 4, "eee": 2},
+    },
+    "business": {
+        "skills": [
+            "excel",
+            "communication",
+            "analysis",
+            "documentation",
+            "sql",
+            "presentation",
+            "market research",
+        ],
+        "interests": ["consulting", "product management", "finance", "operations"],
+        "titles": [
+            "Business Analyst",
+            "Product Analyst",
+            "Operations Associate",
+            "Consulting Intern",
+        ],
+        "projects": [
+            "Market entry study",
+            "KPI dashboard",
+            "Process mapping",
+            "Customer survey analysis",
+        ],
+        "branches": {"cse": 1, "it": 1, "ece": 1, "eee": 1, "mech": 1, "civil": 1},
+    },
+}
+TRACK_WEIGHTS = {"web": 30, "data": 22, "embedded": 12, "devops": 12, "core": 14, "business": 10}
+GENERAL_SKILLS = ["git", "communication", "problem solving", "teamwork", "data structures", "java"]
+LOCATIONS = {
+    "bengaluru": 24,
+    "hyderabad": 14,
+    "pune": 13,
+    "mumbai": 11,
+    "chennai": 10,
+    "delhi": 9,
+    "noida": 6,
+    "kolkata": 4,
+    "remote": 9,
+}
+CERTIFICATIONS = [
+    "AWS Cloud Practitioner",
+    "Google Data Analytics",
+    "NPTEL Embedded Systems",
+    "Microsoft Azure Fundamentals",
+    "Coursera Machine Learning",
+    "",
+]
+YEARS = ["Second", "Third", "Final"]
+COMPANY_PREFIXES = [
+    "Tech",
+    "Data",
+    "Cloud",
+    "Smart",
+    "Pixel",
+    "Neuron",
+    "Quantum",
+    "Bright",
+    "Core",
+    "Agile",
+]
+COMPANY_SUFFIXES = [
+    "Nova",
+    "Works",
+    "Labs",
+    "Bridge",
+    "Wave",
+    "Forge",
+    "Grid",
+    "Hub",
+    "Systems",
+    "Soft",
+]
+STATUS_WEIGHTS = {
+    Application.STATUS_APPLIED: 70,
+    Application.STATUS_SHORTLISTED: 15,
+    Application.STATUS_REJECTED: 12,
+    Application.STATUS_HIRED: 3,
+}
+
+
+def _weighted(rng: random.Random, weights: Dict[str, int]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _sample(rng: random.Random, items, low: int, high: int):
+    return rng.sample(items, min(len(items), rng.randint(low, high)))
+
+
+def _chunks(total: int, size: int):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def _next_number(prefix: str) -> int:
+    """One past the largest ``<prefix><number>`` username, so gaps from deletions are skipped."""
+    last = (
+        User.objects.filter(username__regex=rf"^{re.escape(prefix)}[0-9]+$")
+        .annotate(length=Length("username"))
+        .order_by("-length", "-username")
+        .values_list("username", flat=True)
+        .first()
+    )
+    return int(last[len(prefix):]) + 1 if last else 0
+
+
+def _create_users(prefix: str, count: int, password: str):
+    start = _next_number(prefix)
+    return User.objects.bulk_create(
+        [
+            User(
+                username=f"{prefix}{start + n}",
+                email=f"{prefix}{start + n}@example.com",
+                password=password,
+            )
+            for n in range(count)
+        ]
+    )
+
+
+def _student_profile(rng: random.Random, user: User) -> Profile:
+    track_name = _weighted(rng, TRACK_WEIGHTS)
+    track = TRACKS[track_name]
+    skills = _sample(rng, track["skills"], 3, 7) + _sample(rng, GENERAL_SKILLS, 0, 2)
+    cgpa = min(10.0, max(5.0, rng.gauss(7.6, 0.8)))
+    return Profile(
+        user=user,
+        role=Profile.ROLE_STUDENT,
+        branch=_weighted(rng, track["branches"]).upper(),
+        year=rng.choice(YEARS),
+        cgpa=round(cgpa, 2),
+        skills=", ".join(dict.fromkeys(skills)),
+        interests=", ".join(_sample(rng, track["interests"], 1, 3)),
+        projects="; ".join(_sample(rng, track["projects"], 1, 2)),
+        certifications=rng.choice(CERTIFICATIONS),
+        preferred_locations=", ".join(
+            dict.fromkeys(_weighted(rng, LOCATIONS) for _ in range(rng.randint(1, 3)))
+        ),
+    )
+
+
+def _job(rng: random.Random, recruiter_id: int, today) -> Job:
+    track = TRACKS[_weighted(rng, TRACK_WEIGHTS)]
+    title = rng.choice(track["titles"])
+    job_type = "Intern" if "Intern" in title or rng.random() < 0.3 else "Full-time"
+    skills = _sample(rng, track["skills"], 3, 5)
+    salary_min = (
+        rng.randrange(10000, 30000, 1000)
+        if job_type == "Intern"
+        else rng.randrange(300000, 1200000, 50000)
+    )
+    # Roughly one posting in six has already closed.
+    last_date = today + timedelta(
+        days=rng.randint(-20, 60) if rng.random() < 0.17 else rng.randint(1, 60)
+    )
+    return Job(
+        recruiter_id=recruiter_id,
+        title=f"{title} Intern" if job_type == "Intern" and "Intern" not in title else title,
+        company=rng.choice(COMPANY_PREFIXES) + rng.choice(COMPANY_SUFFIXES),
+        description=(
+            f"Work with the team on {', '.join(skills[:2])} and {rng.choice(track['interests'])} "
+            f"projects such as {rng.choice(track['projects']).lower()}."
+        ),
+        required_skills=", ".join(skills),
+        min_cgpa=round(rng.choice([6.0, 6.5, 7.0, 7.0, 7.5, 7.5, 8.0, 8.5]), 1),
+        eligible_branches=", ".join(
+            _sample(rng, list(track["branches"]), 1, len(track["branches"]))
+        ),
+        job_type=job_type,
+        location=_weighted(rng, LOCATIONS).title(),
+        salary_min=salary_min,
+        salary_max=int(salary_min * rng.uniform(1.2, 1.8)),
+        last_date=min(last_date, today + timedelta(days=90)),
+    )
+
+
+def _application_pairs(generator, student_ids, job_ids, count: int):
+    """Up to ``count`` distinct (student, job) pairs, job popularity Zipf-like."""
+    student_ids = np.asarray(student_ids, dtype=np.int64)
+    job_ids = np.asarray(job_ids, dtype=np.int64)
+    count = min(count, len(student_ids) * len(job_ids))
+    popularity = 1.0 / np.sqrt(np.arange(1, len(job_ids) + 1))
+    popularity /= popularity.sum()
+    job_order = generator.permutation(len(job_ids))
+
+    keys = np.empty(0, dtype=np.int64)
+    for _ in range(MAX_SAMPLING_ROUNDS):
+        if len(keys) >= count:
+            break
+        needed = int((count - len(keys)) * 1.2) + 16
+        students = generator.integers(0, len(student_ids), needed)
+        jobs = job_order[generator.choice(len(job_ids), needed, p=popularity)]
+        keys = np.unique(np.concatenate([keys, students * len(job_ids) + jobs]))
+    keys = generator.permutation(keys)[:count]
+    return student_ids[keys // len(job_ids)], job_ids[keys % len(job_ids)]
+
+
+def generate(
+    students: int = 0,
+    jobs: int = 0,
+    applications: int = 0,
+    recruiters: int = 0,
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+    prefix: str = "synthetic",
+    log=None,
+) -> Dict[str, int]:
+    """Create a synthetic dataset and return how many rows of each kind were made.
+
+    Applications are spread over every student and job in the database, so
+    earlier synthetic or demo data is included. Recruiters default to one per
+    ``JOBS_PER_RECRUITER`` jobs when ``jobs`` is set; jobs go to synthetic
+    recruiters only.
+    """
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+    generator = np.random.default_rng(seed)
+    password = make_password(SYNTHETIC_PASSWORD)
+    today = timezone.localdate()
+    created = {"recruiters": 0, "students": 0, "jobs": 0, "applications": 0}
+
+    if jobs and not recruiters:
+        recruiters = max(1, jobs // JOBS_PER_RECRUITER)
+    for _, size in _chunks(recruiters, chunk_size):
+        with transaction.atomic():
+            users = _create_users(f"{prefix}_recruiter_", size, password)
+            Profile.objects.bulk_create(
+                [Profile(user=user, role=Profile.ROLE_RECRUITER, branch="HR") for user in users]
+            )
+        created["recruiters"] += size
+    if recruiters:
+        log(f"Created {created['recruiters']} recruiters")
+
+    for _, size in _chunks(students, chunk_size):
+        with transaction.atomic():
+            users = _create_users(f"{prefix}_student_", size, password)
+            profiles = Profile.objects.bulk_create([_student_profile(rng, user) for user in users])
+            sync_new_profiles_taxonomy(profiles)
+        created["students"] += size
+        log(f"Created {created['students']}/{students} students")
+
+    recruiter_ids = list(
+        Profile.objects.filter(
+            role=Profile.ROLE_RECRUITER, user__username__startswith=f"{prefix}_recruiter_"
+        ).values_list("user_id", flat=True)
+    )
+    for _, size in _chunks(jobs, chunk_size):
+        with transaction.atomic():
+            batch = Job.objects.bulk_create(
+                [_job(rng, rng.choice(recruiter_ids), today) for _ in range(size)]
+            )
+            sync_new_jobs_taxonomy(batch)
+        created["jobs"] += size
+        log(f"Created {created['jobs']}/{jobs} jobs")
+
+    if applications:
+        student_ids = list(
+            Profile.objects.filter(role=Profile.ROLE_STUDENT).values_list("user_id", flat=True)
+        )
+        job_ids = list(Job.objects.values_list("id", flat=True))
+        taken = set(Application.objects.values_list("student_id", "job_id"))
+        student_column, job_column = _application_pairs(
+            generator, student_ids, job_ids, applications + len(taken)
+        )
+        pairs = [
+            pair for pair in zip(student_column.tolist(), job_column.tolist()) if pair not in taken
+        ][:applications]
+        statuses = rng.choices(
+            list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=len(pairs)
+        )
+        for start, size in _chunks(len(pairs), chunk_size):
+            Application.objects.bulk_create(
+                [
+                    Application(student_id=student_id, job_id=job_id, status=status)
+                    for (student_id, job_id), status in zip(
+                        pairs[start : start + size], statuses[start : start + size]
+                    )
+                ],
+                ignore_conflicts=True,
+            )
+            created["applications"] += size
+            log(f"Created {created['applications']}/{len(pairs)} applications")
+
+    if any(created.values()):
+        rebuild_stats()
+    if created["jobs"]:
+        invalidate_job_index()
+    return created
@@ -0,0 +1,168 @@
+"""Keep the normalised skill/branch/location tables in step with the CSV fields.
+
+Profiles and jobs are still edited as comma-separated text; after each save
+the text is split with ``split_csv`` and mirrored into the through tables so
+filters and matching can use indexed joins instead of ``LIKE`` scans.
+"""
+from .models import (
+    Branch,
+    JobBranch,
+    JobSkill,
+    Location,
+    ProfileBranch,
+    ProfileLocation,
+    ProfileSkill,
+    Skill,
+)
+from .utils import split_csv
+
+NAME_MAX_LENGTH = 100
+
+
+def normalize_names(text: str):
+    return sorted({name[:NAME_MAX_LENGTH] for name in split_csv(text)})
+
+
+def normalize_name(text: str):
+    """A single-valued field (a job's location, a student's branch) as a name list."""
+    name = text.strip().lower()[:NAME_MAX_LENGTH]
+    return [name] if name else []
+
+
+def resolve(model, names):
+    """Return ids for ``names`` in a taxonomy table, creating missing rows."""
+    if not names:
+        return []
+    model.objects.bulk_create([model(name=name) for name in names], ignore_conflicts=True)
+    return list(model.objects.filter(name__in=names).values_list("id", flat=True))
+
+
+def matching_ids(model, text: str):
+    """Ids of taxonomy rows whose name contains ``text`` (the table is small)."""
+    return model.objects.filter(name__contains=text.strip().lower()).values_list("id", flat=True)
+
+
+def _replace_links(through, owner_field: str, owner_id: int, target_field: str, target_ids):
+    """Point the owner's links at ``target_ids``; return the (added, removed) ids."""
+    links = through.objects.filter(**{owner_field: owner_id})
+    existing = set(links.values_list(target_field, flat=True))
+    removed = existing.difference(target_ids)
+    added = set(target_ids) - existing
+    if removed:
+        links.filter(**{f"{target_field}__in": removed}).delete()
+    if added:
+        through.objects.bulk_create(
+            [through(**{owner_field: owner_id, target_field: target_id}) for target_id in added],
+            ignore_conflicts=True,
+        )
+    return added, removed
+
+
+def sync_job_taxonomy(job) -> None:
+    location_ids = resolve(Location, normalize_name(job.location))
+    location_id = location_ids[0] if location_ids else None
+    if job.location_tag_id != location_id:
+        job.location_tag_id = location_id
+        type(job).objects.filter(pk=job.pk).update(location_tag_id=location_id)
+
+    skill_ids = resolve(Skill, normalize_names(job.required_skills))
+    _replace_links(JobSkill, "job_id", job.pk, "skill_id", skill_ids)
+    branch_ids = resolve(Branch, normalize_names(job.eligible_branches))
+    _replace_links(JobBranch, "job_id", job.pk, "branch_id", branch_ids)
+
+
+def _name_ids(model, names):
+    names = sorted(set(names))
+    if not names:
+        return {}
+    model.objects.bulk_create([model(name=name) for name in names], ignore_conflicts=True)
+    return dict(model.objects.filter(name__in=names).values_list("name", "id"))
+
+
+def sync_new_jobs_taxonomy(jobs) -> None:
+    """``sync_job_taxonomy`` for many freshly inserted jobs (no existing links) at once."""
+    if not jobs:
+        return
+    locations = {job.pk: job.location.strip().lower()[:NAME_MAX_LENGTH] for job in jobs}
+    skills = {job.pk: normalize_names(job.required_skills) for job in jobs}
+    branches = {job.pk: normalize_names(job.eligible_branches) for job in jobs}
+
+    location_ids = _name_ids(Location, [name for name in locations.values() if name])
+    skill_ids = _name_ids(Skill, [name for names in skills.values() for name in names])
+    branch_ids = _name_ids(Branch, [name for names in branches.values() for name in names])
+
+    JobSkill.objects.bulk_create(
+        [
+            JobSkill(job_id=pk, skill_id=skill_ids[name])
+            for pk, names in skills.items()
+            for name in names
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    JobBranch.objects.bulk_create(
+        [
+            JobBranch(job_id=pk, branch_id=branch_ids[name])
+            for pk, names in branches.items()
+            for name in names
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    jobs_by_location = {}
+    for job in jobs:
+        name = locations[job.pk]
+        if name:
+            job.location_tag_id = location_ids[name]
+            jobs_by_location.setdefault(job.location_tag_id, []).append(job.pk)
+    for location_id, pks in jobs_by_location.items():
+        type(jobs[0]).objects.filter(pk__in=pks).update(location_tag_id=location_id)
+
+
+def sync_new_profiles_taxonomy(profiles) -> None:
+    """``sync_profile_taxonomy`` for many freshly inserted profiles at once."""
+    skills = {profile.pk: normalize_names(profile.skills) for profile in profiles}
+    locations = {profile.pk: normalize_names(profile.preferred_locations) for profile in profiles}
+    branches = {profile.pk: normalize_name(profile.branch) for profile in profiles}
+    skill_ids = _name_ids(Skill, [name for names in skills.values() for name in names])
+    location_ids = _name_ids(Location, [name for names in locations.values() for name in names])
+    branch_ids = _name_ids(Branch, [name for names in branches.values() for name in names])
+
+    ProfileSkill.objects.bulk_create(
+        [
+            ProfileSkill(profile_id=pk, skill_id=skill_ids[name])
+            for pk, names in skills.items()
+            for name in names
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    ProfileLocation.objects.bulk_create(
+        [
+            ProfileLocation(profile_id=pk, location_id=location_ids[name])
+            for pk, names in locations.items()
+            for name in names
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    ProfileBranch.objects.bulk_create(
+        [
+            ProfileBranch(profile_id=pk, branch_id=branch_ids[name])
+            for pk, names in branches.items()
+            for name in names
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def sync_profile_taxonomy(profile):
+    """Sync the profile's tags and return the (added, removed) skill ids."""
+    skill_ids = resolve(Skill, normalize_names(profile.skills))
+    skill_changes = _replace_links(ProfileSkill, "profile_id", profile.pk, "skill_id", skill_ids)
+    location_ids = resolve(Location, normalize_names(profile.preferred_locations))
+    _replace_links(ProfileLocation, "profile_id", profile.pk, "location_id", location_ids)
+    branch_ids = resolve(Branch, normalize_name(profile.branch))
+    _replace_links(ProfileBranch, "profile_id", profile.pk, "branch_id", branch_ids)
+    return skill_changes
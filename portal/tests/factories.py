@@ -0,0 +1,51 @@
+"""Small builders for test data; each returns saved rows."""
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from portal.models import Job, Profile
+
+
+def make_user(username: str, role: str = Profile.ROLE_STUDENT, **profile_fields) -> User:
+    user = User.objects.create_user(username=username, password="pass12345")
+    profile = user.profile
+    profile.role = role
+    for field, value in profile_fields.items():
+        setattr(profile, field, value)
+    profile.save()
+    return user
+
+
+def make_student(username: str = "student", **profile_fields) -> User:
+    profile_fields.setdefault("branch", "CSE")
+    profile_fields.setdefault("cgpa", Decimal("8.0"))
+    profile_fields.setdefault("skills", "Python, Django, SQL")
+    return make_user(username, Profile.ROLE_STUDENT, **profile_fields)
+
+
+def make_recruiter(username: str = "recruiter") -> User:
+    return make_user(username, Profile.ROLE_RECRUITER)
+
+
+def job_fields(recruiter: User, **fields) -> dict:
+    return {
+        "recruiter": recruiter,
+        "title": "Backend Developer",
+        "company": "Acme",
+        "description": "Build web services in Python.",
+        "required_skills": "Python, Django",
+        "min_cgpa": Decimal("6.0"),
+        "eligible_branches": "CSE, IT",
+        "job_type": "Full-time",
+        "location": "Bengaluru",
+        "salary_min": 500000,
+        "salary_max": 900000,
+        "last_date": timezone.localdate() + datetime.timedelta(days=30),
+        **fields,
+    }
+
+
+def make_job(recruiter: User, **fields) -> Job:
+    return Job.objects.create(**job_fields(recruiter, **fields))
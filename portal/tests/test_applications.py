@@ -0,0 +1,65 @@
+from django.contrib.messages import get_messages
+from django.test import TestCase
+
+from portal.applications import apply_to_job, bulk_update_status
+from portal.models import Application, RecruiterStats
+
+from .factories import make_job, make_recruiter, make_student
+
+
+class ApplyToJobTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        self.student = make_student()
+
+    def test_second_apply_returns_the_existing_application(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first, created = apply_to_job(self.job, self.student)
+        self.assertTrue(created)
+        with self.captureOnCommitCallbacks(execute=True):
+            second, created = apply_to_job(self.job, self.student)
+        self.assertFalse(created)
+        self.assertEqual(second.pk, first.pk)
+        self.assertEqual(Application.objects.count(), 1)
+        stats = RecruiterStats.objects.get(recruiter=self.recruiter)
+        self.assertEqual((stats.total_applications, stats.applied), (1, 1))
+
+    def test_repeated_post_applies_once(self):
+        self.client.force_login(self.student)
+        url = f"/student/apply/{self.job.id}/"
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.post(url)
+            second = self.client.post(url)
+        self.assertRedirects(first, f"/student/jobs/{self.job.id}/")
+        self.assertRedirects(second, f"/student/jobs/{self.job.id}/")
+        self.assertEqual(Application.objects.filter(job=self.job).count(), 1)
+        # The first redirect is not followed, so both requests' messages are pending.
+        self.assertEqual(
+            [str(message) for message in get_messages(second.wsgi_request)],
+            ["Application submitted successfully.", "You have already applied to this job."],
+        )
+
+
+class BulkUpdateStatusTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.applications = [
+                apply_to_job(self.job, make_student(f"student{n}"))[0] for n in range(3)
+            ]
+
+    def test_moves_selected_applications_and_their_counts(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_update_status(
+                self.job,
+                Application.STATUS_SHORTLISTED,
+                [application.id for application in self.applications[:2]],
+            )
+        self.assertEqual(result, {"updated": 2, "from": {Application.STATUS_APPLIED: 2}})
+        with self.captureOnCommitCallbacks(execute=True):
+            result = bulk_update_status(self.job, Application.STATUS_SHORTLISTED)
+        self.assertEqual(result["updated"], 1)
+        stats = RecruiterStats.objects.get(recruiter=self.recruiter)
+        self.assertEqual((stats.applied, stats.shortlisted), (0, 3))
@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from portal.applications import apply_to_job
+from portal.exports import EXPORT_FIELDS
+from portal.models import Application
+
+from .factories import make_job, make_recruiter, make_student
+
+
+class ApplicantExportTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        for n in range(3):
+            apply_to_job(self.job, make_student(f"student{n}"))
+        self.url = f"/recruiter/jobs/{self.job.id}/applicants/export/"
+        self.client.force_login(self.recruiter)
+
+    def _export(self, export_format):
+        response = self.client.get(self.url, {"format": export_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="job-{self.job.id}-applicants.{export_format}"',
+        )
+        return b"".join(response.streaming_content).decode()
+
+    def _expected_times(self):
+        return [
+            created_at.isoformat()
+            for created_at in Application.objects.order_by("-created_at", "-id").values_list(
+                "created_at", flat=True
+            )
+        ]
+
+    def test_csv_lists_applicants_newest_first(self):
+        rows = list(csv.DictReader(io.StringIO(self._export("csv"))))
+        self.assertEqual(list(rows[0]), [name for name, _ in EXPORT_FIELDS])
+        self.assertEqual([row["username"] for row in rows], ["student2", "student1", "student0"])
+        self.assertEqual([row["applied_at"] for row in rows], self._expected_times())
+
+    def test_jsonl_matches_csv(self):
+        rows = [json.loads(line) for line in self._export("jsonl").splitlines()]
+        self.assertEqual([row["username"] for row in rows], ["student2", "student1", "student0"])
+        self.assertEqual([row["applied_at"] for row in rows], self._expected_times())
+        self.assertEqual(rows[0]["cgpa"], "8.00")
+
+    def test_other_recruiters_and_formats_are_refused(self):
+        self.assertEqual(self.client.get(self.url, {"format": "xml"}).status_code, 404)
+        self.client.force_login(make_recruiter("recruiter2"))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+from django.test import TestCase
+
+from portal.imports import import_jobs, read_rows
+from portal.models import Job, RecruiterStats
+
+from .factories import job_fields, make_recruiter
+
+CSV_HEADER = (
+    "title,company,description,required_skills,min_cgpa,eligible_branches,"
+    "job_type,location,salary_min,salary_max,last_date\n"
+)
+
+
+def _csv_row(fields, **overrides) -> str:
+    fields = {**fields, **overrides}
+    return ",".join(f'"{fields[name]}"' for name in CSV_HEADER.strip().split(",")) + "\n"
+
+
+class JobImportTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.fields = {
+            field: str(value)
+            for field, value in job_fields(self.recruiter).items()
+            if field != "recruiter"
+        }
+
+    def _import(self, content: bytes, file_format: str):
+        return import_jobs(self.recruiter, read_rows(io.BytesIO(content), file_format))
+
+    def test_imports_valid_rows_and_reports_invalid_ones(self):
+        content = CSV_HEADER + _csv_row(self.fields) + _csv_row(self.fields, min_cgpa="12")
+        with self.captureOnCommitCallbacks(execute=True):
+            report = self._import(content.encode(), "csv")
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error.row for error in report.errors], [2])
+        self.assertIn("min_cgpa", report.errors[0].errors)
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(RecruiterStats.objects.get(recruiter=self.recruiter).total_jobs, 1)
+
+    def test_non_utf8_csv_is_a_file_error(self):
+        content = CSV_HEADER + _csv_row(self.fields, company="Société Générale")
+        report = self._import(content.encode("latin-1"), "csv")
+        self.assertEqual(report.created, 0)
+        self.assertEqual(len(report.errors), 1)
+        self.assertEqual(report.errors[0].row, 0)
+        self.assertIn("UTF-8", report.errors[0].errors["__all__"][0])
+
+    def test_non_utf8_json_lines_is_a_file_error(self):
+        line = json.dumps({**self.fields, "company": "Société"}, ensure_ascii=False)
+        report = self._import(line.encode("latin-1"), "jsonl")
+        self.assertEqual([error.row for error in report.errors], [0])
+
+    def test_malformed_csv_is_a_file_error(self):
+        # An unterminated quote runs to the end of the file, past the field size limit.
+        content = CSV_HEADER + '"' + "x" * (csv.field_size_limit() + 1)
+        report = self._import(content.encode(), "csv")
+        self.assertEqual([error.row for error in report.errors], [0])
+        self.assertIn("Invalid CSV", report.errors[0].errors["__all__"][0])
+
+    def test_invalid_json_rows_are_reported(self):
+        content = json.dumps(self.fields) + "\n{not json\n"
+        report = self._import(content.encode(), "jsonl")
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error.row for error in report.errors], [2])
+
+    def test_upload_of_non_utf8_file_shows_the_error(self):
+        self.client.force_login(self.recruiter)
+        content = CSV_HEADER + _csv_row(self.fields, company="Société Générale")
+        upload = io.BytesIO(content.encode("latin-1"))
+        upload.name = "jobs.csv"
+        response = self.client.post("/recruiter/jobs/import/", {"file": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "not UTF-8 text")
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import Client, SimpleTestCase, TransactionTestCase
+
+from ai.index import invalidate_job_index
+from portal import metrics
+from portal.benchmarks import Case, _get, measure
+
+from .factories import make_job, make_recruiter, make_student
+
+
+class QueryCountTests(TransactionTestCase):
+    """The async dashboard ranks on ``ai.executor`` threads with their own connections."""
+
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(cache.clear)
+        self.addCleanup(metrics.reset)
+        recruiter = make_recruiter()
+        make_job(recruiter)
+        make_job(recruiter, title="Data Analyst", required_skills="SQL")
+        self.client = Client()
+        self.client.force_login(make_student())
+
+    def test_benchmark_counts_queries_of_executor_threads(self):
+        case = Case("dashboard", _get(self.client, "/student/dashboard/"), cache.clear)
+        metrics.reset()
+        with self.settings(RECOMMENDER_SYNC_INTERVAL=0):
+            result = measure(case, repeat=3)
+        # Every run but the first (which builds the index) is the same as the measured one.
+        request_counts = metrics.summary()["student_dashboard"]["queries"]
+        self.assertEqual(result["queries"], request_counts["p50"])
+
+    def test_collect_includes_nested_requests(self):
+        with metrics.collect() as outer:
+            self.client.get("/student/jobs/")
+            with metrics.collect() as inner:
+                self.client.get("/student/profile/")
+        self.assertGreater(inner.queries, 0)
+        self.assertGreater(outer.queries, inner.queries)
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+    def test_rejects_zero_repeat(self):
+        with self.assertRaisesMessage(CommandError, "--repeat must be at least 1."):
+            call_command("benchmark", repeat=0)
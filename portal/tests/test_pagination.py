@@ -0,0 +1,48 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from portal.models import Job
+from portal.pagination import decode_cursor, encode_cursor, keyset_paginate
+
+from .factories import job_fields, make_recruiter
+
+
+class KeysetPaginationTests(TestCase):
+    def test_cursor_keeps_microseconds(self):
+        created = timezone.now().replace(microsecond=123456)
+        values = decode_cursor(encode_cursor([created, 7]), 2)
+        self.assertEqual(datetime.datetime.fromisoformat(values[0]), created)
+        self.assertEqual(values[1], 7)
+
+    def test_pages_through_rows_created_in_one_millisecond(self):
+        recruiter = make_recruiter()
+        jobs = Job.objects.bulk_create(
+            [Job(**job_fields(recruiter, title=f"Job {number}")) for number in range(60)]
+        )
+        base = timezone.now().replace(microsecond=500000)
+        # Same millisecond, different microseconds, in an order unrelated to the id.
+        for number, job in enumerate(jobs):
+            offset = (number * 7) % 1000
+            Job.objects.filter(pk=job.pk).update(
+                created_at=base + datetime.timedelta(microseconds=offset)
+            )
+
+        seen, cursor = [], ""
+        while True:
+            page = keyset_paginate(Job.objects.all(), cursor, 7)
+            seen.extend(job.id for job in page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(sorted(seen), sorted(job.id for job in jobs))
+
+    def test_invalid_cursor_starts_from_the_first_page(self):
+        recruiter = make_recruiter()
+        Job.objects.bulk_create([Job(**job_fields(recruiter)) for _ in range(3)])
+        page = keyset_paginate(Job.objects.all(), "not-a-cursor", 2)
+        self.assertEqual(len(page.items), 2)
+        self.assertIsNotNone(page.next_cursor)
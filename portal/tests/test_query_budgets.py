@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+
+from ai.index import invalidate_job_index
+
+from .factories import make_job, make_recruiter, make_student
+
+
+@override_settings(PORTAL_QUERY_BUDGET_STRICT=True)
+class QueryBudgetTests(TransactionTestCase):
+    """Every budgeted view, cold and warm; ``QueryBudgetExceeded`` fails the request.
+
+    A ``TransactionTestCase`` because the async views rank on ``ai.executor``
+    threads, which only see committed rows.
+    """
+
+    def setUp(self):
+        invalidate_job_index()
+        cache.clear()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(cache.clear)
+        self.recruiter = make_recruiter()
+        self.job = make_job(self.recruiter)
+        make_job(self.recruiter, title="Data Analyst", required_skills="SQL, Excel")
+        self.student = make_student()
+        make_student("student2", skills="SQL")
+
+    def _get(self, user, urls):
+        self.client.force_login(user)
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_student_views(self):
+        job_id = self.job.id
+        urls = [
+            "/",
+            "/student/dashboard/",
+            "/student/dashboard/?stretch=1",
+            "/student/profile/",
+            "/student/jobs/",
+            f"/student/jobs/{job_id}/",
+            "/student/recommendations/",
+            f"/student/roadmap/{job_id}/",
+            f"/student/resume-bullets/{job_id}/",
+        ]
+        self._get(self.student, urls)
+        for _ in ("new", "duplicate"):
+            self.assertEqual(self.client.post(f"/student/apply/{job_id}/").status_code, 302)
+        cache.clear()
+        self._get(self.student, urls)
+
+    def test_recruiter_views(self):
+        self.client.force_login(self.student)
+        self.client.post(f"/student/apply/{self.job.id}/")
+        job_id = self.job.id
+        urls = [
+            "/",
+            "/recruiter/dashboard/",
+            f"/recruiter/jobs/{job_id}/applicants/",
+            f"/recruiter/jobs/{job_id}/candidates/",
+            "/recruiter/analytics/",
+        ]
+        self._get(self.recruiter, urls)
+        self._get(self.recruiter, urls)
@@ -0,0 +1,163 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from portal.models import Job
+from portal.search import (
+    BasicSearchBackend,
+    PostgresSearchBackend,
+    SqliteFtsBackend,
+    get_search_backend,
+    tokenize,
+)
+
+from .factories import job_fields, make_job, make_recruiter
+
+HOSTILE_QUERIES = [
+    '"',
+    'python"',
+    '"python',
+    "python*",
+    "*",
+    "python' OR '1'='1",
+    "NEAR(python django)",
+    "NEAR",
+    "title:python",
+    "python -django",
+    "(python",
+    "python)",
+    "^python",
+    "python & | ! :*",
+]
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_keeps_only_words(self):
+        self.assertEqual(
+            tokenize('"Python"* OR NEAR(django, 2)'), ["python", "or", "near", "django", "2"]
+        )
+        self.assertEqual(tokenize('" * :* & |'), [])
+
+    def test_caps_the_number_of_tokens(self):
+        self.assertEqual(len(tokenize(" ".join(f"w{n}" for n in range(40)))), 16)
+
+
+class PostgresQueryTests(SimpleTestCase):
+    def test_tokens_are_passed_as_a_prefix_tsquery_parameter(self):
+        sql, params = PostgresSearchBackend(None).ranked_sql(["near", "python"], "SELECT 1")
+        self.assertEqual(params, ["near:* & python:*"])
+        self.assertNotIn("python", sql)
+        self.assertIn("id IN (SELECT 1)", sql)
+
+
+class RankedSearchTests:
+    """Shared checks for the ranked backends, run against the test database."""
+
+    backend_class = None
+
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.backend = get_search_backend()
+        self.assertIsInstance(self.backend, self.backend_class)
+
+    def _search(self, query, queryset=None, page_size=20, cursor=""):
+        queryset = Job.objects.all() if queryset is None else queryset
+        return self.backend.search(queryset, query, page_size, cursor)
+
+    def _ids(self, query, **kwargs):
+        return [job.id for job in self._search(query, **kwargs).items]
+
+    def test_matches_title_description_and_skills_by_prefix(self):
+        title = make_job(self.recruiter, title="Kubernetes Operator", required_skills="Go")
+        skills = make_job(self.recruiter, title="Platform Engineer", required_skills="Kubernetes")
+        make_job(self.recruiter, title="Data Analyst", required_skills="SQL, Excel")
+        self.assertCountEqual(self._ids("kube"), [title.id, skills.id])
+        self.assertEqual(self._ids("kubernetes analyst"), [])
+
+    def test_ranks_more_relevant_jobs_first(self):
+        passing = make_job(
+            self.recruiter,
+            title="Frontend Developer",
+            description="Build interfaces; some rust tooling helps.",
+            required_skills="React",
+        )
+        focused = make_job(
+            self.recruiter,
+            title="Rust Engineer",
+            description="Write Rust services and Rust libraries.",
+            required_skills="Rust",
+        )
+        page = self._search("rust")
+        self.assertEqual([job.id for job in page.items], [focused.id, passing.id])
+        self.assertGreater(page.items[0].search_score, page.items[1].search_score)
+
+    def test_only_searches_the_given_queryset(self):
+        intern = make_job(self.recruiter, title="Python Intern", job_type="Intern")
+        make_job(self.recruiter, title="Python Developer")
+        interns = Job.objects.filter(job_type="Intern")
+        self.assertEqual(self._ids("python", queryset=interns), [intern.id])
+
+    def test_pages_do_not_overlap(self):
+        # Identical text ties every score, so paging relies on the id tie-break too.
+        jobs = Job.objects.bulk_create(
+            [Job(**job_fields(self.recruiter, title="Python Developer")) for _ in range(7)]
+            + [Job(**job_fields(self.recruiter, title=f"Python Python Lead {n}")) for n in range(4)]
+        )
+        make_job(self.recruiter, title="Data Analyst", description="SQL", required_skills="SQL")
+        seen, cursor, scores = [], "", []
+        while True:
+            page = self._search("python", page_size=3, cursor=cursor)
+            seen.extend(job.id for job in page.items)
+            scores.extend(job.search_score for job in page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertCountEqual(seen, [job.id for job in jobs])
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_hostile_queries_are_searched_as_plain_words(self):
+        python = make_job(self.recruiter, title="Python Developer", required_skills="Python")
+        analyst = make_job(
+            self.recruiter, title="Data Analyst", description="SQL", required_skills="SQL"
+        )
+        for query in HOSTILE_QUERIES:
+            with self.subTest(query=query):
+                ids = self._ids(query)
+                if not tokenize(query):
+                    # Nothing left to search for: every job, unranked.
+                    self.assertCountEqual(ids, [python.id, analyst.id])
+                elif tokenize(query) == ["python"]:
+                    self.assertEqual(ids, [python.id])
+                else:
+                    self.assertNotIn(analyst.id, ids)
+        self.assertEqual(Job.objects.count(), 2)
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite FTS5 backend")
+class SqliteFtsBackendTests(RankedSearchTests, TestCase):
+    backend_class = SqliteFtsBackend
+
+    def test_index_follows_updates_and_deletes(self):
+        job = make_job(self.recruiter, title="Staff Engineer")
+        job.title = "Principal Engineer"
+        job.save()
+        self.assertEqual(self._ids("staff"), [])
+        self.assertEqual(self._ids("principal"), [job.id])
+        job.delete()
+        self.assertEqual(self._ids("principal"), [])
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL tsvector backend")
+class PostgresSearchBackendTests(RankedSearchTests, TestCase):
+    backend_class = PostgresSearchBackend
+
+
+class BasicSearchBackendTests(TestCase):
+    def test_every_token_must_match_some_column(self):
+        recruiter = make_recruiter()
+        both = make_job(recruiter, title="Python Developer", required_skills="Django")
+        make_job(recruiter, title="Python Analyst", required_skills="SQL")
+        page = BasicSearchBackend(connection).search(Job.objects.all(), '"python" django*', 10)
+        self.assertEqual([job.id for job in page.items], [both.id])
@@ -0,0 +1,132 @@
+import datetime
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from ai.index import invalidate_job_index
+from portal.models import Job, JobChange, RecommendationSnapshot
+
+from .factories import make_job, make_recruiter, make_student
+
+MARKER_SCORE = 99.9
+MARKER_REASONS = ["stored"]
+
+
+class DashboardSnapshotTests(TransactionTestCase):
+    """Live rankings run on ``ai.executor`` threads, which only see committed rows."""
+
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(cache.clear)
+        recruiter = make_recruiter()
+        make_job(recruiter, title="Python Developer")
+        make_job(recruiter, title="Data Analyst", required_skills="SQL")
+        self.student = make_student()
+        call_command("precompute_recommendations", workers=1, top=2, stdout=StringIO())
+        # Mark the stored ranking so the test can tell it from a live one.
+        RecommendationSnapshot.objects.update(score=MARKER_SCORE)
+        self.client.force_login(self.student)
+
+    def _scores(self, query=""):
+        cache.clear()
+        response = self.client.get(f"/student/dashboard/{query}")
+        self.assertEqual(response.status_code, 200)
+        return [item["score"] for item in response.context["recommendations"]]
+
+    def test_serves_current_snapshot(self):
+        self.assertEqual(self._scores(), [MARKER_SCORE, MARKER_SCORE])
+
+    def test_job_change_after_precompute_ranks_live(self):
+        JobChange.objects.create(job_id=None)
+        self.assertNotIn(MARKER_SCORE, self._scores())
+
+    def test_expired_snapshot_ranks_live(self):
+        RecommendationSnapshot.objects.update(
+            created_at=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        self.assertNotIn(MARKER_SCORE, self._scores())
+
+    def test_stretch_override_skips_snapshot_of_other_mode(self):
+        self.assertNotIn(MARKER_SCORE, self._scores("?stretch=1"))
+        self.assertEqual(self._scores("?stretch=0"), [MARKER_SCORE, MARKER_SCORE])
+
+
+class SnapshotRescoreTests(TransactionTestCase):
+    """Job changes since the precompute re-score only the changed jobs."""
+
+    def setUp(self):
+        invalidate_job_index()
+        self.addCleanup(invalidate_job_index)
+        self.addCleanup(cache.clear)
+        self.recruiter = make_recruiter()
+        for title in ("Python Developer", "Django Developer", "SQL Developer", "Backend Developer"):
+            make_job(self.recruiter, title=title)
+        self.java_jobs = [
+            make_job(
+                self.recruiter,
+                title=f"Java Engineer {number}",
+                description="Maintain Java services.",
+                required_skills="Java, Spring",
+            )
+            for number in range(3)
+        ]
+        self.student = make_student()
+        call_command("precompute_recommendations", workers=1, top=5, stdout=StringIO())
+        # Mark the stored reasons so the test can tell them from re-scored ones.
+        RecommendationSnapshot.objects.update(reasons=MARKER_REASONS)
+        self.stored = list(
+            RecommendationSnapshot.objects.order_by("rank").values_list("job_id", flat=True)
+        )
+        self.client.force_login(self.student)
+
+    def _recommendations(self):
+        cache.clear()
+        response = self.client.get("/student/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return [(item["job"].id, item["reasons"]) for item in response.context["recommendations"]]
+
+    def test_change_to_a_job_outside_the_snapshot_keeps_it(self):
+        outside = next(job for job in self.java_jobs if job.id not in self.stored)
+        outside.description = "Maintain Java and Kotlin services."
+        outside.save()
+        self.assertEqual(
+            self._recommendations(), [(job_id, MARKER_REASONS) for job_id in self.stored]
+        )
+
+    def test_new_better_job_is_merged_in(self):
+        job = make_job(
+            self.recruiter,
+            title="Python Django SQL Developer",
+            description="Python, Django and SQL all day.",
+            required_skills="Python, Django, SQL",
+        )
+        recommendations = self._recommendations()
+        self.assertEqual(recommendations[0][0], job.id)
+        self.assertNotEqual(recommendations[0][1], MARKER_REASONS)
+        self.assertEqual(
+            recommendations[1:], [(job_id, MARKER_REASONS) for job_id in self.stored[:4]]
+        )
+
+    def test_deleted_snapshot_job_ranks_live(self):
+        Job.objects.get(pk=self.stored[0]).delete()
+        recommendations = self._recommendations()
+        self.assertNotIn(self.stored[0], [job_id for job_id, _ in recommendations])
+        self.assertNotIn(MARKER_REASONS, [reasons for _, reasons in recommendations])
+
+    def test_precompute_loads_open_jobs_once(self):
+        make_student("student2", skills="Java")
+        make_student("student3", skills="SQL")
+        with CaptureQueriesContext(connection) as queries:
+            call_command(
+                "precompute_recommendations", workers=1, batch_size=1, stdout=StringIO()
+            )
+        job_loads = [q for q in queries if '"portal_job"."last_date" >=' in q["sql"]]
+        self.assertEqual(len(job_loads), 1)
+        self.assertEqual(
+            RecommendationSnapshot.objects.values("profile").distinct().count(), 3
+        )
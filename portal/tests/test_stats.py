@@ -0,0 +1,88 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from portal.applications import apply_to_job, bulk_update_status
+from portal.models import Application, RecruiterStats, SkillDemand
+from portal.stats import rebuild_stats
+
+from .factories import make_job, make_recruiter, make_student
+
+
+def _snapshot():
+    recruiters = {
+        row["recruiter_id"]: row for row in RecruiterStats.objects.values().order_by("recruiter_id")
+    }
+    demand = set(
+        SkillDemand.objects.filter(applicants__gt=0).values_list(
+            "recruiter_id", "skill_id", "applicants"
+        )
+    )
+    return recruiters, demand
+
+
+class IncrementalStatsTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter()
+        self.other_recruiter = make_recruiter("recruiter2")
+        self.students = [
+            make_student("student1"),
+            make_student("student2", skills="Python, React"),
+            make_student("student3", skills="Java"),
+        ]
+
+    def assertMatchesRebuild(self):
+        incremental = _snapshot()
+        rebuild_stats()
+        self.assertEqual(incremental, _snapshot())
+
+    def test_counters_match_rebuild_after_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs = [make_job(self.recruiter), make_job(self.recruiter, title="Data Engineer")]
+            other_job = make_job(self.other_recruiter)
+            for student in self.students:
+                apply_to_job(jobs[0], student)
+                apply_to_job(other_job, student)
+            apply_to_job(jobs[1], self.students[0])
+            apply_to_job(jobs[0], self.students[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_update_status(jobs[0], Application.STATUS_SHORTLISTED)
+            application = Application.objects.get(job=other_job, student=self.students[2])
+            application.status = Application.STATUS_HIRED
+            application.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            profile = self.students[1].profile
+            profile.skills = "Python, Go"
+            profile.save()
+            Application.objects.get(job=jobs[1], student=self.students[0]).delete()
+            jobs[0].delete()
+
+        self.assertEqual(RecruiterStats.objects.get(recruiter=self.recruiter).total_jobs, 1)
+        self.assertMatchesRebuild()
+
+    def _delete_job_with_applicants(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(self.recruiter)
+            for n in range(count):
+                apply_to_job(job, make_student(f"applicant{count}_{n}", skills=f"Python, S{n}"))
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                job.delete()
+        return len(queries)
+
+    def test_job_delete_counts_its_applications_at_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_to_job(make_job(self.recruiter), self.students[0])
+        few = self._delete_job_with_applicants(2)
+        many = self._delete_job_with_applicants(20)
+        self.assertEqual(few, many)
+        self.assertMatchesRebuild()
+
+    def test_rolled_back_application_is_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(self.recruiter)
+            with transaction.atomic():
+                apply_to_job(job, self.students[0])
+                transaction.set_rollback(True)
+        self.assertEqual(RecruiterStats.objects.get(recruiter=self.recruiter).total_applications, 0)
+        self.assertFalse(SkillDemand.objects.filter(applicants__gt=0).exists())
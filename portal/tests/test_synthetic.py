@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from portal.synthetic import generate
+
+
+class GenerateTests(TestCase):
+    def test_numbering_continues_after_deleted_users(self):
+        generate(students=3, seed=1)
+        User.objects.filter(username__in=["synthetic_student_0", "synthetic_student_1"]).delete()
+        User.objects.create_user("synthetic_student_admin")
+
+        generate(students=2, seed=2)
+
+        self.assertEqual(
+            sorted(
+                User.objects.filter(username__startswith="synthetic_student_").values_list(
+                    "username", flat=True
+                )
+            ),
+            [
+                "synthetic_student_2",
+                "synthetic_student_3",
+                "synthetic_student_4",
+                "synthetic_student_admin",
+            ],
+        )
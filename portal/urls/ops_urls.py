@@ -0,0 +1,13 @@
+from django.urls import path
+
+from .. import views
+
+
+urlpatterns = [
+    path("metrics/", views.request_metrics, name="request_metrics"),
+    path(
+        "recommendation-cache/",
+        views.recommendation_cache_stats,
+        name="recommendation_cache_stats",
+    ),
+]
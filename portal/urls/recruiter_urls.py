@@ -6,8 +6,25 @@ from .. import views
 urlpatterns = [
     path("dashboard/", views.recruiter_dashboard, name="recruiter_dashboard"),
     path("jobs/new/", views.job_create, name="job_create"),
+    path("jobs/import/", views.job_import, name="job_import"),
     path("jobs/<int:job_id>/edit/", views.job_edit, name="job_edit"),
     path("jobs/<int:job_id>/delete/", views.job_delete, name="job_delete"),
     path("jobs/<int:job_id>/applicants/", views.job_applicants, name="job_applicants"),
+    path(
+        "jobs/<int:job_id>/applicants/export/",
+        views.job_applicants_export,
+        name="job_applicants_export",
+    ),
+    path(
+        "jobs/<int:job_id>/applicants/bulk-status/",
+        views.job_applicants_bulk_status,
+        name="job_applicants_bulk_status",
+    ),
+    path(
+        "api/jobs/<int:job_id>/applications/status/",
+        views.job_applications_status_api,
+        name="job_applications_status_api",
+    ),
+    path("jobs/<int:job_id>/candidates/", views.job_candidates, name="job_candidates"),
     path("analytics/", views.analytics, name="analytics"),
 ]
@@ -1,5 +1,8 @@
+import os
 from collections import Counter
 
+IMPORT_FORMATS = ("csv", "json", "jsonl")
+
 
 def split_csv(text: str):
     if not text:
@@ -95,3 +98,8 @@ def top_skills_from_profiles(profiles, limit=8):
     for profile in profiles:
         counter.update(split_csv(profile.skills))
     return counter.most_common(limit)
+
+
+def detect_format(filename: str) -> str:
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    return {"ndjson": "jsonl"}.get(extension, extension)
@@ -1,15 +1,118 @@
+import json
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count
-from django.http import HttpRequest, HttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-
-from ai.recommender import recommend_jobs
+from django.utils import timezone
+from django.views.decorators.http import require_POST
+
+from ai.cache import cache_stats, cached_recommendations, profile_fingerprint
+from ai.executor import run_ranking
+from ai.index import JOB_INDEX_FIELDS
+from ai.recommender import (
+    candidate_jobs,
+    eligible_profiles,
+    recommend_jobs,
+    recommend_students,
+    recommend_top_k,
+)
+from .applications import apply_to_job
 from .decorators import role_required
-from .forms import JobForm, ProfileForm
-from .models import Application, Job, Profile
-from .utils import generate_resume_bullets, generate_skill_gap, top_skills_from_profiles
+from .exports import EXPORT_FORMATS, stream_applicants
+from .imports import import_jobs, read_rows
+from .forms import BulkStatusForm, JobForm, JobImportForm, ProfileForm
+from .models import (
+    Application,
+    Branch,
+    Job,
+    JobBranch,
+    JobChange,
+    Location,
+    Profile,
+    RecommendationSnapshot,
+    RecruiterStats,
+    SkillDemand,
+)
+from .metrics import summary as metrics_summary
+from .pagination import keyset_paginate
+from .search import get_search_backend, tokenize
+from .stats import STATUS_FIELDS
+from .taxonomy import matching_ids
+from .utils import generate_resume_bullets, generate_skill_gap
+
+JOBS_PAGE_SIZE = getattr(settings, "PORTAL_JOBS_PAGE_SIZE", 20)
+SNAPSHOT_TTL = getattr(settings, "RECOMMENDER_SNAPSHOT_TTL", 24 * 3600)
+SNAPSHOT_RESCORE_LIMIT = 100
+CANDIDATES_LIMIT = 20
+TOP_SKILLS_LIMIT = 8
+
+
+def _rescore_changed_jobs(profile: Profile, stored, changed, limit: int, stretch: bool):
+    """``stored`` snapshot rankings with the jobs in ``changed`` scored again.
+
+    Jobs outside the snapshot scored at most its lowest score when it was
+    taken, so a rescored job is only placed if it beats that score. Returns
+    ``[]`` (rank live) when what remains cannot fill ``limit`` places.
+    """
+    floor = stored[-1]["score"]
+    job_ids = candidate_jobs(profile, stretch).filter(id__in=changed).values_list("id", flat=True)
+    rescored = [
+        item for item in recommend_top_k(profile, limit, job_ids) if item["score"] > floor
+    ]
+    kept = [item for item in stored if item["job"].id not in changed]
+    ranking = sorted(kept + rescored, key=lambda item: item["score"], reverse=True)
+    return ranking[:limit] if len(ranking) >= limit else []
+
+
+async def _snapshot_recommendations(profile: Profile, limit: int, stretch: bool):
+    """Rankings stored by ``precompute_recommendations`` for this stretch mode, if current.
+
+    Snapshots are stale once the profile changes or they are older than
+    ``RECOMMENDER_SNAPSHOT_TTL`` seconds. Jobs changed since they were
+    computed are scored again and merged in; a bulk change, or more than
+    ``SNAPSHOT_RESCORE_LIMIT`` changes, ranks live instead.
+    """
+    snapshots = (
+        RecommendationSnapshot.objects.filter(
+            profile=profile,
+            fingerprint=profile_fingerprint(profile),
+            stretch=stretch,
+            created_at__gte=timezone.now() - timedelta(seconds=SNAPSHOT_TTL),
+            job__last_date__gte=timezone.localdate(),
+        )
+        .select_related("job")
+        .order_by("rank")
+    )
+    stored, job_version = [], 0
+    async for snapshot in snapshots:
+        stored.append({"job": snapshot.job, "score": snapshot.score, "reasons": snapshot.reasons})
+        job_version = snapshot.job_version
+    if not stored:
+        return []
+
+    changes = JobChange.objects.filter(id__gt=job_version).values_list("job_id", flat=True)
+    changed = [job_id async for job_id in changes[: SNAPSHOT_RESCORE_LIMIT + 1]]
+    if not changed:
+        return stored[:limit]
+    if None in changed or len(changed) > SNAPSHOT_RESCORE_LIMIT:
+        return []
+    changed = set(changed)
+    return await run_ranking(_rescore_changed_jobs, profile, stored, changed, limit, stretch)
+
+
+def _include_stretch(request: HttpRequest) -> bool:
+    """``?stretch=1`` or ``?stretch=0`` overrides ``RECOMMENDER_INCLUDE_STRETCH``."""
+    value = request.GET.get("stretch")
+    if value is None:
+        return getattr(settings, "RECOMMENDER_INCLUDE_STRETCH", False)
+    return value == "1"
 
 
 def landing(request: HttpRequest) -> HttpResponse:
@@ -21,14 +124,25 @@ def landing(request: HttpRequest) -> HttpResponse:
     return render(request, "landing.html", {"latest_jobs": latest_jobs, "stats": stats})
 
 
-@login_required
 @role_required(Profile.ROLE_STUDENT)
-def student_dashboard(request: HttpRequest) -> HttpResponse:
-    profile, _ = Profile.objects.get_or_create(user=request.user)
-    jobs = Job.objects.all().order_by("-created_at")
-    recommendations = recommend_jobs(profile, list(jobs))[:5]
-    applications = Application.objects.filter(student=request.user).select_related("job")
-    return render(
+async def student_dashboard(request: HttpRequest) -> HttpResponse:
+    profile = request.profile
+    stretch = _include_stretch(request)
+    recommendations = await _snapshot_recommendations(profile, 5, stretch) or await run_ranking(
+        cached_recommendations,
+        profile,
+        "top5:stretch" if stretch else "top5",
+        lambda: recommend_top_k(
+            profile, 5, candidate_jobs(profile, stretch).values_list("id", flat=True)
+        ),
+    )
+    applications = [
+        application
+        async for application in Application.objects.filter(
+            student_id=request.user.pk
+        ).select_related("job")
+    ]
+    return await sync_to_async(render)(
         request,
         "student/dashboard.html",
         {
@@ -42,7 +156,7 @@ def student_dashboard(request: HttpRequest) -> HttpResponse:
 @login_required
 @role_required(Profile.ROLE_STUDENT)
 def student_profile(request: HttpRequest) -> HttpResponse:
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = request.profile
     if request.method == "POST":
         form = ProfileForm(request.POST, request.FILES, instance=profile)
         if form.is_valid():
@@ -57,32 +171,48 @@ def student_profile(request: HttpRequest) -> HttpResponse:
 @login_required
 @role_required(Profile.ROLE_STUDENT)
 def student_jobs(request: HttpRequest) -> HttpResponse:
-    jobs = Job.objects.all().order_by("-created_at")
+    jobs = Job.objects.all()
     location = request.GET.get("location", "").strip()
     branch = request.GET.get("branch", "").strip()
     job_type = request.GET.get("job_type", "").strip()
     min_cgpa = request.GET.get("min_cgpa", "").strip()
+    query = request.GET.get("q", "").strip()
 
     if location:
-        jobs = jobs.filter(location__icontains=location)
+        jobs = jobs.filter(location_tag__in=matching_ids(Location, location))
     if branch:
-        jobs = jobs.filter(eligible_branches__icontains=branch)
+        jobs = jobs.filter(
+            id__in=JobBranch.objects.filter(branch__in=matching_ids(Branch, branch)).values("job")
+        )
     if job_type:
         jobs = jobs.filter(job_type=job_type)
     if min_cgpa:
         jobs = jobs.filter(min_cgpa__lte=min_cgpa)
 
+    filters = {
+        "q": query,
+        "location": location,
+        "branch": branch,
+        "job_type": job_type,
+        "min_cgpa": min_cgpa,
+    }
+    cursor = request.GET.get("after", "")
+    if tokenize(query):
+        page = get_search_backend().search(jobs, query, JOBS_PAGE_SIZE, cursor)
+    else:
+        page = keyset_paginate(jobs, cursor, JOBS_PAGE_SIZE)
+    active_filters = {key: value for key, value in filters.items() if value}
+    next_query = urlencode({**active_filters, "after": page.next_cursor}) if page.next_cursor else ""
+
     return render(
         request,
         "student/jobs.html",
         {
-            "jobs": jobs,
-            "filters": {
-                "location": location,
-                "branch": branch,
-                "job_type": job_type,
-                "min_cgpa": min_cgpa,
-            },
+            "jobs": page.items,
+            "filters": filters,
+            "next_query": next_query,
+            "first_query": urlencode(active_filters) if cursor else "",
+            "is_first_page": not cursor,
         },
     )
 
@@ -103,28 +233,37 @@ def student_job_detail(request: HttpRequest, job_id: int) -> HttpResponse:
 @role_required(Profile.ROLE_STUDENT)
 def apply_job(request: HttpRequest, job_id: int) -> HttpResponse:
     job = get_object_or_404(Job, id=job_id)
-    if Application.objects.filter(job=job, student=request.user).exists():
+    _, created = apply_to_job(job, request.user)
+    if created:
+        messages.success(request, "Application submitted successfully.")
+    else:
         messages.warning(request, "You have already applied to this job.")
-        return redirect(reverse("student_job_detail", args=[job.id]))
-
-    Application.objects.create(job=job, student=request.user)
-    messages.success(request, "Application submitted successfully.")
     return redirect(reverse("student_job_detail", args=[job.id]))
 
 
-@login_required
 @role_required(Profile.ROLE_STUDENT)
-def recommendations(request: HttpRequest) -> HttpResponse:
-    profile, _ = Profile.objects.get_or_create(user=request.user)
-    jobs = Job.objects.all().order_by("-created_at")
-    results = recommend_jobs(profile, list(jobs))
-    return render(request, "student/recommendations.html", {"recommendations": results})
+async def recommendations(request: HttpRequest) -> HttpResponse:
+    profile = request.profile
+    stretch = _include_stretch(request)
+    results = await run_ranking(
+        cached_recommendations,
+        profile,
+        "all:stretch" if stretch else "all",
+        lambda: recommend_jobs(
+            profile, list(candidate_jobs(profile, stretch).only(*JOB_INDEX_FIELDS))
+        ),
+    )
+    return await sync_to_async(render)(
+        request,
+        "student/recommendations.html",
+        {"recommendations": results, "stretch": stretch},
+    )
 
 
 @login_required
 @role_required(Profile.ROLE_STUDENT)
 def roadmap(request: HttpRequest, job_id: int) -> HttpResponse:
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = request.profile
     job = get_object_or_404(Job, id=job_id)
     missing, roadmap_items = generate_skill_gap(profile, job)
     return render(
@@ -137,7 +276,7 @@ def roadmap(request: HttpRequest, job_id: int) -> HttpResponse:
 @login_required
 @role_required(Profile.ROLE_STUDENT)
 def resume_bullets(request: HttpRequest, job_id: int) -> HttpResponse:
-    profile, _ = Profile.objects.get_or_create(user=request.user)
+    profile = request.profile
     job = get_object_or_404(Job, id=job_id)
     bullets = generate_resume_bullets(profile, job)
     return render(
@@ -175,6 +314,23 @@ def job_create(request: HttpRequest) -> HttpResponse:
     return render(request, "recruiter/job_form.html", {"form": form, "is_edit": False})
 
 
+@login_required
+@role_required(Profile.ROLE_RECRUITER)
+def job_import(request: HttpRequest) -> HttpResponse:
+    report = None
+    if request.method == "POST":
+        form = JobImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            report = import_jobs(
+                request.user,
+                read_rows(form.cleaned_data["file"], form.cleaned_data["file_format"]),
+            )
+            messages.success(request, f"Imported {report.created} job(s).")
+    else:
+        form = JobImportForm()
+    return render(request, "recruiter/job_import.html", {"form": form, "report": report})
+
+
 @login_required
 @role_required(Profile.ROLE_RECRUITER)
 def job_edit(request: HttpRequest, job_id: int) -> HttpResponse:
@@ -222,29 +378,113 @@ def job_applicants(request: HttpRequest, job_id: int) -> HttpResponse:
     return render(
         request,
         "recruiter/job_applicants.html",
-        {"job": job, "applicants": applicants, "status_choices": Application.STATUS_CHOICES},
+        {
+            "job": job,
+            "applicants": applicants,
+            "status_choices": Application.STATUS_CHOICES,
+            "bulk_form": BulkStatusForm(),
+        },
+    )
+
+
+@login_required
+@role_required(Profile.ROLE_RECRUITER)
+@require_POST
+def job_applicants_bulk_status(request: HttpRequest, job_id: int) -> HttpResponse:
+    job = get_object_or_404(Job, id=job_id, recruiter=request.user)
+    form = BulkStatusForm(request.POST)
+    if form.is_valid():
+        result = form.update(job)
+        messages.success(request, f"{result['updated']} application(s) updated.")
+    else:
+        for error in form.errors.values():
+            messages.error(request, error.as_text())
+    return redirect(reverse("job_applicants", args=[job.id]))
+
+
+@login_required
+@role_required(Profile.ROLE_RECRUITER)
+@require_POST
+def job_applications_status_api(request: HttpRequest, job_id: int) -> JsonResponse:
+    job = get_object_or_404(Job, id=job_id, recruiter=request.user)
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"errors": {"__all__": ["Invalid JSON."]}}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"errors": {"__all__": ["Expected a JSON object."]}}, status=400)
+    form = BulkStatusForm(payload)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+    return JsonResponse(form.update(job))
+
+
+@login_required
+@role_required(Profile.ROLE_RECRUITER)
+def job_applicants_export(request: HttpRequest, job_id: int) -> StreamingHttpResponse:
+    job = get_object_or_404(Job, id=job_id, recruiter=request.user)
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        raise Http404("Unknown export format.")
+    response = StreamingHttpResponse(
+        stream_applicants(job, export_format), content_type=EXPORT_FORMATS[export_format]
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="job-{job.id}-applicants.{export_format}"'
+    )
+    return response
+
+
+@login_required
+@role_required(Profile.ROLE_RECRUITER)
+def job_candidates(request: HttpRequest, job_id: int) -> HttpResponse:
+    job = get_object_or_404(Job, id=job_id, recruiter=request.user)
+    candidates = recommend_students(
+        job,
+        CANDIDATES_LIMIT,
+        eligible_profiles(job).exclude(user__applications__job=job),
+    )
+    return render(
+        request,
+        "recruiter/job_candidates.html",
+        {"job": job, "candidates": candidates},
     )
 
 
 @login_required
 @role_required(Profile.ROLE_RECRUITER)
 def analytics(request: HttpRequest) -> HttpResponse:
-    jobs = Job.objects.filter(recruiter=request.user)
-    applications = Application.objects.filter(job__recruiter=request.user)
-    profiles = Profile.objects.filter(user__applications__job__recruiter=request.user).distinct()
-    top_skills = top_skills_from_profiles(profiles)
-    status_counts = (
-        applications.values("status")
-        .annotate(total=Count("status"))
-        .order_by("-total")
+    stats = RecruiterStats.objects.filter(recruiter=request.user).first()
+    top_skills = (
+        SkillDemand.objects.filter(recruiter=request.user, applicants__gt=0)
+        .order_by("-applicants", "skill__name")
+        .values_list("skill__name", "applicants")[:TOP_SKILLS_LIMIT]
+    )
+    status_counts = sorted(
+        (
+            {"status": status, "total": getattr(stats, field)}
+            for status, field in STATUS_FIELDS.items()
+            if stats and getattr(stats, field)
+        ),
+        key=lambda item: -item["total"],
     )
     return render(
         request,
         "recruiter/analytics.html",
         {
-            "total_jobs": jobs.count(),
-            "total_applications": applications.count(),
+            "total_jobs": stats.total_jobs if stats else 0,
+            "total_applications": stats.total_applications if stats else 0,
             "top_skills": top_skills,
             "status_counts": status_counts,
         },
     )
+
+
+@staff_member_required
+def recommendation_cache_stats(request: HttpRequest) -> JsonResponse:
+    return JsonResponse(cache_stats())
+
+
+@staff_member_required
+def request_metrics(request: HttpRequest) -> JsonResponse:
+    return JsonResponse(metrics_summary())